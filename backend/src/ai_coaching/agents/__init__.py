@@ -6,13 +6,14 @@ base agent architecture and specialized agent implementations.
 
 from .base import BaseAgent, AgentTask, AgentStatus
 from .knowledge import KnowledgeAgent
-from .registry import AgentRegistry, initialize_agent_registry
+from .registry import AgentConfig, AgentRegistry, initialize_agent_registry
 
 __all__ = [
     "BaseAgent",
     "AgentTask", 
     "AgentStatus",
     "KnowledgeAgent",
+    "AgentConfig",
     "AgentRegistry",
     "initialize_agent_registry",
 ]
\ No newline at end of file
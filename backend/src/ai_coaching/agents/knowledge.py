@@ -1,10 +1,12 @@
 """Knowledge Agent for vector-based content search and retrieval."""
 
 import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
 import structlog
 
 from ai_coaching.agents.base import BaseAgent, AgentTask, BaseAgentOutput
@@ -14,7 +16,8 @@ from ai_coaching.models.knowledge import (
     KnowledgeSearchQuery,
     KnowledgeSearchResult,
     KnowledgeSearchResponse,
-    ContentCategory
+    ContentCategory,
+    EMBEDDING_DIMENSIONS
 )
 from ai_coaching.services.embedding import EmbeddingService
 from ai_coaching.services.database import DatabaseService
@@ -22,6 +25,129 @@ from ai_coaching.services.database import DatabaseService
 logger = structlog.get_logger(__name__)
 
 
+class SearchResultCache:
+    """LRU cache of search responses with a time to live."""
+    
+    def __init__(self, ttl_seconds: float = 300, max_size: int = 2000):
+        """Initialize search result cache.
+        
+        Args:
+            ttl_seconds: Time to live for cached responses
+            max_size: Maximum number of cached responses
+        """
+        self._entries: "OrderedDict[Hashable, Tuple[KnowledgeSearchResponse, float]]" = OrderedDict()
+        self._ttl = ttl_seconds
+        self._max_size = max_size
+    
+    def get(self, key: Hashable) -> Optional[KnowledgeSearchResponse]:
+        """Get a cached response if still valid."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        response, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return response
+    
+    def set(self, key: Hashable, response: KnowledgeSearchResponse) -> None:
+        """Cache a response, evicting the least recently used one if full."""
+        self._entries[key] = (response, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Clear all cached responses."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ProximityCache:
+    """Cache of search responses looked up by query embedding similarity.
+    
+    Rephrasings of a common question embed to nearly the same vector, so a
+    response cached for one can answer the others without searching again.
+    Entries live in a ring buffer whose normalized embeddings form one
+    matrix, making a lookup a single matrix-vector product.
+    """
+    
+    def __init__(
+        self,
+        min_similarity: float = 0.95,
+        ttl_seconds: float = 300,
+        max_size: int = 256,
+        dimensions: int = EMBEDDING_DIMENSIONS
+    ):
+        """Initialize proximity cache.
+        
+        Args:
+            min_similarity: Cosine similarity a cached query must reach to match
+            ttl_seconds: Time to live for cached responses
+            max_size: Maximum number of cached responses
+            dimensions: Embedding dimensions
+        """
+        self._min_similarity = min_similarity
+        self._ttl = ttl_seconds
+        self._embeddings = np.zeros((max_size, dimensions), dtype=np.float32)
+        # Expiry per slot on the monotonic clock; 0 marks an empty slot
+        self._expires_at = np.zeros(max_size)
+        self._filter_keys: List[Optional[Hashable]] = [None] * max_size
+        self._responses: List[Optional[KnowledgeSearchResponse]] = [None] * max_size
+        self._next_slot = 0
+    
+    def _normalize(self, embedding: List[float]) -> Optional[np.ndarray]:
+        """Return the unit-length embedding, or None if it cannot be compared."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != self._embeddings.shape[1:]:
+            return None
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def get(self, filter_key: Hashable, embedding: List[float]) -> Optional[KnowledgeSearchResponse]:
+        """Get the response cached for the most similar query with the same filters."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+        
+        similarities = self._embeddings @ vector
+        similarities[self._expires_at <= time.monotonic()] = -np.inf
+        
+        for slot in np.argsort(-similarities):
+            if similarities[slot] < self._min_similarity:
+                break
+            if self._filter_keys[slot] == filter_key:
+                return self._responses[slot]
+        
+        return None
+    
+    def set(self, filter_key: Hashable, embedding: List[float], response: KnowledgeSearchResponse) -> None:
+        """Cache a response, replacing the oldest entry if full."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        
+        slot = self._next_slot
+        self._embeddings[slot] = vector
+        self._expires_at[slot] = time.monotonic() + self._ttl
+        self._filter_keys[slot] = filter_key
+        self._responses[slot] = response
+        self._next_slot = (slot + 1) % len(self._responses)
+    
+    def clear(self) -> None:
+        """Clear all cached responses."""
+        self._expires_at[:] = 0
+        self._filter_keys = [None] * len(self._filter_keys)
+        self._responses = [None] * len(self._responses)
+
+
 class KnowledgeAgent(BaseAgent):
     """Agent for knowledge base search, retrieval, and management.
     
@@ -42,6 +168,7 @@ class KnowledgeAgent(BaseAgent):
             "max_results_per_query": 10,
             "enable_text_fallback": True,
             "cache_embeddings": True,
+            "query_proximity_threshold": 0.95,
             "performance_target_seconds": 3.0,
             "ranking_weights": {
                 "vector_similarity": 0.4,
@@ -70,8 +197,11 @@ class KnowledgeAgent(BaseAgent):
         self.db_service: DatabaseService = dependencies.db_service
         
         # Performance tracking
-        self._search_cache: Dict[str, Tuple[KnowledgeSearchResponse, datetime]] = {}
-        self._cache_ttl_seconds = 300  # 5 minutes
+        self._search_cache = SearchResultCache(ttl_seconds=300)  # 5 minutes
+        self._proximity_cache = ProximityCache(
+            min_similarity=self.config["query_proximity_threshold"],
+            ttl_seconds=300
+        )
         
         logger.info(
             "KnowledgeAgent initialized",
@@ -185,13 +315,6 @@ class KnowledgeAgent(BaseAgent):
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"{query}:{categories}:{max_results}:{similarity_threshold}"
-            cached_result = self._get_cached_search(cache_key)
-            if cached_result:
-                logger.debug("Returning cached search result", query=query[:50])
-                return cached_result
-            
             # Create search query object
             search_query = KnowledgeSearchQuery(
                 query_text=query,
@@ -200,9 +323,25 @@ class KnowledgeAgent(BaseAgent):
                 vector_similarity_threshold=similarity_threshold or self.config["similarity_threshold"]
             )
             
+            # Check cache first
+            cache_key = search_query.cache_key()
+            cached_result = self._get_cached_search(cache_key)
+            if cached_result:
+                logger.debug("Returning cached search result", query=query[:50])
+                return cached_result.model_copy(update={"from_cache": True})
+            
             # Generate query embedding
             query_embedding = await self.embedding_service.generate_embedding(query)
             
+            # Reuse the response to a near-identical query with the same filters
+            filter_key = search_query.filter_key()
+            similar_result = self._proximity_cache.get(filter_key, query_embedding)
+            if similar_result:
+                logger.debug("Returning search result for a similar query", query=query[:50])
+                response = similar_result.model_copy(update={"query": search_query})
+                self._cache_search_result(cache_key, response)
+                return response.model_copy(update={"from_cache": True})
+            
             # Perform vector similarity search
             vector_results = await self._vector_similarity_search(
                 query_embedding,
@@ -234,6 +373,7 @@ class KnowledgeAgent(BaseAgent):
             
             # Cache the result
             self._cache_search_result(cache_key, response)
+            self._proximity_cache.set(filter_key, query_embedding, response)
             
             logger.info(
                 "Knowledge search completed",
@@ -459,6 +599,7 @@ class KnowledgeAgent(BaseAgent):
         
         # This would be implemented with a database update method
         # For now, just return a placeholder
+        self._clear_search_cache()
         return {
             "item_id": item_id,
             "updated": True,
@@ -473,6 +614,7 @@ class KnowledgeAgent(BaseAgent):
         
         # This would be implemented with a database delete method
         # For now, just return a placeholder
+        self._clear_search_cache()
         return {
             "item_id": item_id,
             "deleted": True,
@@ -582,41 +724,22 @@ class KnowledgeAgent(BaseAgent):
         
         return min(1.0, composite)
     
-    def _get_cached_search(self, cache_key: str) -> Optional[KnowledgeSearchResponse]:
+    def _get_cached_search(self, cache_key: Hashable) -> Optional[KnowledgeSearchResponse]:
         """Get cached search result if still valid."""
-        if cache_key in self._search_cache:
-            result, timestamp = self._search_cache[cache_key]
-            age_seconds = (datetime.utcnow() - timestamp).total_seconds()
-            
-            if age_seconds < self._cache_ttl_seconds:
-                return result
-            else:
-                # Remove expired cache entry
-                del self._search_cache[cache_key]
-        
-        return None
+        return self._search_cache.get(cache_key)
     
     def _cache_search_result(
         self,
-        cache_key: str,
+        cache_key: Hashable,
         result: KnowledgeSearchResponse
     ) -> None:
         """Cache search result."""
-        self._search_cache[cache_key] = (result, datetime.utcnow())
-        
-        # Clean up old cache entries
-        if len(self._search_cache) > 100:
-            # Remove oldest entries
-            sorted_cache = sorted(
-                self._search_cache.items(),
-                key=lambda x: x[1][1]
-            )
-            # Keep only the newest 50 entries
-            self._search_cache = dict(sorted_cache[-50:])
+        self._search_cache.set(cache_key, result)
     
     def _clear_search_cache(self) -> None:
         """Clear all cached search results."""
         self._search_cache.clear()
+        self._proximity_cache.clear()
         logger.debug("Search cache cleared")
     
     async def _agent_health_check(self) -> bool:
@@ -1,6 +1,11 @@
 """Agent Registry System for managing and discovering AI agents."""
 
-from typing import Dict, Optional, Type, TYPE_CHECKING
+import logging
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, TYPE_CHECKING
 import structlog
 
 from ai_coaching.models.base import AgentType, SystemDependencies
@@ -10,20 +15,45 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# stdlib logger backing ``logger``; used to skip building log kwargs when
+# the record would be filtered out anyway
+_std_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class AgentConfig:
+    """Registry-level configuration for a registered agent."""
+    max_concurrent_tasks: int = 10
+    task_timeout: float = 300.0
+    health_check_interval: float = 60.0
+
+
+_DEFAULT_AGENT_CONFIG = AgentConfig()
+
+# Agent capability flags, probed once at registration time
+_CAP_HEALTH_CHECK = 1
+
 
 class AgentRegistry:
     """Central registry for agent management and discovery."""
     
     _agents: Dict[AgentType, "BaseAgent"] = {}
-    _agent_configs: Dict[AgentType, Dict] = {}
+    _agent_configs: Dict[AgentType, AgentConfig] = {}
+    _caps: Dict[AgentType, int] = {}
     _initialized: bool = False
+    _init_lock = threading.Lock()
+    
+    # Health probe cache: agent type -> (probe timestamp, healthy)
+    health_cache_ttl: float = 5.0
+    _health_cache: Dict[AgentType, Tuple[float, bool]] = {}
+    _last_probed: Optional[Tuple[AgentType, float, bool]] = None
     
     @classmethod
     def register_agent(
         cls, 
         agent_type: AgentType, 
         agent: "BaseAgent",
-        config: Optional[Dict] = None
+        config: Optional[AgentConfig] = None
     ) -> None:
         """Register a new agent in the system.
         
@@ -32,15 +62,63 @@ class AgentRegistry:
             agent: BaseAgent instance
             config: Optional configuration for the agent
         """
-        cls._agents[agent_type] = agent
-        cls._agent_configs[agent_type] = config or {}
+        cls._store_agent(agent_type, agent, config)
         
-        logger.info(
-            "Agent registered",
-            agent_type=agent_type.value,
-            agent_id=id(agent),
-            config_keys=list(config.keys()) if config else []
-        )
+        if _std_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Agent registered",
+                agent_type=agent_type.value,
+                agent_id=id(agent),
+                config=config
+            )
+    
+    @classmethod
+    def register_agents(
+        cls,
+        items: Iterable[Tuple[AgentType, "BaseAgent", Optional[AgentConfig]]]
+    ) -> None:
+        """Register several agents at once.
+        
+        Intended for startup, where registering agents one by one would
+        emit a log record per agent.
+        
+        Args:
+            items: (agent type, agent instance, optional config) tuples
+        """
+        registered_types = []
+        for agent_type, agent, config in items:
+            cls._store_agent(agent_type, agent, config)
+            registered_types.append(agent_type)
+        
+        if _std_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Agents registered",
+                count=len(registered_types),
+                agent_types=[agent_type.value for agent_type in registered_types]
+            )
+    
+    @classmethod
+    def _store_agent(
+        cls,
+        agent_type: AgentType,
+        agent: "BaseAgent",
+        config: Optional[AgentConfig]
+    ) -> None:
+        """Insert an agent and its config, dropping any stale health result.
+        
+        Args:
+            agent_type: Type of agent to store
+            agent: BaseAgent instance
+            config: Optional configuration for the agent
+        """
+        caps = 0
+        if callable(getattr(agent, 'health_check', None)):
+            caps |= _CAP_HEALTH_CHECK
+        
+        cls._agents[agent_type] = agent
+        cls._agent_configs[agent_type] = config or _DEFAULT_AGENT_CONFIG
+        cls._caps[agent_type] = caps
+        cls._invalidate_health(agent_type)
     
     @classmethod
     def get_agent(cls, agent_type: AgentType) -> Optional["BaseAgent"]:
@@ -53,7 +131,7 @@ class AgentRegistry:
             Agent instance if found, None otherwise
         """
         agent = cls._agents.get(agent_type)
-        if agent is None:
+        if agent is None and _std_logger.isEnabledFor(logging.WARNING):
             logger.warning(
                 "Agent not found",
                 agent_type=agent_type.value,
@@ -62,32 +140,25 @@ class AgentRegistry:
         return agent
     
     @classmethod
-    def get_agent_config(cls, agent_type: AgentType) -> Dict:
+    def get_agent_config(cls, agent_type: AgentType) -> AgentConfig:
         """Get configuration for a specific agent type.
         
         Args:
             agent_type: Type of agent
             
         Returns:
-            Agent configuration dictionary
+            Agent configuration, or the defaults if none was registered
         """
-        return cls._agent_configs.get(agent_type, {})
+        return cls._agent_configs.get(agent_type, _DEFAULT_AGENT_CONFIG)
     
     @classmethod
-    def list_agents(cls) -> Dict[AgentType, Dict]:
+    def list_agents(cls) -> Mapping[AgentType, Dict[str, Any]]:
         """List all registered agents with their configurations.
         
         Returns:
-            Dictionary mapping agent types to their info
+            Read-only live view mapping agent types to their info
         """
-        return {
-            agent_type: {
-                "agent": agent,
-                "config": cls._agent_configs.get(agent_type, {}),
-                "registered_at": getattr(agent, "_registered_at", None)
-            }
-            for agent_type, agent in cls._agents.items()
-        }
+        return _AGENTS_VIEW
     
     @classmethod
     def is_registered(cls, agent_type: AgentType) -> bool:
@@ -114,17 +185,21 @@ class AgentRegistry:
         if agent_type in cls._agents:
             del cls._agents[agent_type]
             cls._agent_configs.pop(agent_type, None)
+            cls._caps.pop(agent_type, None)
+            cls._invalidate_health(agent_type)
             
-            logger.info(
-                "Agent unregistered",
-                agent_type=agent_type.value
-            )
+            if _std_logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Agent unregistered",
+                    agent_type=agent_type.value
+                )
             return True
         
-        logger.warning(
-            "Attempted to unregister non-existent agent",
-            agent_type=agent_type.value
-        )
+        if _std_logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "Attempted to unregister non-existent agent",
+                agent_type=agent_type.value
+            )
         return False
     
     @classmethod
@@ -133,6 +208,9 @@ class AgentRegistry:
         agent_count = len(cls._agents)
         cls._agents.clear()
         cls._agent_configs.clear()
+        cls._caps.clear()
+        cls._health_cache.clear()
+        cls._last_probed = None
         cls._initialized = False
         
         logger.info(
@@ -141,45 +219,126 @@ class AgentRegistry:
         )
     
     @classmethod
-    async def health_check(cls) -> Dict[AgentType, bool]:
-        """Perform health check on all registered agents.
+    def _invalidate_health(cls, agent_type: AgentType) -> None:
+        """Drop any cached health result for an agent type.
+        
+        Args:
+            agent_type: Type of agent whose cached result is stale
+        """
+        cls._health_cache.pop(agent_type, None)
+        if cls._last_probed is not None and cls._last_probed[0] == agent_type:
+            cls._last_probed = None
+    
+    @classmethod
+    async def _probe_agent(cls, agent_type: AgentType, agent: "BaseAgent", now: float) -> bool:
+        """Return an agent's health, serving from cache while fresh.
         
+        Args:
+            agent_type: Type of agent to probe
+            agent: Registered agent instance
+            now: Current monotonic time
+            
         Returns:
-            Dictionary mapping agent types to their health status
+            True if the agent is healthy, False otherwise
         """
-        health_status = {}
+        ttl = cls.health_cache_ttl
+        
+        # Fast path for repeated polling of the same agent
+        last = cls._last_probed
+        if last is not None and last[0] == agent_type and now - last[1] < ttl:
+            return last[2]
         
-        for agent_type, agent in cls._agents.items():
-            try:
-                # Use BaseAgent health check method if available
-                if hasattr(agent, 'health_check'):
-                    health_status[agent_type] = await agent.health_check()
-                else:
-                    # Fallback to simple check
-                    health_status[agent_type] = agent is not None
-            except Exception as e:
+        cached = cls._health_cache.get(agent_type)
+        if cached is not None and now - cached[0] < ttl:
+            cls._last_probed = (agent_type, cached[0], cached[1])
+            return cached[1]
+        
+        try:
+            # Use BaseAgent health check method if available
+            if cls._caps.get(agent_type, 0) & _CAP_HEALTH_CHECK:
+                healthy = await agent.health_check()
+            else:
+                # Fallback to simple check
+                healthy = agent is not None
+        except Exception as e:
+            if _std_logger.isEnabledFor(logging.ERROR):
                 logger.error(
                     "Agent health check failed",
                     agent_type=agent_type.value,
                     error=str(e)
                 )
-                health_status[agent_type] = False
+            healthy = False
+        
+        cls._health_cache[agent_type] = (now, healthy)
+        cls._last_probed = (agent_type, now, healthy)
+        return healthy
+    
+    @classmethod
+    async def health_check(cls) -> Dict[AgentType, bool]:
+        """Perform health check on all registered agents.
+        
+        Results are cached per agent for ``health_cache_ttl`` seconds so
+        frequent polling does not re-run every agent's probe.
+        
+        Returns:
+            Dictionary mapping agent types to their health status
+        """
+        health_status = {}
+        now = time.monotonic()
+        
+        for agent_type, agent in list(cls._agents.items()):
+            health_status[agent_type] = await cls._probe_agent(agent_type, agent, now)
         
         return health_status
     
     @classmethod
-    async def get_registry_stats(cls) -> Dict:
+    async def get_registry_stats(cls, include_health: bool = False) -> Dict:
         """Get statistics about the agent registry.
         
+        Args:
+            include_health: Whether to probe agents and include their health
+            
         Returns:
             Dictionary containing registry statistics
         """
-        return {
+        stats = {
             "total_agents": len(cls._agents),
             "agent_types": list(cls._agents.keys()),
-            "initialized": cls._initialized,
-            "health_status": await cls.health_check()
+            "initialized": cls._initialized
+        }
+        if include_health:
+            stats["health_status"] = await cls.health_check()
+        return stats
+
+
+class _AgentsView(Mapping):
+    """Live read-only view over the registry's agents.
+    
+    Agent info dicts are built on access, so callers that only iterate
+    or check membership do not pay for materializing every entry.
+    """
+    
+    __slots__ = ()
+    
+    def __getitem__(self, agent_type: AgentType) -> Dict[str, Any]:
+        agent = AgentRegistry._agents[agent_type]
+        return {
+            "agent": agent,
+            "config": AgentRegistry._agent_configs.get(agent_type, _DEFAULT_AGENT_CONFIG),
+            "registered_at": getattr(agent, "_registered_at", None)
         }
+    
+    def __iter__(self) -> Iterator[AgentType]:
+        return iter(AgentRegistry._agents)
+    
+    def __len__(self) -> int:
+        return len(AgentRegistry._agents)
+    
+    def __contains__(self, agent_type: object) -> bool:
+        return agent_type in AgentRegistry._agents
+
+
+_AGENTS_VIEW = _AgentsView()
 
 
 def initialize_agent_registry(dependencies: SystemDependencies) -> None:
@@ -195,10 +354,17 @@ def initialize_agent_registry(dependencies: SystemDependencies) -> None:
         logger.warning("Agent registry already initialized")
         return
     
-    logger.info("Initializing agent registry")
-    
-    # Note: Actual agent implementations will be imported and registered
-    # in their respective modules. This is just the initialization framework.
+    with AgentRegistry._init_lock:
+        # Re-check under the lock so concurrent startups register agents once
+        if AgentRegistry._initialized:
+            logger.warning("Agent registry already initialized")
+            return
+        
+        logger.info("Initializing agent registry")
+        
+        # Note: Actual agent implementations will be imported and registered
+        # in their respective modules. This is just the initialization framework.
+        
+        AgentRegistry._initialized = True
     
-    AgentRegistry._initialized = True
     logger.info("Agent registry initialized successfully")
\ No newline at end of file
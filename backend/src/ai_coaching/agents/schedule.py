@@ -1,21 +1,56 @@
 """Schedule Agent for conflict detection and schedule optimization."""
 
-import asyncio
+import heapq
 import time
-from datetime import datetime, timedelta, UTC
-from typing import Any, Dict, List, Optional, Tuple, Set
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, UTC
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Set
 from enum import Enum
-import math
+from operator import attrgetter
 
+import numpy as np
 import structlog
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationInfo, field_validator
 
 from ai_coaching.agents.base import BaseAgent, AgentTask
+from ai_coaching.agents.schedule_kernels import pairwise_miles, scan_overlaps
 from ai_coaching.models.base import BaseAgentOutput, SystemDependencies
 from ai_coaching.services.airtable import AirtableService
 
 logger = structlog.get_logger(__name__)
 
+# Assumed distance between venues lacking coordinates
+DEFAULT_VENUE_DISTANCE_MILES = 10.0
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch.
+    
+    Naive datetimes are measured against a naive epoch, matching how
+    datetime subtraction treats them.
+    """
+    epoch = _EPOCH if value.tzinfo is None else _EPOCH_UTC
+    return (value - epoch) // _ONE_MICROSECOND
+
+
+def _split_by_code(codes: np.ndarray, order: np.ndarray, n_codes: int) -> List[np.ndarray]:
+    """Slice ``order`` into one index array per code.
+    
+    Args:
+        codes: Integer code for each element
+        order: Element indices ordered so their codes ascend
+        n_codes: Number of distinct codes
+        
+    Returns:
+        Element indices for each code, in ``order``'s order
+    """
+    bounds = np.searchsorted(codes[order], np.arange(n_codes + 1)).tolist()
+    return [order[bounds[c]:bounds[c + 1]] for c in range(n_codes)]
+
 
 class ConflictType(Enum):
     """Types of schedule conflicts."""
@@ -35,8 +70,27 @@ class ConflictSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Conflict description templates, formatted only when a conflict is serialized
+_COACH_DOUBLE_BOOKING_TEMPLATE = "Coach {} is double-booked between {} and {}"
+_VENUE_OVERLAP_TEMPLATE = "Venue {} has overlapping events: {} and {}"
+_TRAVEL_IMPOSSIBLE_TEMPLATE = (
+    "Insufficient travel time for coach between {} and {} ({:.0f} min needed, {:.0f} min available)"
+)
+_COACH_OVERLOAD_TEMPLATE = "Coach {} assigned to {} events on {} (max: {})"
+
+# Sort rank for each severity; higher sorts first
+SEVERITY_RANKS = {
+    ConflictSeverity.LOW: 1,
+    ConflictSeverity.MEDIUM: 2,
+    ConflictSeverity.HIGH: 3,
+    ConflictSeverity.CRITICAL: 4
+}
+
+
 class ScheduleEvent(BaseModel):
     """Schedule event model."""
+    model_config = ConfigDict(frozen=True)
+    
     event_id: str = Field(..., description="Unique event identifier")
     event_name: str = Field(..., description="Event name")
     event_type: str = Field(..., description="Type of event (practice, game, training)")
@@ -53,15 +107,18 @@ class ScheduleEvent(BaseModel):
     is_flexible: bool = Field(True, description="Whether event time can be adjusted")
     travel_time_required: int = Field(15, description="Travel time to venue in minutes")
     
-    @validator('end_time')
-    def end_after_start(cls, v, values):
-        if 'start_time' in values and v <= values['start_time']:
+    @field_validator('end_time')
+    @classmethod
+    def end_after_start(cls, v, info: ValidationInfo):
+        if 'start_time' in info.data and v <= info.data['start_time']:
             raise ValueError('end_time must be after start_time')
         return v
 
 
 class Coach(BaseModel):
     """Coach model with availability and expertise."""
+    model_config = ConfigDict(frozen=True)
+    
     coach_id: str = Field(..., description="Unique coach identifier")
     name: str = Field(..., description="Coach name")
     email: str = Field(..., description="Coach email")
@@ -74,6 +131,8 @@ class Coach(BaseModel):
 
 class Venue(BaseModel):
     """Venue model with capacity and availability."""
+    model_config = ConfigDict(frozen=True)
+    
     venue_id: str = Field(..., description="Unique venue identifier") 
     name: str = Field(..., description="Venue name")
     location: str = Field(..., description="Venue address")
@@ -86,6 +145,8 @@ class Venue(BaseModel):
 
 class ScheduleConflict(BaseModel):
     """Detected schedule conflict."""
+    model_config = ConfigDict(frozen=True)
+    
     conflict_id: str = Field(..., description="Unique conflict identifier")
     conflict_type: ConflictType = Field(..., description="Type of conflict")
     severity: ConflictSeverity = Field(..., description="Conflict severity")
@@ -109,6 +170,140 @@ class ScheduleOptimization(BaseModel):
     overall_score: float = Field(..., description="Overall optimization score (0-1)")
 
 
+# Validate whole input lists in a single call rather than model by model
+_EVENT_LIST_ADAPTER = TypeAdapter(List[ScheduleEvent])
+_COACH_LIST_ADAPTER = TypeAdapter(List[Coach])
+_VENUE_LIST_ADAPTER = TypeAdapter(List[Venue])
+
+
+@dataclass(slots=True)
+class _ConflictRow:
+    """Lightweight conflict record used while detecting conflicts.
+    
+    Mirrors ``ScheduleConflict`` without per-instance validation; rows are
+    only serialized at the API boundary. The description is kept as a
+    template and its arguments so it is only formatted for serialized rows.
+    """
+    conflict_id: str
+    conflict_type: ConflictType
+    severity: ConflictSeverity
+    affected_events: List[str]
+    affected_resources: List[str]
+    description_template: str
+    description_args: Tuple[Any, ...]
+    # Positions of the affected events in the input list; not serialized
+    affected_indices: Tuple[int, ...]
+    suggested_resolutions: List[Dict[str, Any]] = field(default_factory=list)
+    auto_resolvable: bool = False
+    detected_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    # (severity rank, highest affected event priority); not serialized
+    sort_key: Tuple[int, int] = (0, 0)
+    
+    @property
+    def description(self) -> str:
+        """Human-readable description, formatted on access."""
+        return self.description_template.format(*self.description_args)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with the same keys as ``ScheduleConflict.dict()``."""
+        return {
+            'conflict_id': self.conflict_id,
+            'conflict_type': self.conflict_type,
+            'severity': self.severity,
+            'affected_events': list(self.affected_events),
+            'affected_resources': list(self.affected_resources),
+            'description': self.description,
+            'suggested_resolutions': list(self.suggested_resolutions),
+            'auto_resolvable': self.auto_resolvable,
+            'detected_at': self.detected_at
+        }
+
+
+@dataclass(slots=True)
+class _ScheduleArrays:
+    """Structure-of-arrays view of the event fields the detectors scan.
+    
+    Venue and coach IDs are replaced by integer codes in order of first
+    appearance, start dates by their ordinals, and each (event, coach)
+    assignment is one entry in the ``assignment_*`` arrays. Events are
+    sorted by start once, in ``start_order``, and every start-ordered
+    grouping is derived from that single sort.
+    """
+    start_us: np.ndarray
+    end_us: np.ndarray
+    start_order: np.ndarray
+    start_days: np.ndarray
+    venue_codes: np.ndarray
+    venue_ids: List[str]
+    assignment_events: np.ndarray
+    assignment_coaches: np.ndarray
+    coach_ids: List[str]
+    
+    def coach_groups(self, by_start: bool = False) -> List[np.ndarray]:
+        """Event indices for each coach code.
+        
+        Args:
+            by_start: Order each coach's events by start time rather than
+                input order; ties keep input order
+        """
+        if by_start:
+            start_rank = np.empty_like(self.start_order)
+            start_rank[self.start_order] = np.arange(len(self.start_order))
+            ranked = np.argsort(start_rank[self.assignment_events], kind="stable")
+            order = ranked[np.argsort(self.assignment_coaches[ranked], kind="stable")]
+        else:
+            order = np.argsort(self.assignment_coaches, kind="stable")
+        
+        return [
+            self.assignment_events[group]
+            for group in _split_by_code(self.assignment_coaches, order, len(self.coach_ids))
+        ]
+    
+    def venue_groups(self) -> List[np.ndarray]:
+        """Event indices for each venue code, ordered by start time.
+        
+        Ties keep input order.
+        """
+        order = self.start_order[np.argsort(self.venue_codes[self.start_order], kind="stable")]
+        return _split_by_code(self.venue_codes, order, len(self.venue_ids))
+
+
+def _events_to_soa(events: List[ScheduleEvent]) -> _ScheduleArrays:
+    """Pack validated events into contiguous arrays in a single pass."""
+    n = len(events)
+    start_us = np.empty(n, dtype=np.int64)
+    end_us = np.empty(n, dtype=np.int64)
+    start_days = np.empty(n, dtype=np.int32)
+    venue_codes = np.empty(n, dtype=np.int32)
+    
+    venue_book: Dict[str, int] = {}
+    coach_book: Dict[str, int] = {}
+    assignment_events: List[int] = []
+    assignment_coaches: List[int] = []
+    
+    for i, event in enumerate(events):
+        start_us[i] = _to_epoch_us(event.start_time)
+        end_us[i] = _to_epoch_us(event.end_time)
+        start_days[i] = event.start_time.date().toordinal()
+        venue_codes[i] = venue_book.setdefault(event.venue_id, len(venue_book))
+        
+        for coach_id in event.assigned_coaches:
+            assignment_events.append(i)
+            assignment_coaches.append(coach_book.setdefault(coach_id, len(coach_book)))
+    
+    return _ScheduleArrays(
+        start_us=start_us,
+        end_us=end_us,
+        start_order=np.argsort(start_us, kind="stable"),
+        start_days=start_days,
+        venue_codes=venue_codes,
+        venue_ids=list(venue_book),
+        assignment_events=np.array(assignment_events, dtype=np.int64),
+        assignment_coaches=np.array(assignment_coaches, dtype=np.int32),
+        coach_ids=list(coach_book)
+    )
+
+
 class ScheduleAgent(BaseAgent):
     """Agent responsible for schedule conflict detection and optimization.
     
@@ -157,7 +352,6 @@ class ScheduleAgent(BaseAgent):
         # Caching for performance
         self._venue_cache: Dict[str, Venue] = {}
         self._coach_cache: Dict[str, Coach] = {}
-        self._distance_cache: Dict[Tuple[str, str], float] = {}
         self._cache_ttl = 300  # 5 minutes
         
     async def _initialize_agent(self) -> None:
@@ -191,7 +385,8 @@ class ScheduleAgent(BaseAgent):
         """Process a schedule analysis task.
         
         Args:
-            task: Schedule task (conflict_detection, optimization, validation)
+            task: Schedule task (conflict_detection, optimization, validation,
+                resolution suggestions, or validation with suggestions)
             
         Returns:
             BaseAgentOutput with conflict analysis and suggestions
@@ -210,6 +405,8 @@ class ScheduleAgent(BaseAgent):
                 result = await self._validate_schedule(task_data)
             elif task_type == "suggest_resolutions":
                 result = await self._suggest_resolutions(task_data)
+            elif task_type == "validate_and_suggest":
+                result = await self._validate_and_suggest(task_data)
             else:
                 raise ValueError(f"Unknown task type: {task_type}")
             
@@ -250,255 +447,341 @@ class ScheduleAgent(BaseAgent):
         """Detect conflicts in the provided schedule.
         
         Args:
-            task_data: Dictionary containing 'events', 'coaches', 'venues'
+            task_data: Dictionary containing 'events', 'coaches', 'venues',
+                and optionally 'max_conflicts' to return only the top-ranked
+                conflicts
             
         Returns:
             Dictionary with detected conflicts and analysis
         """
-        events = [ScheduleEvent(**event) for event in task_data.get('events', [])]
-        coaches = {c['coach_id']: Coach(**c) for c in task_data.get('coaches', [])}
-        venues = {v['venue_id']: Venue(**v) for v in task_data.get('venues', [])}
-        
-        conflicts = []
-        
-        # Run conflict detection algorithms in parallel
-        conflict_tasks = [
-            self._detect_coach_conflicts(events, coaches),
-            self._detect_venue_conflicts(events, venues),
-            self._detect_travel_conflicts(events, venues),
-            self._detect_workload_conflicts(events, coaches)
-        ]
-        
-        conflict_results = await asyncio.gather(*conflict_tasks, return_exceptions=True)
-        
-        # Combine all detected conflicts
-        for result in conflict_results:
-            if isinstance(result, list):
-                conflicts.extend(result)
-            elif isinstance(result, Exception):
-                self.logger.warning(f"Conflict detection failed: {str(result)}")
+        conflicts = self._collect_conflicts(task_data)
+        return self._build_detection_result(conflicts, task_data.get('max_conflicts'))
+    
+    def _build_detection_result(
+        self,
+        conflicts: List[_ConflictRow],
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build the conflict detection result from collected conflicts.
         
-        # Sort conflicts by severity and priority
-        conflicts.sort(key=lambda c: (
-            self._get_severity_weight(c.severity),
-            max([e.priority for e in events if e.event_id in c.affected_events], default=0)
-        ), reverse=True)
+        Args:
+            conflicts: Keyed conflicts from ``_collect_conflicts``
+            limit: If given, only the top ``limit`` conflicts are listed
+            
+        Returns:
+            Dictionary with detected conflicts and analysis
+        """
+        ranked = self._rank_conflicts(conflicts, limit)
+        summary = self._generate_conflict_summary(conflicts)
         
         return {
-            'conflicts': [c.dict() for c in conflicts],
+            'conflicts': [c.to_dict() for c in ranked],
             'total_conflicts': len(conflicts),
-            'conflict_summary': self._generate_conflict_summary(conflicts),
+            'conflict_summary': summary,
             'confidence_score': 0.95 if conflicts else 1.0,
-            'recommendations': self._generate_recommendations(conflicts)
+            'recommendations': self._generate_recommendations(summary)
         }
     
-    async def _detect_coach_conflicts(self, events: List[ScheduleEvent], coaches: Dict[str, Coach]) -> List[ScheduleConflict]:
-        """Detect coach-related conflicts."""
+    def _collect_conflicts(self, task_data: Dict[str, Any]) -> List[_ConflictRow]:
+        """Run the detectors over a schedule and key the conflicts for ranking.
+        
+        Args:
+            task_data: Dictionary containing 'events', 'coaches', 'venues'
+            
+        Returns:
+            Conflicts in detection order, each with its sort key set
+        """
+        events = _EVENT_LIST_ADAPTER.validate_python(task_data.get('events', []))
+        coaches = {c.coach_id: c for c in _COACH_LIST_ADAPTER.validate_python(task_data.get('coaches', []))}
+        venues = {v.venue_id: v for v in _VENUE_LIST_ADAPTER.validate_python(task_data.get('venues', []))}
+        
+        priorities = [event.priority for event in events]
+        
+        # Key each conflict by severity and priority as it is detected
         conflicts = []
+        for conflict in self._run_all_detectors(events, coaches, venues):
+            conflict.sort_key = (
+                SEVERITY_RANKS[conflict.severity],
+                max((priorities[i] for i in conflict.affected_indices), default=0)
+            )
+            conflicts.append(conflict)
+        
+        return conflicts
+    
+    def _rank_conflicts(
+        self,
+        conflicts: List[_ConflictRow],
+        limit: Optional[int] = None
+    ) -> List[_ConflictRow]:
+        """Order conflicts by severity, then by highest affected event priority.
         
-        # Group events by coach
-        coach_events = {}
-        for event in events:
-            for coach_id in event.assigned_coaches:
-                if coach_id not in coach_events:
-                    coach_events[coach_id] = []
-                coach_events[coach_id].append(event)
+        Args:
+            conflicts: Keyed conflicts from ``_collect_conflicts``
+            limit: If given, only the top ``limit`` conflicts are selected
+            
+        Returns:
+            Ranked conflicts; ties keep detection order
+        """
+        if limit is not None:
+            return heapq.nlargest(limit, conflicts, key=attrgetter('sort_key'))
+        return sorted(conflicts, key=attrgetter('sort_key'), reverse=True)
+    
+    def _run_all_detectors(
+        self,
+        events: List[ScheduleEvent],
+        coaches: Dict[str, Coach],
+        venues: Dict[str, Venue]
+    ) -> Iterator[_ConflictRow]:
+        """Run every conflict detector, yielding conflicts as they are found.
+        
+        The detectors are pure CPU work, so they run sequentially rather
+        than as coroutines; a failing detector is logged and skipped.
+        """
+        arrays = _events_to_soa(events)
+        # Shared by the coach and travel detectors
+        coach_groups = arrays.coach_groups(by_start=True)
+        
+        detectors = [
+            lambda: self._detect_coach_conflicts(events, arrays, coach_groups, coaches),
+            lambda: self._detect_venue_conflicts(events, arrays, venues),
+            lambda: self._detect_travel_conflicts(events, arrays, coach_groups, venues),
+            lambda: self._detect_workload_conflicts(events, arrays, coaches)
+        ]
         
+        for detector in detectors:
+            try:
+                yield from detector()
+            except Exception as e:
+                self.logger.warning(f"Conflict detection failed: {str(e)}")
+    
+    def _detect_coach_conflicts(
+        self,
+        events: List[ScheduleEvent],
+        arrays: _ScheduleArrays,
+        coach_groups: List[np.ndarray],
+        coaches: Dict[str, Coach]
+    ) -> Iterator[_ConflictRow]:
+        """Detect coach-related conflicts."""
         # Check for double-booking
-        for coach_id, coach_event_list in coach_events.items():
-            # Sort events by start time
-            sorted_events = sorted(coach_event_list, key=lambda e: e.start_time)
+        for coach_id, group in zip(arrays.coach_ids, coach_groups):
+            if len(group) < 2:
+                continue
+            
+            coach = coaches.get(coach_id)
+            coach_name = coach.name if coach else 'Unknown'
             
-            for i in range(len(sorted_events) - 1):
-                current_event = sorted_events[i]
-                next_event = sorted_events[i + 1]
+            # Compare against every earlier event still running, not just the
+            # previous one, so overlaps with a long earlier event are caught
+            pairs = scan_overlaps(arrays.start_us[group], arrays.end_us[group])
+            
+            for i, j in group[pairs].tolist():
+                current_event = events[i]
+                next_event = events[j]
                 
-                # Check for time overlap
-                if current_event.end_time > next_event.start_time:
-                    coach = coaches.get(coach_id)
-                    coach_name = coach.name if coach else 'Unknown'
-                    
-                    conflicts.append(ScheduleConflict(
-                        conflict_id=f"coach_double_{coach_id}_{current_event.event_id}_{next_event.event_id}",
-                        conflict_type=ConflictType.COACH_DOUBLE_BOOKING,
-                        severity=ConflictSeverity.HIGH,
-                        affected_events=[current_event.event_id, next_event.event_id],
-                        affected_resources=[coach_id],
-                        description=f"Coach {coach_name} is double-booked between {current_event.event_name} and {next_event.event_name}",
-                        auto_resolvable=True
-                    ))
-        
-        return conflicts
+                yield _ConflictRow(
+                    conflict_id=f"coach_double_{coach_id}_{current_event.event_id}_{next_event.event_id}",
+                    conflict_type=ConflictType.COACH_DOUBLE_BOOKING,
+                    severity=ConflictSeverity.HIGH,
+                    affected_events=[current_event.event_id, next_event.event_id],
+                    affected_resources=[coach_id],
+                    description_template=_COACH_DOUBLE_BOOKING_TEMPLATE,
+                    description_args=(coach_name, current_event.event_name, next_event.event_name),
+                    affected_indices=(i, j),
+                    auto_resolvable=True
+                )
     
-    async def _detect_venue_conflicts(self, events: List[ScheduleEvent], venues: Dict[str, Venue]) -> List[ScheduleConflict]:
+    def _detect_venue_conflicts(
+        self,
+        events: List[ScheduleEvent],
+        arrays: _ScheduleArrays,
+        venues: Dict[str, Venue]
+    ) -> Iterator[_ConflictRow]:
         """Detect venue-related conflicts."""
-        conflicts = []
-        
-        # Group events by venue and check for overlaps
-        venue_events = {}
-        for event in events:
-            if event.venue_id not in venue_events:
-                venue_events[event.venue_id] = []
-            venue_events[event.venue_id].append(event)
-        
-        for venue_id, venue_event_list in venue_events.items():
+        # Check each venue's events for overlaps
+        for venue_id, group in zip(arrays.venue_ids, arrays.venue_groups()):
             venue = venues.get(venue_id)
             if not venue:
                 continue
             
-            # Sort by start time
-            sorted_events = sorted(venue_event_list, key=lambda e: e.start_time)
-            
-            # Check capacity and field availability
-            for i in range(len(sorted_events)):
-                for j in range(i + 1, len(sorted_events)):
-                    event1 = sorted_events[i]
-                    event2 = sorted_events[j]
-                    
-                    # Check for time overlap
-                    if event1.end_time > event2.start_time and event1.start_time < event2.end_time:
-                        # If venue has multiple fields, check if conflict is real
-                        if venue.field_count <= 1:
-                            conflicts.append(ScheduleConflict(
-                                conflict_id=f"venue_overlap_{venue_id}_{event1.event_id}_{event2.event_id}",
-                                conflict_type=ConflictType.VENUE_OVERLAP,
-                                severity=ConflictSeverity.HIGH,
-                                affected_events=[event1.event_id, event2.event_id],
-                                affected_resources=[venue_id],
-                                description=f"Venue {venue.name} has overlapping events: {event1.event_name} and {event2.event_name}",
-                                auto_resolvable=event1.is_flexible or event2.is_flexible
-                            ))
-        
-        return conflicts
+            starts = arrays.start_us[group]
+            ends = arrays.end_us[group]
+            
+            # Skip the sweep when every event begins after all earlier
+            # events have ended
+            latest_end = np.maximum.accumulate(ends)
+            if not (starts[1:] < latest_end[:-1]).any():
+                continue
+            
+            members = group.tolist()
+            
+            # Sweep over start/end boundaries. Ends sort before starts at the
+            # same instant so back-to-back events do not count as overlapping.
+            boundaries = [(start, 1, k) for k, start in enumerate(starts.tolist())]
+            boundaries.extend((end, 0, k) for k, end in enumerate(ends.tolist()))
+            boundaries.sort()
+            
+            # Input positions of the events currently occupying a field, in start order
+            active: Dict[int, int] = {}
+            field_count = max(venue.field_count, 1)
+            
+            for _, is_start, k in boundaries:
+                if not is_start:
+                    del active[k]
+                    continue
+                
+                index2 = members[k]
+                event2 = events[index2]
+                if len(active) >= field_count:
+                    # Every field is taken; the new event clashes with each occupant
+                    for index1 in active.values():
+                        event1 = events[index1]
+                        yield _ConflictRow(
+                            conflict_id=f"venue_overlap_{venue_id}_{event1.event_id}_{event2.event_id}",
+                            conflict_type=ConflictType.VENUE_OVERLAP,
+                            severity=ConflictSeverity.HIGH,
+                            affected_events=[event1.event_id, event2.event_id],
+                            affected_resources=[venue_id],
+                            description_template=_VENUE_OVERLAP_TEMPLATE,
+                            description_args=(venue.name, event1.event_name, event2.event_name),
+                            affected_indices=(index1, index2),
+                            auto_resolvable=event1.is_flexible or event2.is_flexible
+                        )
+                active[k] = index2
     
-    async def _detect_travel_conflicts(self, events: List[ScheduleEvent], venues: Dict[str, Venue]) -> List[ScheduleConflict]:
+    def _detect_travel_conflicts(
+        self,
+        events: List[ScheduleEvent],
+        arrays: _ScheduleArrays,
+        coach_groups: List[np.ndarray],
+        venues: Dict[str, Venue]
+    ) -> Iterator[_ConflictRow]:
         """Detect impossible travel scenarios between venues."""
-        conflicts = []
-        
-        # Group events by coach and check travel feasibility
-        coach_events = {}
-        for event in events:
-            for coach_id in event.assigned_coaches:
-                if coach_id not in coach_events:
-                    coach_events[coach_id] = []
-                coach_events[coach_id].append(event)
-        
-        for coach_id, coach_event_list in coach_events.items():
-            sorted_events = sorted(coach_event_list, key=lambda e: e.start_time)
+        if not coach_groups:
+            return
+        
+        distance_matrix, known = self._build_distance_matrix(arrays.venue_ids, venues)
+        
+        # Lay every coach's start-ordered events end to end and check all
+        # consecutive pairs belonging to the same coach in one pass
+        sequence = np.concatenate(coach_groups)
+        sequence_coaches = np.repeat(np.arange(len(coach_groups)), [len(group) for group in coach_groups])
+        adjacent = np.flatnonzero(sequence_coaches[:-1] == sequence_coaches[1:])
+        current, following = sequence[adjacent], sequence[adjacent + 1]
+        
+        # Required travel time and available time between events, in minutes
+        travel_times = self._calculate_travel_times(
+            arrays.venue_codes[current],
+            arrays.venue_codes[following],
+            distance_matrix,
+            known
+        )
+        available_times = (arrays.start_us[following] - arrays.end_us[current]) / 1_000_000 / 60
+        
+        for k in np.flatnonzero(travel_times > available_times).tolist():
+            coach_id = arrays.coach_ids[sequence_coaches[adjacent[k]]]
+            i, j = int(current[k]), int(following[k])
+            current_event = events[i]
+            next_event = events[j]
             
-            for i in range(len(sorted_events) - 1):
-                current_event = sorted_events[i]
-                next_event = sorted_events[i + 1]
-                
-                # Calculate required travel time
-                travel_time_needed = await self._calculate_travel_time(
-                    current_event.venue_id,
-                    next_event.venue_id,
-                    venues
-                )
-                
-                # Available time between events
-                available_time = (next_event.start_time - current_event.end_time).total_seconds() / 60
-                
-                if travel_time_needed > available_time:
-                    conflicts.append(ScheduleConflict(
-                        conflict_id=f"travel_impossible_{coach_id}_{current_event.event_id}_{next_event.event_id}",
-                        conflict_type=ConflictType.TRAVEL_IMPOSSIBLE,
-                        severity=ConflictSeverity.CRITICAL,
-                        affected_events=[current_event.event_id, next_event.event_id],
-                        affected_resources=[coach_id],
-                        description=f"Insufficient travel time for coach between {current_event.venue_name} and {next_event.venue_name} ({travel_time_needed:.0f} min needed, {available_time:.0f} min available)",
-                        auto_resolvable=current_event.is_flexible or next_event.is_flexible
-                    ))
-        
-        return conflicts
+            yield _ConflictRow(
+                conflict_id=f"travel_impossible_{coach_id}_{current_event.event_id}_{next_event.event_id}",
+                conflict_type=ConflictType.TRAVEL_IMPOSSIBLE,
+                severity=ConflictSeverity.CRITICAL,
+                affected_events=[current_event.event_id, next_event.event_id],
+                affected_resources=[coach_id],
+                description_template=_TRAVEL_IMPOSSIBLE_TEMPLATE,
+                description_args=(
+                    current_event.venue_name,
+                    next_event.venue_name,
+                    float(travel_times[k]),
+                    float(available_times[k])
+                ),
+                affected_indices=(i, j),
+                auto_resolvable=current_event.is_flexible or next_event.is_flexible
+            )
     
-    async def _detect_workload_conflicts(self, events: List[ScheduleEvent], coaches: Dict[str, Coach]) -> List[ScheduleConflict]:
+    def _detect_workload_conflicts(
+        self,
+        events: List[ScheduleEvent],
+        arrays: _ScheduleArrays,
+        coaches: Dict[str, Coach]
+    ) -> Iterator[_ConflictRow]:
         """Detect coach workload conflicts."""
-        conflicts = []
-        
-        # Check daily workload for each coach
-        coach_daily_events = {}
-        
-        for event in events:
-            event_date = event.start_time.date()
-            
-            for coach_id in event.assigned_coaches:
-                if coach_id not in coach_daily_events:
-                    coach_daily_events[coach_id] = {}
-                if event_date not in coach_daily_events[coach_id]:
-                    coach_daily_events[coach_id][event_date] = []
-                
-                coach_daily_events[coach_id][event_date].append(event)
-        
-        for coach_id, daily_events in coach_daily_events.items():
+        # Check daily workload for each coach, keeping events in input order
+        for coach_id, group in zip(arrays.coach_ids, arrays.coach_groups()):
             coach = coaches.get(coach_id)
             if not coach:
                 continue
             
-            for date, date_events in daily_events.items():
-                if len(date_events) > coach.max_events_per_day:
-                    conflicts.append(ScheduleConflict(
-                        conflict_id=f"workload_overload_{coach_id}_{date}",
-                        conflict_type=ConflictType.COACH_OVERLOAD,
-                        severity=ConflictSeverity.MEDIUM,
-                        affected_events=[e.event_id for e in date_events],
-                        affected_resources=[coach_id],
-                        description=f"Coach {coach.name} assigned to {len(date_events)} events on {date} (max: {coach.max_events_per_day})",
-                        auto_resolvable=any(e.is_flexible for e in date_events)
-                    ))
-        
-        return conflicts
+            days = arrays.start_days[group]
+            unique_days, first_seen, counts = np.unique(days, return_index=True, return_counts=True)
+            
+            # Report overloaded days in the order they first appear
+            overloaded = np.flatnonzero(counts > coach.max_events_per_day)
+            for k in overloaded[np.argsort(first_seen[overloaded])].tolist():
+                day = date.fromordinal(int(unique_days[k]))
+                day_indices = group[days == unique_days[k]].tolist()
+                date_events = [events[i] for i in day_indices]
+                
+                yield _ConflictRow(
+                    conflict_id=f"workload_overload_{coach_id}_{day}",
+                    conflict_type=ConflictType.COACH_OVERLOAD,
+                    severity=ConflictSeverity.MEDIUM,
+                    affected_events=[e.event_id for e in date_events],
+                    affected_resources=[coach_id],
+                    description_template=_COACH_OVERLOAD_TEMPLATE,
+                    description_args=(coach.name, len(date_events), day, coach.max_events_per_day),
+                    affected_indices=tuple(day_indices),
+                    auto_resolvable=any(e.is_flexible for e in date_events)
+                )
     
-    async def _calculate_travel_time(self, venue1_id: str, venue2_id: str, venues: Dict[str, Venue]) -> float:
-        """Calculate travel time between venues in minutes."""
-        if venue1_id == venue2_id:
-            return 0.0
+    def _build_distance_matrix(self, venue_ids: List[str], venues: Dict[str, Venue]) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute pairwise distances in miles between the given venue codes.
         
-        # Check cache first
-        cache_key = (venue1_id, venue2_id)
-        if cache_key in self._distance_cache:
-            distance = self._distance_cache[cache_key]
-        else:
-            venue1 = venues.get(venue1_id)
-            venue2 = venues.get(venue2_id)
-            
-            if not venue1 or not venue2:
-                return self.min_travel_time_minutes
-            
-            # Calculate distance if coordinates available
-            if (venue1.latitude and venue1.longitude and 
-                venue2.latitude and venue2.longitude):
-                distance = self._calculate_distance(
-                    venue1.latitude, venue1.longitude,
-                    venue2.latitude, venue2.longitude
-                )
-            else:
-                # Use default distance based on location strings
-                distance = 10.0  # Default 10 miles
+        Args:
+            venue_ids: Venue ID for each venue code
+            venues: Known venues by ID
             
-            # Cache the result
-            self._distance_cache[cache_key] = distance
+        Returns:
+            The (N, N) float32 distance matrix, and a mask of codes with a known venue
+        """
+        venue_list = [venues.get(venue_id) for venue_id in venue_ids]
+        
+        known = np.array([v is not None for v in venue_list], dtype=bool)
+        located = [i for i, v in enumerate(venue_list) if v and v.latitude and v.longitude]
+        
+        # Without coordinates on both ends, fall back to the default distance;
+        # float32 halves the matrix and is ample precision for travel estimates
+        distance_matrix = np.full(
+            (len(venue_list), len(venue_list)), DEFAULT_VENUE_DISTANCE_MILES, dtype=np.float32
+        )
+        if located:
+            distance_matrix[np.ix_(located, located)] = pairwise_miles(
+                np.array([venue_list[i].latitude for i in located], dtype=np.float64),
+                np.array([venue_list[i].longitude for i in located], dtype=np.float64)
+            )
         
-        # Convert distance to travel time (assuming 30 mph average)
-        travel_time = (distance / 30.0) * 60  # minutes
-        return max(travel_time, self.min_travel_time_minutes)
+        return distance_matrix, known
     
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two coordinates in miles using Haversine formula."""
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+    def _calculate_travel_times(
+        self,
+        from_codes: np.ndarray,
+        to_codes: np.ndarray,
+        distance_matrix: np.ndarray,
+        known: np.ndarray
+    ) -> np.ndarray:
+        """Calculate travel times between pairs of venue codes in minutes."""
+        # Convert distance to travel time (assuming 30 mph average)
+        travel_times = np.maximum(
+            (distance_matrix[from_codes, to_codes].astype(np.float64) / 30.0) * 60,
+            self.min_travel_time_minutes
+        )
         
-        # Earth's radius in miles
-        earth_radius = 3959
+        # Unknown venues get the minimum; staying put needs no travel
+        travel_times[~(known[from_codes] & known[to_codes])] = self.min_travel_time_minutes
+        travel_times[from_codes == to_codes] = 0.0
         
-        return earth_radius * c
+        return travel_times
     
     async def _optimize_schedule(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize the schedule to resolve conflicts and improve efficiency."""
@@ -514,22 +797,50 @@ class ScheduleAgent(BaseAgent):
     async def _validate_schedule(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate schedule feasibility."""
         conflicts = await self._detect_conflicts(task_data)
+        return self._build_validation_result(conflicts)
+    
+    def _build_validation_result(self, detection: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the validation result from a conflict detection result.
         
+        Validity and score count every conflict; ``max_conflicts`` only
+        trims the listed issues.
+        """
+        total_conflicts = detection['total_conflicts']
         return {
-            'is_valid': len(conflicts['conflicts']) == 0,
-            'validation_score': 1.0 - (len(conflicts['conflicts']) * 0.1),
-            'issues_found': conflicts['conflicts'],
-            'recommendations': conflicts['recommendations']
+            'is_valid': total_conflicts == 0,
+            'validation_score': max(0.0, 1.0 - total_conflicts * 0.1),
+            'issues_found': detection['conflicts'],
+            'recommendations': detection['recommendations']
         }
     
     async def _suggest_resolutions(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Suggest resolutions for detected conflicts."""
-        conflicts = await self._detect_conflicts(task_data)
+        return self._build_resolution_result(self._collect_conflicts(task_data))
+    
+    async def _validate_and_suggest(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a schedule and suggest resolutions from one detection run.
         
-        resolutions = []
-        for conflict_data in conflicts['conflicts']:
-            conflict = ScheduleConflict(**conflict_data)
+        Args:
+            task_data: Dictionary containing 'events', 'coaches', 'venues',
+                and optionally 'max_conflicts' to limit the listed issues
             
+        Returns:
+            Dictionary with the validation and resolution suggestion results
+        """
+        conflicts = self._collect_conflicts(task_data)
+        detection = self._build_detection_result(conflicts, task_data.get('max_conflicts'))
+        
+        return {
+            **self._build_validation_result(detection),
+            **self._build_resolution_result(conflicts)
+        }
+    
+    def _build_resolution_result(self, conflicts: List[_ConflictRow]) -> Dict[str, Any]:
+        """Build resolution suggestions from collected conflicts."""
+        conflicts = self._rank_conflicts(conflicts)
+        
+        resolutions = []
+        for conflict in conflicts:
             if conflict.conflict_type == ConflictType.COACH_DOUBLE_BOOKING:
                 resolutions.append({
                     'conflict_id': conflict.conflict_id,
@@ -550,57 +861,52 @@ class ScheduleAgent(BaseAgent):
         
         return {
             'suggested_resolutions': resolutions,
-            'auto_resolvable_count': sum(1 for c in conflicts['conflicts'] if c.get('auto_resolvable', False)),
+            'auto_resolvable_count': sum(1 for c in conflicts if c.auto_resolvable),
             'manual_review_required': len(resolutions) - sum(1 for r in resolutions if r.get('priority') == 'low')
         }
     
-    def _generate_conflict_summary(self, conflicts: List[ScheduleConflict]) -> Dict[str, int]:
-        """Generate summary of conflicts by type and severity."""
-        summary = {
-            'by_type': {},
-            'by_severity': {},
-            'total': len(conflicts)
-        }
+    def _generate_conflict_summary(self, conflicts: List[_ConflictRow]) -> Dict[str, Any]:
+        """Generate summary of conflicts by type and severity in a single pass."""
+        by_type: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
         
         for conflict in conflicts:
-            # Count by type
             type_name = conflict.conflict_type.value
-            summary['by_type'][type_name] = summary['by_type'].get(type_name, 0) + 1
+            by_type[type_name] = by_type.get(type_name, 0) + 1
             
-            # Count by severity
             severity_name = conflict.severity.value
-            summary['by_severity'][severity_name] = summary['by_severity'].get(severity_name, 0) + 1
+            by_severity[severity_name] = by_severity.get(severity_name, 0) + 1
         
-        return summary
+        return {
+            'by_type': by_type,
+            'by_severity': by_severity,
+            'total': len(conflicts)
+        }
     
-    def _generate_recommendations(self, conflicts: List[ScheduleConflict]) -> List[str]:
-        """Generate high-level recommendations based on conflicts."""
+    def _generate_recommendations(self, summary: Dict[str, Any]) -> List[str]:
+        """Generate high-level recommendations from a conflict summary.
+        
+        Args:
+            summary: Output of ``_generate_conflict_summary``, so the
+                conflicts are not scanned again
+        """
         recommendations = []
+        by_type = summary['by_type']
         
-        if any(c.conflict_type == ConflictType.COACH_DOUBLE_BOOKING for c in conflicts):
+        if ConflictType.COACH_DOUBLE_BOOKING.value in by_type:
             recommendations.append("Review coach assignments and consider hiring additional coaches")
         
-        if any(c.conflict_type == ConflictType.VENUE_OVERLAP for c in conflicts):
+        if ConflictType.VENUE_OVERLAP.value in by_type:
             recommendations.append("Negotiate additional venue time slots or find alternative locations")
         
-        if any(c.conflict_type == ConflictType.TRAVEL_IMPOSSIBLE for c in conflicts):
+        if ConflictType.TRAVEL_IMPOSSIBLE.value in by_type:
             recommendations.append("Adjust event timing to allow adequate travel time between venues")
         
-        if any(c.severity == ConflictSeverity.CRITICAL for c in conflicts):
+        if ConflictSeverity.CRITICAL.value in summary['by_severity']:
             recommendations.append("Address critical conflicts immediately to avoid disruption")
         
         return recommendations
     
-    def _get_severity_weight(self, severity: ConflictSeverity) -> float:
-        """Get numeric weight for conflict severity."""
-        weights = {
-            ConflictSeverity.LOW: 1.0,
-            ConflictSeverity.MEDIUM: 2.0,
-            ConflictSeverity.HIGH: 3.0,
-            ConflictSeverity.CRITICAL: 4.0
-        }
-        return weights.get(severity, 1.0)
-    
     async def _agent_health_check(self) -> bool:
         """Perform agent-specific health checks."""
         try:
@@ -609,12 +915,6 @@ class ScheduleAgent(BaseAgent):
                 # Could add specific health check
                 pass
             
-            # Check cache sizes (prevent memory leaks)
-            if len(self._distance_cache) > 10000:
-                # Clear old cache entries
-                self._distance_cache.clear()
-                self.logger.info("Cleared distance cache due to size limit")
-            
             return True
             
         except Exception as e:
@@ -627,7 +927,6 @@ class ScheduleAgent(BaseAgent):
             # Clear all caches
             self._venue_cache.clear()
             self._coach_cache.clear()
-            self._distance_cache.clear()
             
             self.logger.info("ScheduleAgent shutdown completed")
             
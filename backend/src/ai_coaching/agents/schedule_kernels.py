@@ -0,0 +1,63 @@
+"""Vectorized numeric kernels used by the Schedule Agent's conflict detectors."""
+
+import numpy as np
+
+# Earth's radius in miles
+EARTH_RADIUS_MILES = 3959.0
+
+
+def pairwise_miles(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Compute the haversine distance in miles between every pair of points.
+
+    Args:
+        lats: Latitudes in degrees, shape (N,)
+        lons: Longitudes in degrees, shape (N,)
+
+    Returns:
+        Symmetric (N, N) float64 distance matrix
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def scan_overlaps(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Find every pair of overlapping intervals.
+
+    Intervals must already be sorted by start. Interval ``i`` overlaps a
+    later interval ``j`` when ``starts[j] < ends[i]``; touching intervals do
+    not overlap.
+
+    Args:
+        starts: Interval starts sorted ascending, shape (N,)
+        ends: Interval ends aligned with ``starts``, shape (N,)
+
+    Returns:
+        (K, 2) int64 array of ``(i, j)`` index pairs with ``i < j``, ordered
+        by ``j`` then ``i``
+    """
+    n = len(starts)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # For each interval, later intervals starting before it ends overlap it
+    first = np.arange(1, n + 1)
+    last = np.maximum(np.searchsorted(starts, ends, side="left"), first)
+    counts = last - first
+
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    earlier = np.repeat(np.arange(n), counts)
+    # Offset of each pair within its run, added to that run's first later index
+    run_starts = np.cumsum(counts) - counts
+    later = np.repeat(first, counts) + (np.arange(total) - np.repeat(run_starts, counts))
+
+    order = np.lexsort((earlier, later))
+    return np.stack((earlier[order], later[order]), axis=1)
@@ -27,8 +27,8 @@ def create_app() -> FastAPI:
         CORSMiddleware,
         allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST", "OPTIONS"],  # Methods the API routes use
+        allow_headers=["Authorization", "Content-Type"],
     )
     
     # Import and include routers
@@ -1,181 +1,425 @@
 """Rate limiting middleware for API endpoints."""
 
+import sys
 import time
-from typing import Dict, Optional
-from fastapi import HTTPException, Request, Response
+from collections import deque
+from functools import lru_cache
+from ipaddress import ip_address, ip_network
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
 import structlog
 
+from ai_coaching.utils.timestamps import current_iso_timestamp
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is an optional dependency
+    aioredis = None
+    RedisError = Exception
+
 logger = structlog.get_logger(__name__)
 
+# Length of a rate limit window in seconds
+WINDOW_SECONDS = 60
+
+# How long to stay on the in-memory backend after a Redis failure
+REDIS_RETRY_SECONDS = 30.0
+
+# Trie key holding the rule that ends at a node; segments are always strings
+_RULE = None
+
+# GCRA check against the Redis clock: ARGV[1] is the emission interval,
+# ARGV[2] the burst window, both in seconds. Returns 1 if allowed.
+_GCRA_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+local new_tat = math.max(tat, now) + tonumber(ARGV[1])
+if new_tat - now > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return 1
+"""
+
+
+def _build_path_trie(path_limits: Dict[str, int]) -> Dict[Any, Any]:
+    """Build a trie of path segments from path-specific rate limits.
+
+    Args:
+        path_limits: Path pattern to rate limit (requests per minute)
+
+    Returns:
+        Nested dict keyed by path segment; a node's ``_RULE`` entry holds
+        the ``(pattern, limit)`` of the pattern ending there
+    """
+    root: Dict[Any, Any] = {}
+    for pattern, limit in path_limits.items():
+        node = root
+        for segment in pattern.strip("/").split("/"):
+            node = node.setdefault(segment, {})
+        # Interned so bucket keys hash and compare by identity
+        node[_RULE] = (sys.intern(pattern), limit)
+    return root
+
+
+class InMemoryRateLimitBackend:
+    """Process-local GCRA (Generic Cell Rate Algorithm) rate limiter.
+
+    Each key stores only its theoretical arrival time (TAT). Every request
+    pushes the TAT forward by ``window / limit``; a request is rejected
+    when that would put the TAT more than one window ahead of now. This
+    allows bursts of up to ``limit`` requests without the 2x burst a
+    fixed window allows at its boundaries.
+
+    Used when Redis is not configured or is unreachable. State is kept
+    per worker process, split across shards by key hash. Each shard keeps
+    a FIFO of ``(expiry, key)`` pairs, and every request expires at most a
+    few drained keys from the head of its shard's FIFO, so cleanup cost is
+    spread evenly instead of landing on one request as a full scan.
+    Access happens on the event loop only, so no locking is needed.
+    """
+
+    # Number of shards (a power of two, so a mask selects the shard)
+    SHARD_COUNT = 16
+
+    # Most expiry entries examined per request
+    MAX_EXPIRIES_PER_HIT = 32
+
+    def __init__(self):
+        """Initialize the in-memory backend."""
+        self._shards: List[Dict[Hashable, float]] = [{} for _ in range(self.SHARD_COUNT)]
+        # One entry per key in the matching shard
+        self._expiries: List[Deque[Tuple[float, Hashable]]] = [deque() for _ in range(self.SHARD_COUNT)]
+
+    def _shard_index(self, key: Hashable) -> int:
+        """Get the index of the shard holding a key."""
+        return hash(key) & (self.SHARD_COUNT - 1)
+
+    def hit(self, key: Hashable, limit: int) -> bool:
+        """Record a request and check it against the limit.
+
+        Args:
+            key: Rate limit key (client and path bucket)
+            limit: Rate limit (requests per minute)
+
+        Returns:
+            True if within limit, False otherwise
+        """
+        index = self._shard_index(key)
+        shard = self._shards[index]
+        now = time.monotonic()
+
+        self._expire_entries(index, now)
+
+        tat = shard.get(key)
+        new_tat = max(tat or now, now) + WINDOW_SECONDS / limit
+
+        if new_tat - now > WINDOW_SECONDS:
+            return False
+
+        if tat is None:
+            self._expiries[index].append((new_tat, key))
+        shard[key] = new_tat
+
+        return True
+
+    def _expire_entries(self, index: int, now: float) -> None:
+        """Drop drained keys from the head of a shard's expiry FIFO.
+
+        A key whose TAT moved on since it was queued is queued again with
+        its current TAT instead of being dropped.
+
+        Args:
+            index: Shard index
+            now: Current monotonic timestamp
+        """
+        shard = self._shards[index]
+        expiries = self._expiries[index]
+
+        for _ in range(self.MAX_EXPIRIES_PER_HIT):
+            if not expiries or expiries[0][0] > now:
+                break
+
+            _, key = expiries.popleft()
+            tat = shard[key]
+            # A TAT in the past carries no state beyond a fresh key
+            if tat <= now:
+                del shard[key]
+            else:
+                expiries.append((tat, key))
+
+
+class RedisRateLimitBackend:
+    """GCRA rate limiter shared across workers through Redis.
+
+    Each check is a single round-trip running a Lua script that reads and
+    advances the key's TAT atomically against the Redis server clock, so
+    limits hold across workers and keys expire once they drain.
+    """
+
+    def __init__(self, redis_url: str):
+        """Initialize the Redis backend.
+
+        Args:
+            redis_url: Redis connection URL
+        """
+        self.client = aioredis.from_url(redis_url)
+        # redis-py runs registered scripts by SHA with EVALSHA
+        self._gcra = self.client.register_script(_GCRA_LUA)
+
+    async def hit(self, key: str, limit: int) -> bool:
+        """Record a request and check it against the limit.
+
+        Args:
+            key: Rate limit key (client and path bucket)
+            limit: Rate limit (requests per minute)
+
+        Returns:
+            True if within limit, False otherwise
+        """
+        allowed = await self._gcra(keys=[key], args=[WINDOW_SECONDS / limit, WINDOW_SECONDS])
+        return bool(allowed)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.client.aclose()
+
+
+def create_redis_backend(redis_url: Optional[str]) -> Optional[RedisRateLimitBackend]:
+    """Create a Redis backend if a URL is configured and redis is installed.
+
+    Args:
+        redis_url: Redis connection URL, or None for in-memory counters
+
+    Returns:
+        Redis backend, or None to use in-memory counters
+    """
+    if not redis_url:
+        return None
+    if aioredis is None:
+        logger.warning("Redis URL configured but redis is not installed, using in-memory rate limiting")
+        return None
+    return RedisRateLimitBackend(redis_url)
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware.
-    
-    In production, this should use Redis or another distributed cache.
+    """Rate limiting middleware.
+
+    Counters live in Redis when a Redis URL is configured, so limits hold
+    across workers; otherwise, or while Redis is unreachable, they are
+    kept in process memory.
     """
-    
-    def __init__(self, app, default_requests_per_minute: int = 100):
+
+    def __init__(
+        self,
+        app,
+        default_requests_per_minute: int = 100,
+        api_prefix: str = "/api/v1",
+        redis_url: Optional[str] = None,
+        trusted_proxies: Optional[Iterable[str]] = None,
+        excluded_paths: Optional[Iterable[str]] = None,
+        redis_backend: Optional[RedisRateLimitBackend] = None
+    ):
         """Initialize rate limiting middleware.
-        
+
         Args:
             app: FastAPI application
             default_requests_per_minute: Default rate limit
+            api_prefix: Prefix the API routers are mounted under
+            redis_url: Redis URL for shared counters; in-memory if omitted
+            trusted_proxies: Proxy addresses or CIDR ranges whose forwarding
+                headers are honored; if omitted, forwarding headers are
+                trusted from any peer
+            excluded_paths: Paths passed through without rate limiting;
+                defaults to the liveness and readiness probes
+            redis_backend: Redis backend owned by the caller, which closes
+                it on shutdown; takes precedence over ``redis_url``
         """
         super().__init__(app)
         self.default_rpm = default_requests_per_minute
-        self.request_counts: Dict[str, Dict[str, any]] = {}
-        
+
         # Path-specific rate limits (requests per minute)
+        api_prefix = api_prefix.rstrip("/")
         self.path_limits = {
-            "/api/v1/gmail/webhook": 600,  # Gmail webhooks can be frequent
-            "/api/v1/gmail/process-email": 60,  # Manual email processing
-            "/api/v1/auth/google": 20,  # OAuth endpoints
-            "/api/v1/health": 1000,  # Health checks
+            f"{api_prefix}/gmail/webhook": 600,  # Gmail webhooks can be frequent
+            f"{api_prefix}/gmail/process-email": 60,  # Manual email processing
+            f"{api_prefix}/auth/google": 20,  # OAuth endpoints
+            f"{api_prefix}/health": 1000,  # Health checks
         }
-    
+        self._path_trie = _build_path_trie(self.path_limits)
+
+        # Probes are polled constantly and never rate limited
+        if excluded_paths is None:
+            excluded_paths = (f"{api_prefix}/health/live", f"{api_prefix}/health/ready")
+        self.excluded_paths = frozenset(excluded_paths)
+        # Distinct request paths are few, so resolved limits are memoized
+        self._resolve_path = lru_cache(maxsize=4096)(self._match_path)
+
+        self.trusted_proxies = (
+            None if trusted_proxies is None
+            else tuple(ip_network(proxy, strict=False) for proxy in trusted_proxies)
+        )
+
+        self.memory_backend = InMemoryRateLimitBackend()
+        self.redis_backend = redis_backend if redis_backend is not None else create_redis_backend(redis_url)
+        self._redis_retry_at = 0.0
+
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request with rate limiting.
-        
+
         Args:
             request: Incoming request
             call_next: Next middleware/handler
-            
+
         Returns:
             Response or rate limit error
         """
+        path = request.url.path
+        if path in self.excluded_paths:
+            return await call_next(request)
+
         # Get client identifier (IP address)
         client_ip = self._get_client_ip(request)
-        
+
         # Get path-specific rate limit
-        path = request.url.path
-        rate_limit = self._get_rate_limit_for_path(path)
-        
+        bucket, rate_limit = self._get_rate_limit_for_path(path)
+
         # Check rate limit
-        if not self._check_rate_limit(client_ip, path, rate_limit):
+        if not await self._check_rate_limit(client_ip, bucket, rate_limit):
             logger.warning(
                 "Rate limit exceeded",
                 client_ip=client_ip,
                 path=path,
                 rate_limit=rate_limit
             )
-            
-            raise HTTPException(
+
+            # Middleware runs outside the app's exception handlers, so the
+            # error response is built here rather than raised
+            return Response(
+                content=orjson.dumps({
+                    "success": False,
+                    "data": None,
+                    "message": "HTTP 429 error",
+                    "error": {
+                        "error": "Rate limit exceeded",
+                        "limit": rate_limit,
+                        "window": "1 minute",
+                        "retry_after": 60
+                    },
+                    "timestamp": current_iso_timestamp()
+                }),
                 status_code=429,
-                detail={
-                    "error": "Rate limit exceeded",
-                    "limit": rate_limit,
-                    "window": "1 minute",
-                    "retry_after": 60
-                },
-                headers={"Retry-After": "60"}
+                headers={"Retry-After": "60"},
+                media_type="application/json"
             )
-        
+
         # Process request
         response = await call_next(request)
-        
+
         return response
-    
+
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address from request.
-        
+
+        With trusted proxies configured, forwarding headers are only read
+        from those proxies, and the client is the nearest X-Forwarded-For
+        hop that is not itself a trusted proxy. Spoofed entries a client
+        prepends never become its rate limit key.
+
         Args:
             request: FastAPI request
-            
+
         Returns:
             Client IP address
         """
+        peer = request.client.host if request.client else "unknown"
+        if self.trusted_proxies is not None and not self._is_trusted_proxy(peer):
+            return peer
+
+        headers = request.headers
+
         # Check for forwarded headers (behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("x-forwarded-for")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fallback to direct connection
-        return request.client.host if request.client else "unknown"
-    
-    def _get_rate_limit_for_path(self, path: str) -> int:
+            if self.trusted_proxies is None:
+                return forwarded_for.split(",", 1)[0].strip()
+
+            hops = [hop.strip() for hop in forwarded_for.split(",")]
+            for hop in reversed(hops):
+                if not self._is_trusted_proxy(hop):
+                    return hop
+            return hops[0]
+
+        return headers.get("x-real-ip") or peer
+
+    def _is_trusted_proxy(self, host: str) -> bool:
+        """Check whether an address belongs to a trusted proxy.
+
+        Args:
+            host: IP address
+
+        Returns:
+            True if the address is in a trusted proxy range
+        """
+        try:
+            address = ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def _get_rate_limit_for_path(self, path: str) -> Tuple[str, int]:
         """Get rate limit for specific path.
-        
+
         Args:
             path: Request path
-            
+
         Returns:
-            Rate limit (requests per minute)
+            Tuple of the bucket the path is counted under (the longest
+            matching pattern, or the path itself) and its rate limit
+            (requests per minute)
         """
-        # Check exact path matches
-        if path in self.path_limits:
-            return self.path_limits[path]
-        
-        # Check path patterns
-        for pattern, limit in self.path_limits.items():
-            if path.startswith(pattern):
-                return limit
-        
-        return self.default_rpm
-    
-    def _check_rate_limit(self, client_ip: str, path: str, limit: int) -> bool:
+        return self._resolve_path(path)
+
+    def _match_path(self, path: str) -> Tuple[str, int]:
+        """Find the longest pattern covering a path, segment by segment.
+
+        Args:
+            path: Request path
+
+        Returns:
+            Tuple of bucket and rate limit (requests per minute)
+        """
+        node = self._path_trie
+        match = None
+
+        for segment in path.strip("/").split("/"):
+            node = node.get(segment)
+            if node is None:
+                break
+            match = node.get(_RULE, match)
+
+        return match or (path, self.default_rpm)
+
+    async def _check_rate_limit(self, client_ip: str, bucket: str, limit: int) -> bool:
         """Check if client is within rate limit.
-        
+
         Args:
             client_ip: Client IP address
-            path: Request path
+            bucket: Path bucket the request counts against
             limit: Rate limit (requests per minute)
-            
+
         Returns:
             True if within limit, False otherwise
         """
-        current_time = time.time()
-        minute_window = int(current_time // 60)
-        
-        # Create client key
-        client_key = f"{client_ip}:{path}"
-        
-        # Initialize tracking if needed
-        if client_key not in self.request_counts:
-            self.request_counts[client_key] = {
-                "count": 0,
-                "window": minute_window
-            }
-        
-        client_data = self.request_counts[client_key]
-        
-        # Reset counter if new minute window
-        if client_data["window"] != minute_window:
-            client_data["count"] = 0
-            client_data["window"] = minute_window
-        
-        # Check if within limit
-        if client_data["count"] >= limit:
-            return False
-        
-        # Increment counter
-        client_data["count"] += 1
-        
-        # Clean up old entries (simple cleanup every 100 requests)
-        if len(self.request_counts) > 1000:
-            self._cleanup_old_entries(current_time)
-        
-        return True
-    
-    def _cleanup_old_entries(self, current_time: float) -> None:
-        """Clean up old rate limiting entries.
-        
-        Args:
-            current_time: Current timestamp
-        """
-        current_minute = int(current_time // 60)
-        
-        # Remove entries older than 2 minutes
-        expired_keys = [
-            key for key, data in self.request_counts.items()
-            if current_minute - data["window"] > 2
-        ]
-        
-        for key in expired_keys:
-            del self.request_counts[key]
-        
-        logger.debug("Cleaned up rate limit entries", removed_count=len(expired_keys))
\ No newline at end of file
+        if self.redis_backend is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                return await self.redis_backend.hit(f"rl:{client_ip}:{bucket}", limit)
+            except RedisError as e:
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("Redis rate limiting unavailable, using in-memory counters", error=str(e))
+
+        return self.memory_backend.hit((client_ip, bucket), limit)
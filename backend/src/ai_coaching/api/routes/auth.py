@@ -1,5 +1,6 @@
 """Authentication routes."""
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -8,6 +9,7 @@ from datetime import datetime
 
 from ai_coaching.services.gmail import GmailService
 from ai_coaching.config.settings import get_config
+from google.auth import jwt
 from google.oauth2.credentials import Credentials
 
 logger = structlog.get_logger(__name__)
@@ -35,8 +37,38 @@ class OAuthTokenResponse(BaseModel):
     user_email: Optional[str] = None
 
 
+def _email_from_id_token(credentials: Credentials, client_id: str) -> Optional[str]:
+    """Read the user's email from the ID token issued with the credentials.
+    
+    The token comes straight from Google's token endpoint over TLS, so
+    its claims are read without a signature check (OpenID Connect Core
+    3.1.3.7); the audience must still be this client.
+    
+    Args:
+        credentials: Credentials from the OAuth code exchange
+        client_id: Google OAuth client ID
+        
+    Returns:
+        Email address, or None if no usable ID token was issued
+    """
+    token = getattr(credentials, "id_token", None)
+    if not token:
+        return None
+    
+    claims = jwt.decode(token, verify=False)
+    if claims.get("aud") != client_id:
+        logger.warning("ID token issued for another client")
+        return None
+    
+    return claims.get("email")
+
+
 def get_gmail_service() -> GmailService:
-    """Get Gmail service dependency."""
+    """Get Gmail service dependency.
+    
+    Built per request: the OAuth routes bind the caller's credentials to
+    the service, so it must not be shared between requests.
+    """
     config = get_config()
     return GmailService(config.gmail)
 
@@ -91,13 +123,20 @@ async def handle_google_callback(
             state=request.state
         )
         
-        # Get user profile to retrieve email
+        # Read the email from the ID token, falling back to the Gmail profile
         user_email = None
-        if await gmail_service.health_check():
+        try:
+            user_email = _email_from_id_token(credentials, gmail_service.config.client_id)
+        except Exception as e:
+            logger.warning("Could not decode ID token", error=str(e))
+        
+        service = gmail_service._service
+        if user_email is None and service is not None:
             try:
-                # Access the service directly to get profile
-                service = gmail_service._service
-                profile = service.users().getProfile(userId='me').execute()
+                # The Google client blocks, so keep it off the event loop
+                profile = await asyncio.to_thread(
+                    service.users().getProfile(userId='me').execute
+                )
                 user_email = profile.get('emailAddress')
             except Exception as e:
                 logger.warning("Could not retrieve user email", error=str(e))
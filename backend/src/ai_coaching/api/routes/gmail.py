@@ -1,16 +1,19 @@
 """Gmail API routes and webhook handlers."""
 
 import base64
-import json
+import binascii
 import hmac
-import hashlib
+import time
+from functools import lru_cache
+from hashlib import sha256
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import structlog
-from datetime import datetime
 
+from ai_coaching.utils.timestamps import current_iso_timestamp
 from ai_coaching.services.gmail import GmailService, EmailProcessingRequest
 from ai_coaching.services.database import DatabaseService
 from ai_coaching.config.settings import get_config
@@ -52,20 +55,36 @@ class EmailProcessResponse(BaseModel):
 
 
 def get_gmail_service() -> GmailService:
-    """Get Gmail service dependency."""
+    """Get Gmail service dependency.
+    
+    Built per request: the service binds the caller's OAuth credentials
+    in ``initialize``, so it must not be shared between requests.
+    """
     config = get_config()
     return GmailService(config.gmail)
 
 
+@lru_cache(maxsize=1)
 def get_database_service() -> DatabaseService:
-    """Get database service dependency."""
+    """Get database service dependency, shared across requests."""
     config = get_config()
     return DatabaseService(config.database)
 
 
+@lru_cache(maxsize=1)
+def _webhook_secret_bytes() -> Optional[bytes]:
+    """Get the webhook signing secret, encoded once."""
+    secret = get_config().gmail.webhook_secret
+    return secret.encode() if secret else None
+
+
 async def verify_webhook_signature(request: Request, raw_body: bytes) -> bool:
     """Verify webhook signature for security.
     
+    The bearer token must be the base64-encoded HMAC-SHA256 of the raw
+    body under the configured webhook secret. Without a secret (local
+    development) any bearer token is accepted.
+    
     Args:
         request: FastAPI request object
         raw_body: Raw request body bytes
@@ -73,18 +92,24 @@ async def verify_webhook_signature(request: Request, raw_body: bytes) -> bool:
     Returns:
         True if signature is valid
     """
-    # In production, you would verify the Pub/Sub signature
-    # For now, we'll implement basic token verification
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
+    # Split the scheme from the token in a single scan
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme != "Bearer" or not token:
         logger.warning("Missing or invalid Authorization header")
         return False
     
-    # Extract and verify token (simplified for development)
-    token = auth_header.split(" ")[1]
-    # In production, verify this token against your webhook secret
+    secret = _webhook_secret_bytes()
+    if secret is None:
+        return True
+    
+    try:
+        expected = base64.b64decode(token, validate=True)
+    except binascii.Error:
+        logger.warning("Malformed webhook signature")
+        return False
     
-    return True
+    # Constant-time comparison so the signature cannot be guessed byte by byte
+    return hmac.compare_digest(hmac.new(secret, raw_body, sha256).digest(), expected)
 
 
 @router.post("/webhook", response_model=Dict[str, str])
@@ -119,8 +144,8 @@ async def handle_gmail_webhook(
         
         # Parse JSON payload
         try:
-            payload_data = json.loads(raw_body)
-        except json.JSONDecodeError as e:
+            payload_data = orjson.loads(raw_body)
+        except orjson.JSONDecodeError as e:
             logger.error("Invalid JSON payload", error=str(e))
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -140,9 +165,8 @@ async def handle_gmail_webhook(
         # Decode the message data
         if "data" in message:
             try:
-                # Decode base64 data
-                decoded_data = base64.b64decode(message["data"]).decode('utf-8')
-                webhook_data = json.loads(decoded_data)
+                # Decode base64 data; orjson parses the UTF-8 bytes directly
+                webhook_data = orjson.loads(base64.b64decode(message["data"]))
             except Exception as e:
                 logger.error("Failed to decode webhook data", error=str(e))
                 raise HTTPException(
@@ -287,7 +311,7 @@ async def process_email_manually(
     Returns:
         Processing status and results
     """
-    processing_start = datetime.utcnow()
+    processing_start = time.monotonic()
     
     try:
         # Create credentials
@@ -306,7 +330,7 @@ async def process_email_manually(
         email_request = await gmail_service.process_incoming_email(message_id)
         
         # Calculate processing time
-        processing_time = (datetime.utcnow() - processing_start).total_seconds()
+        processing_time = time.monotonic() - processing_start
         
         # TODO: Add background task to generate AI response
         # background_tasks.add_task(generate_ai_email_response, email_request)
@@ -326,7 +350,7 @@ async def process_email_manually(
         )
         
     except Exception as e:
-        processing_time = (datetime.utcnow() - processing_start).total_seconds()
+        processing_time = time.monotonic() - processing_start
         logger.error("Manual email processing failed", error=str(e), message_id=message_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -354,7 +378,7 @@ async def gmail_health_check(
         
         return {
             "status": "healthy" if has_config else "configuration_missing",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": current_iso_timestamp(),
             "configuration": {
                 "client_id_configured": bool(config.gmail.client_id),
                 "client_secret_configured": bool(config.gmail.client_secret),
@@ -368,6 +392,6 @@ async def gmail_health_check(
         logger.error("Gmail health check failed", error=str(e))
         return {
             "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": current_iso_timestamp(),
             "error": str(e)
         }
\ No newline at end of file
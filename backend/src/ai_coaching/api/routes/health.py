@@ -1,20 +1,28 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, Depends
+import time
+from functools import lru_cache
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
 from typing import Dict, Any
 import structlog
 from datetime import datetime
 
-from ai_coaching.services.database import DatabaseService
-from ai_coaching.services.embedding import EmbeddingService
 from ai_coaching.config.settings import get_config
+from ai_coaching.utils.timestamps import current_iso_timestamp, iso_timestamp_for
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
+def _liveness_body(second: int) -> bytes:
+    """Serialize the liveness payload for a Unix second."""
+    return orjson.dumps({"status": "alive", "timestamp": iso_timestamp_for(second)})
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
     status: str
@@ -25,43 +33,53 @@ class HealthResponse(BaseModel):
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
-    """Comprehensive health check endpoint."""
+async def health_check(request: Request) -> HealthResponse:
+    """Comprehensive health check endpoint.
+    
+    Probes the services created at application startup rather than
+    opening new connections on every call.
+    """
     config = get_config()
     timestamp = datetime.utcnow()
+    state = request.app.state
     
     # Check service health
     services = {}
     details = {}
     
     # Database health
-    try:
-        db_service = DatabaseService(config.database)
-        await db_service.initialize()
-        db_healthy = await db_service.health_check()
-        services["database"] = db_healthy
-        if db_healthy:
-            details["database"] = "Connected to Supabase"
-        else:
-            details["database"] = "Database connection failed"
-        await db_service.close()
-    except Exception as e:
+    db_service = getattr(state, "db_service", None)
+    if db_service is None:
         services["database"] = False
-        details["database"] = f"Database error: {str(e)}"
+        details["database"] = "Database service not initialized"
+    else:
+        try:
+            db_healthy = await db_service.health_check()
+            services["database"] = db_healthy
+            if db_healthy:
+                details["database"] = "Connected to Supabase"
+            else:
+                details["database"] = "Database connection failed"
+        except Exception as e:
+            services["database"] = False
+            details["database"] = f"Database error: {str(e)}"
     
     # Embedding service health
-    try:
-        embedding_service = EmbeddingService(config.ai)
-        await embedding_service.initialize()
-        embed_healthy = await embedding_service.health_check()
-        services["embedding"] = embed_healthy
-        if embed_healthy:
-            details["embedding"] = "OpenAI API accessible"
-        else:
-            details["embedding"] = "OpenAI API not accessible"
-    except Exception as e:
+    embedding_service = getattr(state, "embedding_service", None)
+    if embedding_service is None:
         services["embedding"] = False
-        details["embedding"] = f"Embedding service error: {str(e)}"
+        details["embedding"] = "Embedding service not initialized"
+    else:
+        try:
+            embed_healthy = await embedding_service.health_check()
+            services["embedding"] = embed_healthy
+            if embed_healthy:
+                details["embedding"] = "OpenAI API accessible"
+            else:
+                details["embedding"] = "OpenAI API not accessible"
+        except Exception as e:
+            services["embedding"] = False
+            details["embedding"] = f"Embedding service error: {str(e)}"
     
     # Overall status
     overall_status = "healthy" if all(services.values()) else "degraded"
@@ -76,37 +94,32 @@ async def health_check() -> HealthResponse:
 
 
 @router.get("/health/live")
-async def liveness_check() -> Dict[str, str]:
-    """Simple liveness check for container orchestration."""
-    return {"status": "alive", "timestamp": datetime.utcnow().isoformat()}
+async def liveness_check() -> Response:
+    """Simple liveness check for container orchestration.
+    
+    The body only changes once a second, so it is serialized once per
+    second and returned as-is, bypassing FastAPI's response encoding.
+    """
+    return Response(content=_liveness_body(int(time.time())), media_type="application/json")
 
 
 @router.get("/health/ready")
-async def readiness_check() -> Dict[str, Any]:
-    """Readiness check for load balancer."""
-    config = get_config()
-    
-    # Quick service checks
-    ready = True
-    checks = {}
+async def readiness_check(request: Request) -> Dict[str, Any]:
+    """Readiness check for load balancer.
     
-    try:
-        # Just check if we can create service instances
-        db_service = DatabaseService(config.database)
-        checks["database"] = "ready"
-    except Exception as e:
-        checks["database"] = f"not ready: {str(e)}"
-        ready = False
+    Ready once startup has initialized the shared services; no service
+    is contacted.
+    """
+    state = request.app.state
     
-    try:
-        embedding_service = EmbeddingService(config.ai)
-        checks["embedding"] = "ready"
-    except Exception as e:
-        checks["embedding"] = f"not ready: {str(e)}"
-        ready = False
+    checks = {
+        name: "ready" if getattr(state, attr, None) is not None else "not ready: not initialized"
+        for name, attr in (("database", "db_service"), ("embedding", "embedding_service"))
+    }
+    ready = all(check == "ready" for check in checks.values())
     
     return {
         "status": "ready" if ready else "not ready",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": current_iso_timestamp(),
         "checks": checks
-    }
\ No newline at end of file
+    }
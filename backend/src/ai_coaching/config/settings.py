@@ -1,17 +1,130 @@
 """System configuration settings using Pydantic Settings."""
 
-from typing import List, Optional
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType, UnionType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union, get_args, get_origin
+from dotenv import dotenv_values
+from pydantic import Field, field_validator
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
 
+# Accepted values for SystemConfig.log_level and SystemConfig.environment
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+_VALID_ENVIRONMENTS = frozenset({"development", "testing", "staging", "production"})
 
-class DatabaseConfig(BaseSettings):
+# Dotenv file read by every settings class
+ENV_FILE = ".env"
+
+# Parsed .env file, keyed by path and modification time
+_DOTENV_CACHE: Dict[Tuple[Path, int], Mapping[str, Optional[str]]] = {}
+
+
+def _read_dotenv(env_file: str = ENV_FILE) -> Mapping[str, Optional[str]]:
+    """Parse a dotenv file once and share the values between callers.
+    
+    Args:
+        env_file: Path of the dotenv file
+        
+    Returns:
+        Read-only mapping of variable names to values, empty if the file
+        does not exist
+    """
+    path = Path(env_file).expanduser().resolve()
+    try:
+        key = (path, path.stat().st_mtime_ns)
+    except OSError:
+        return MappingProxyType({})
+    
+    values = _DOTENV_CACHE.get(key)
+    if values is None:
+        # A changed file replaces the previous parse
+        _DOTENV_CACHE.clear()
+        values = MappingProxyType(dotenv_values(path))
+        _DOTENV_CACHE[key] = values
+    return values
+
+
+class SharedDotEnvSettingsSource(PydanticBaseSettingsSource):
+    """Settings source reading ``.env`` from one parse shared by all classes.
+    
+    Variables are looked up by the class's ``env_prefix`` plus the field
+    name, honouring ``case_sensitive`` and ``env_ignore_empty``. Complex
+    values such as lists are decoded from JSON.
+    """
+    
+    def __init__(self, settings_cls: Type[BaseSettings], env_file: str = ENV_FILE):
+        super().__init__(settings_cls)
+        self.case_sensitive = self.config.get("case_sensitive", False)
+        self.env_prefix = self.config.get("env_prefix", "")
+        self.env_ignore_empty = self.config.get("env_ignore_empty", False)
+        
+        values = _read_dotenv(env_file)
+        if not self.case_sensitive:
+            values = {name.lower(): value for name, value in values.items()}
+            self.env_prefix = self.env_prefix.lower()
+        self.env_vars = values
+    
+    def field_is_complex(self, field: FieldInfo) -> bool:
+        # The base check does not look inside unions such as Optional[List[str]]
+        if get_origin(field.annotation) in (Union, UnionType):
+            return any(
+                self.field_is_complex(FieldInfo.from_annotation(arg))
+                for arg in get_args(field.annotation)
+                if arg is not type(None)
+            )
+        return super().field_is_complex(field)
+    
+    def get_field_value(self, field: FieldInfo, field_name: str) -> Tuple[Any, str, bool]:
+        env_name = self.env_prefix + field_name
+        if not self.case_sensitive:
+            env_name = env_name.lower()
+        
+        value = self.env_vars.get(env_name)
+        if value == "" and self.env_ignore_empty:
+            value = None
+        return value, env_name, self.field_is_complex(field)
+    
+    def __call__(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for field_name, field in self.settings_cls.model_fields.items():
+            value, _, value_is_complex = self.get_field_value(field, field_name)
+            if value is not None:
+                data[field_name] = self.prepare_field_value(field_name, field, value, value_is_complex)
+        return data
+
+
+class _Settings(BaseSettings):
+    """Base for the settings classes, sharing one parse of ``.env``.
+    
+    ``env_file`` is left unset in the class config so pydantic-settings'
+    own dotenv source, which it builds for every class, reads nothing.
+    ``.env`` holds every class's variables, so each class ignores the
+    ones meant for the others.
+    """
+    
+    model_config = SettingsConfigDict(extra="ignore")
+    
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        dotenv_settings = SharedDotEnvSettingsSource(settings_cls)
+        return init_settings, env_settings, dotenv_settings, file_secret_settings
+
+
+class DatabaseConfig(_Settings):
     """Database configuration settings."""
     
     model_config = SettingsConfigDict(
         env_prefix="SUPABASE_",
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     url: str = Field(description="Supabase project URL")
@@ -22,13 +135,13 @@ class DatabaseConfig(BaseSettings):
     connection_timeout: int = Field(default=30, description="Connection timeout in seconds")
 
 
-class AIConfig(BaseSettings):
+class AIConfig(_Settings):
     """AI model configuration settings."""
     
     model_config = SettingsConfigDict(
         env_prefix="AI_",
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     openai_api_key: str = Field(description="OpenAI API key")
@@ -41,13 +154,13 @@ class AIConfig(BaseSettings):
     rate_limit_rpm: int = Field(default=3000, description="Rate limit requests per minute")
 
 
-class AirtableConfig(BaseSettings):
+class AirtableConfig(_Settings):
     """Airtable integration configuration."""
     
     model_config = SettingsConfigDict(
         env_prefix="AIRTABLE_",
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     api_key: str = Field(description="Airtable API key")
@@ -57,13 +170,13 @@ class AirtableConfig(BaseSettings):
     retry_attempts: int = Field(default=3, description="Maximum retry attempts")
 
 
-class GmailConfig(BaseSettings):
+class GmailConfig(_Settings):
     """Gmail API configuration."""
     
     model_config = SettingsConfigDict(
         env_prefix="GOOGLE_",
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     client_id: str = Field(description="Google OAuth client ID")
@@ -73,20 +186,24 @@ class GmailConfig(BaseSettings):
         default=[
             "https://www.googleapis.com/auth/gmail.readonly",
             "https://www.googleapis.com/auth/gmail.send",
-            "https://www.googleapis.com/auth/gmail.modify"
+            "https://www.googleapis.com/auth/gmail.modify",
+            # Adds an ID token carrying the user's email to the token response
+            "openid",
+            "https://www.googleapis.com/auth/userinfo.email"
         ],
         description="Gmail API scopes"
     )
     webhook_endpoint: str = Field(default="/api/gmail-webhook", description="Gmail webhook endpoint")
+    webhook_secret: Optional[str] = Field(default=None, description="Shared secret for webhook HMAC signatures")
 
 
-class SecurityConfig(BaseSettings):
+class SecurityConfig(_Settings):
     """Security configuration."""
     
     model_config = SettingsConfigDict(
         env_prefix="SECURITY_",
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     jwt_secret_key: str = Field(description="JWT signing secret")
@@ -94,15 +211,20 @@ class SecurityConfig(BaseSettings):
     jwt_expiration_hours: int = Field(default=24, description="JWT token expiration hours")
     password_hash_rounds: int = Field(default=12, description="bcrypt hash rounds")
     api_rate_limit: int = Field(default=100, description="API requests per minute")
+    rate_limit_redis_url: Optional[str] = Field(default=None, description="Redis URL for shared rate limit counters")
+    trusted_proxies: Optional[List[str]] = Field(
+        default=None,
+        description="Proxy IPs/CIDRs allowed to set X-Forwarded-For; unset trusts it from any peer"
+    )
     encryption_key: str = Field(description="Data encryption key")
 
 
-class SystemConfig(BaseSettings):
+class SystemConfig(_Settings):
     """Main system configuration."""
     
     model_config = SettingsConfigDict(
-        env_file=".env",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
     
     # Environment settings
@@ -131,27 +253,30 @@ class SystemConfig(BaseSettings):
     gmail: GmailConfig = Field(default_factory=GmailConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     
-    @validator("log_level")
+    @field_validator("log_level")
+    @classmethod
     def validate_log_level(cls, v):
         """Validate log level."""
-        valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        if v.upper() not in valid_levels:
-            raise ValueError(f"Invalid log level. Must be one of: {valid_levels}")
-        return v.upper()
+        level = v.upper()
+        if level not in _VALID_LOG_LEVELS:
+            raise ValueError(f"Invalid log level. Must be one of: {', '.join(sorted(_VALID_LOG_LEVELS))}")
+        return level
     
-    @validator("environment")
+    @field_validator("environment")
+    @classmethod
     def validate_environment(cls, v):
         """Validate environment."""
-        valid_envs = {"development", "testing", "staging", "production"}
-        if v.lower() not in valid_envs:
-            raise ValueError(f"Invalid environment. Must be one of: {valid_envs}")
-        return v.lower()
-
-
-# Global configuration instance
-config = SystemConfig()
+        environment = v.lower()
+        if environment not in _VALID_ENVIRONMENTS:
+            raise ValueError(f"Invalid environment. Must be one of: {', '.join(sorted(_VALID_ENVIRONMENTS))}")
+        return environment
 
 
+@lru_cache(maxsize=1)
 def get_config() -> SystemConfig:
-    """Get the global configuration instance."""
-    return config
\ No newline at end of file
+    """Get the global configuration instance.
+    
+    Settings are loaded and validated on first use rather than at import,
+    so importing modules that only need the config types stays cheap.
+    """
+    return SystemConfig()
\ No newline at end of file
@@ -0,0 +1,15 @@
+-- AI Coaching Management System - HNSW Embedding Index
+-- Migration: 002_knowledge_embedding_hnsw.sql
+-- Description: Replace the ivfflat knowledge embedding index with HNSW (pgvector >= 0.5.0)
+
+-- ivfflat picks its list centroids when the index is built, so an index
+-- created on the initially empty table clusters poorly and recall drops as
+-- content is added. HNSW needs no training data and keeps recall stable as
+-- the knowledge base grows, at the cost of a slower build.
+DROP INDEX IF EXISTS idx_knowledge_base_embedding;
+
+-- Queries must ORDER BY embedding <=> query and LIMIT to use the index.
+-- Each scan returns at most hnsw.ef_search rows (default 40); raise it for
+-- the session if a search needs more results than that.
+CREATE INDEX idx_knowledge_base_embedding ON knowledge_base USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
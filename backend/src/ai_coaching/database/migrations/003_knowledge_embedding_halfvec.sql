@@ -0,0 +1,15 @@
+-- AI Coaching Management System - Half-Precision Embedding Index
+-- Migration: 003_knowledge_embedding_halfvec.sql
+-- Description: Index knowledge embeddings as 16-bit halfvec (pgvector >= 0.7.0)
+
+-- HNSW search is bound by how much of the index it reads, and a 1536
+-- dimension vector takes 6KB at full precision. Indexing a halfvec
+-- expression halves the index while the table keeps full-precision
+-- vectors, so the similarity threshold is still checked exactly.
+DROP INDEX IF EXISTS idx_knowledge_base_embedding;
+
+-- Queries must ORDER BY embedding::halfvec(1536) <=> query::halfvec(1536)
+-- to use the index.
+CREATE INDEX idx_knowledge_base_embedding ON knowledge_base
+    USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
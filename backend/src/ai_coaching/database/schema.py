@@ -4,18 +4,85 @@ This module provides Pydantic models that correspond to the database schema,
 migration utilities, and database connection management.
 """
 
+import asyncio
+import os
+import struct
+from contextlib import asynccontextmanager
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated, AsyncIterator, List, Optional, Dict, Any, Tuple, Type, TypeVar, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, validator
-import asyncpg
+import numpy as np
+import orjson
+
+from pydantic import BaseModel, ConfigDict, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
 from pathlib import Path
 import structlog
 
+if TYPE_CHECKING:
+    # Imported on first connection so that importing the models alone does
+    # not load the driver
+    import asyncpg
+
 logger = structlog.get_logger(__name__)
 
+# Dimensions of OpenAI text-embedding-ada-002 vectors
+EMBEDDING_DIMENSIONS = 1536
+
+# Rows read back from our own tables were validated on write and typed by
+# asyncpg, so they are hydrated without re-validation; set to False to
+# validate them anyway (e.g. in tests)
+TRUSTED_DB_ROWS = True
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Embeddings may be passed as plain lists or as float32 arrays
+Embedding = Union[List[float], np.ndarray]
+
+class LazyJSON:
+    """JSONB value kept as raw JSON and decoded on first access.
+    
+    Rows are often routed or filtered without their JSON columns being
+    read, so parsing is deferred until ``value()`` is called.
+    """
+    __slots__ = ("raw", "_decoded")
+    
+    _UNSET = object()
+    
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._decoded = self._UNSET
+    
+    def value(self) -> Any:
+        """Decode the JSON document, once."""
+        if self._decoded is self._UNSET:
+            self._decoded = orjson.loads(self.raw)
+        return self._decoded
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyJSON):
+            return self.value() == other.value()
+        return self.value() == other
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"LazyJSON({self.raw!r})"
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # Accepted as-is; serialized as the decoded document
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda v: v.value())
+        )
+
+# JSONB columns: lazily decoded when read from the database, plain dicts otherwise
+JSONObject = Union[LazyJSON, Dict[str, Any]]
+
 # Enums matching database types
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -53,6 +120,8 @@ class AgentType(str, Enum):
 # Pydantic models for database entities
 class User(BaseModel):
     """User model matching the users table schema."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     id: UUID
     email: str
     name: str
@@ -63,11 +132,10 @@ class User(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        use_enum_values = True
-
 class KnowledgeItem(BaseModel):
     """Knowledge base item with vector embedding."""
+    model_config = ConfigDict(frozen=True)
+    
     id: UUID
     title: str = Field(..., max_length=500)
     content: str
@@ -75,19 +143,18 @@ class KnowledgeItem(BaseModel):
     category: str = Field(..., max_length=100)
     tags: List[str] = []
     relevance_score: float = Field(default=0.0, ge=0.0, le=1.0)
-    embedding: Optional[List[float]] = None  # Vector embedding
+    # Vector embedding; the length is checked by pydantic-core, not a Python validator
+    embedding: Optional[
+        Annotated[List[float], Field(min_length=EMBEDDING_DIMENSIONS, max_length=EMBEDDING_DIMENSIONS)]
+    ] = None
     created_by: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
 
-    @validator('embedding')
-    def validate_embedding_dimensions(cls, v):
-        if v is not None and len(v) != 1536:
-            raise ValueError('Embedding must have exactly 1536 dimensions for OpenAI text-embedding-ada-002')
-        return v
-
 class EmailLog(BaseModel):
     """Email processing log entry."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     id: UUID
     thread_id: str
     message_id: str
@@ -111,14 +178,13 @@ class EmailLog(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        use_enum_values = True
-
 class SystemConfig(BaseModel):
     """System configuration entry."""
+    model_config = ConfigDict(frozen=True)
+    
     id: UUID
     key: str
-    value: Dict[str, Any]  # JSONB field
+    value: JSONObject
     description: Optional[str] = None
     is_sensitive: bool = False
     updated_by: Optional[UUID] = None
@@ -127,42 +193,42 @@ class SystemConfig(BaseModel):
 
 class TaskQueue(BaseModel):
     """Asynchronous task queue entry."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     id: UUID
     task_type: str
     agent_type: AgentType
-    payload: Dict[str, Any]  # JSONB field
+    payload: JSONObject
     status: TaskStatus = TaskStatus.PENDING
     priority: int = Field(default=5, ge=1, le=10)
     attempts: int = 0
     max_attempts: int = 3
     error_message: Optional[str] = None
-    result: Optional[Dict[str, Any]] = None
+    result: Optional[JSONObject] = None
     scheduled_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        use_enum_values = True
-
 class AgentLog(BaseModel):
     """Agent activity log entry."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     id: UUID
     agent_type: AgentType
     task_id: Optional[UUID] = None
     action: str
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[JSONObject] = None
     execution_time_ms: Optional[int] = None
     success: Optional[bool] = None
     error_message: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        use_enum_values = True
-
 class EmailProcessingStats(BaseModel):
     """Email processing analytics model."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     date: datetime
     category: EmailCategory
     priority: EmailPriority
@@ -173,10 +239,122 @@ class EmailProcessingStats(BaseModel):
     avg_confidence: Optional[float] = None
     avg_processing_minutes: Optional[float] = None
 
-    class Config:
-        use_enum_values = True
+# pgvector's binary wire format: dimensions and an unused field as
+# big-endian int16s, followed by the values as big-endian float4s
+_VECTOR_HEADER = struct.Struct(">HH")
+
+def encode_vector(value: Embedding) -> bytes:
+    """Encode an embedding in pgvector's binary format."""
+    values = np.asarray(value, dtype=">f4")
+    return _VECTOR_HEADER.pack(len(values), 0) + values.tobytes()
+
+def decode_vector(data: bytes) -> List[float]:
+    """Decode an embedding from pgvector's binary format."""
+    dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f4", count=dimensions, offset=_VECTOR_HEADER.size).tolist()
+
+# JSONB's binary format is a version byte followed by the JSON text
+_JSONB_VERSION = b"\x01"
+
+def encode_jsonb(value: Any) -> bytes:
+    """Encode a JSONB value in binary format."""
+    raw = value.raw if isinstance(value, LazyJSON) else orjson.dumps(value)
+    return _JSONB_VERSION + raw
+
+def decode_jsonb(data: bytes) -> LazyJSON:
+    """Wrap a binary JSONB value without parsing it."""
+    return LazyJSON(data[1:])
+
+async def register_type_codecs(conn: "asyncpg.Connection") -> None:
+    """Set up binary codecs for ``vector`` and ``jsonb`` values.
+    
+    The vector text codec formats and parses every float in Python; the
+    binary one copies the whole buffer at once. JSONB values are handed
+    out as ``LazyJSON`` and only parsed when read. Before the pgvector
+    extension is installed there is no vector type to register, and only
+    the JSONB codec is set up.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=encode_jsonb,
+        decoder=decode_jsonb,
+        schema="pg_catalog",
+        format="binary"
+    )
+    
+    try:
+        await conn.set_type_codec(
+            "vector",
+            encoder=encode_vector,
+            decoder=decode_vector,
+            schema="public",
+            format="binary"
+        )
+    except ValueError:
+        logger.debug("pgvector type not found, vector codec not registered")
 
 # Migration utilities
+# Connection pools shared by every migrator, keyed by connection string
+_POOLS: Dict[str, "asyncpg.Pool"] = {}
+_POOL_LOCK = asyncio.Lock()
+
+async def get_pool(connection_string: str) -> "asyncpg.Pool":
+    """Get the shared connection pool for a database, creating it on first use.
+    
+    Connections are kept open between calls, so only the first one pays
+    for the TCP and authentication handshake. Each pooled connection
+    caches the statements it has prepared, so repeated queries skip
+    planning as well.
+    """
+    pool = _POOLS.get(connection_string)
+    if pool is not None:
+        return pool
+    
+    async with _POOL_LOCK:
+        pool = _POOLS.get(connection_string)
+        if pool is None:
+            import asyncpg
+            
+            pool = await asyncpg.create_pool(
+                connection_string, min_size=1, max_size=10, init=register_type_codecs
+            )
+            _POOLS[connection_string] = pool
+    return pool
+
+async def close_pools() -> None:
+    """Close all shared connection pools."""
+    pools = list(_POOLS.values())
+    _POOLS.clear()
+    for pool in pools:
+        await pool.close()
+
+@lru_cache(maxsize=4)
+def _scan_migrations(migrations_dir: Path, mtime_ns: int) -> Tuple[Tuple[str, Path], ...]:
+    """List a directory's migration files as sorted ``(migration_id, path)`` pairs.
+    
+    Keyed on the directory's modification time, so adding or removing a
+    file triggers a fresh scan.
+    """
+    names = []
+    with os.scandir(migrations_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".sql"):
+                names.append(entry.name)
+    names.sort()
+    
+    migrations = []
+    for name in names:
+        # The ID is the part before the first underscore, or the whole stem
+        separator = name.find('_')
+        migration_id = name[:separator] if separator >= 0 else name[:-4]
+        migrations.append((migration_id, migrations_dir / name))
+    return tuple(migrations)
+
+@lru_cache(maxsize=None)
+def _read_migration_sql(path: Path) -> str:
+    """Read a migration file; migration files do not change at runtime."""
+    return path.read_bytes().decode('utf-8')
+
 class DatabaseMigrator:
     """Database migration manager for AI Coaching System."""
 
@@ -184,53 +362,53 @@ class DatabaseMigrator:
         self.connection_string = connection_string
         self.migrations_dir = Path(__file__).parent / "migrations"
 
-    async def get_connection(self) -> asyncpg.Connection:
-        """Get database connection."""
-        return await asyncpg.connect(self.connection_string)
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator["asyncpg.Connection"]:
+        """Borrow a connection from the shared pool for the duration of a block."""
+        pool = await get_pool(self.connection_string)
+        async with pool.acquire() as conn:
+            yield conn
 
     async def get_current_migration_version(self) -> str:
         """Get the current migration version from database."""
         try:
-            conn = await self.get_connection()
-            try:
+            async with self.get_connection() as conn:
                 result = await conn.fetchval(
                     "SELECT value->>'migration_version' FROM system_config WHERE key = 'migration_version'"
                 )
                 return result or "000"
-            finally:
-                await conn.close()
         except Exception as e:
             logger.warning("Could not fetch migration version, assuming fresh database", error=str(e))
             return "000"
 
+    def _migration_files(self) -> Dict[str, Path]:
+        """Map migration IDs to their files, keeping the first file per ID."""
+        try:
+            mtime_ns = self.migrations_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        
+        files: Dict[str, Path] = {}
+        for migration_id, file_path in _scan_migrations(self.migrations_dir, mtime_ns):
+            files.setdefault(migration_id, file_path)
+        return files
+
     async def get_available_migrations(self) -> List[str]:
         """Get list of available migration files."""
-        if not self.migrations_dir.exists():
-            return []
-        
-        migrations = []
-        for file_path in sorted(self.migrations_dir.glob("*.sql")):
-            migration_id = file_path.stem.split('_')[0]
-            migrations.append(migration_id)
-        
-        return migrations
+        return list(self._migration_files())
 
     async def run_migration(self, migration_id: str) -> bool:
         """Run a specific migration."""
-        migration_file = self.migrations_dir / f"{migration_id}_*.sql"
-        migration_files = list(self.migrations_dir.glob(f"{migration_id}_*.sql"))
+        migration_file = self._migration_files().get(migration_id)
         
-        if not migration_files:
+        if migration_file is None:
             logger.error("Migration file not found", migration_id=migration_id)
             return False
-
-        migration_file = migration_files[0]
         
         try:
-            conn = await self.get_connection()
-            try:
+            async with self.get_connection() as conn:
                 # Read and execute migration SQL
-                migration_sql = migration_file.read_text(encoding='utf-8')
+                migration_sql = _read_migration_sql(migration_file)
                 
                 logger.info("Running migration", migration_id=migration_id, file=str(migration_file))
                 
@@ -248,10 +426,11 @@ class DatabaseMigrator:
                     """, migration_id)
 
                 logger.info("Migration completed successfully", migration_id=migration_id)
-                return True
-                
-            finally:
-                await conn.close()
+            
+            # Reconnect so pooled connections pick up types the migration created
+            pool = await get_pool(self.connection_string)
+            await pool.expire_connections()
+            return True
                 
         except Exception as e:
             logger.error("Migration failed", migration_id=migration_id, error=str(e))
@@ -290,8 +469,7 @@ class DatabaseMigrator:
     async def validate_schema(self) -> Dict[str, Any]:
         """Validate database schema and return health information."""
         try:
-            conn = await self.get_connection()
-            try:
+            async with self.get_connection() as conn:
                 # Check if required extensions are installed
                 extensions = await conn.fetch("""
                     SELECT extname, extversion 
@@ -327,9 +505,6 @@ class DatabaseMigrator:
                     "connection_healthy": True
                 }
                 
-            finally:
-                await conn.close()
-                
         except Exception as e:
             logger.error("Schema validation failed", error=str(e))
             return {
@@ -339,12 +514,34 @@ class DatabaseMigrator:
             }
 
 # Utility functions for common database operations
-async def get_user_by_email(conn: asyncpg.Connection, email: str) -> Optional[User]:
+def model_from_row(
+    model: Type[ModelT],
+    row: "asyncpg.Record",
+    columns: Optional[Tuple[str, ...]] = None
+) -> ModelT:
+    """Build a model from a database row.
+    
+    Columns the model does not declare (e.g. computed distances) are
+    ignored. Validation is skipped unless ``TRUSTED_DB_ROWS`` is False.
+    
+    Args:
+        model: Model class to build
+        row: Database row
+        columns: Field names of the row's leading values, in order; when
+            given, values are paired by position instead of being looked
+            up by column name
+    """
+    data = dict(zip(columns, row)) if columns is not None else dict(row)
+    if TRUSTED_DB_ROWS:
+        return model.model_construct(**data)
+    return model(**data)
+
+async def get_user_by_email(conn: "asyncpg.Connection", email: str) -> Optional[User]:
     """Get user by email address."""
     row = await conn.fetchrow("SELECT * FROM users WHERE email = $1", email)
-    return User(**dict(row)) if row else None
+    return model_from_row(User, row) if row else None
 
-async def create_knowledge_item(conn: asyncpg.Connection, item: KnowledgeItem) -> UUID:
+async def create_knowledge_item(conn: "asyncpg.Connection", item: KnowledgeItem) -> UUID:
     """Create a new knowledge base item."""
     item_id = await conn.fetchval("""
         INSERT INTO knowledge_base 
@@ -356,19 +553,53 @@ async def create_knowledge_item(conn: asyncpg.Connection, item: KnowledgeItem) -
     
     return item_id
 
+# Columns written by create_knowledge_items_bulk, in record order
+_KNOWLEDGE_COPY_COLUMNS = (
+    'id', 'title', 'content', 'source_url', 'category', 'tags', 'relevance_score', 'embedding', 'created_by'
+)
+
+async def create_knowledge_items_bulk(conn: "asyncpg.Connection", items: List[KnowledgeItem]) -> List[UUID]:
+    """Create many knowledge base items in a single COPY.
+    
+    COPY cannot return generated keys, so each item's own ``id`` is
+    written instead of a database-assigned one.
+    """
+    records = [
+        (item.id, item.title, item.content, item.source_url, item.category,
+         item.tags, item.relevance_score, item.embedding, item.created_by)
+        for item in items
+    ]
+    if records:
+        await conn.copy_records_to_table('knowledge_base', records=records, columns=_KNOWLEDGE_COPY_COLUMNS)
+    
+    return [item.id for item in items]
+
+# Fields read back by search_knowledge_by_vector, in select-list order
+_KNOWLEDGE_FIELDS = tuple(KnowledgeItem.model_fields)
+
+# Select list matching _KNOWLEDGE_FIELDS; casts give the model's Python types
+# (DECIMAL would arrive as Decimal, NULL tags as None)
+_KNOWLEDGE_SELECT = ", ".join(
+    {
+        "tags": "COALESCE(tags, '{}') AS tags",
+        "relevance_score": "relevance_score::float8 AS relevance_score",
+    }.get(field, field)
+    for field in _KNOWLEDGE_FIELDS
+)
+
 async def search_knowledge_by_vector(
-    conn: asyncpg.Connection, 
-    query_embedding: List[float], 
+    conn: "asyncpg.Connection", 
+    query_embedding: Embedding, 
     limit: int = 5,
     similarity_threshold: float = 0.7
 ) -> List[KnowledgeItem]:
     """Search knowledge base using vector similarity."""
-    rows = await conn.fetch("""
-        SELECT *, (embedding <=> $1) as distance
+    rows = await conn.fetch(f"""
+        SELECT {_KNOWLEDGE_SELECT}
         FROM knowledge_base 
         WHERE embedding <=> $1 < $2
-        ORDER BY embedding <=> $1
+        ORDER BY embedding::halfvec(1536) <=> $1::halfvec(1536)
         LIMIT $3
     """, query_embedding, 1.0 - similarity_threshold, limit)
     
-    return [KnowledgeItem(**dict(row)) for row in rows]
\ No newline at end of file
+    return [model_from_row(KnowledgeItem, row, _KNOWLEDGE_FIELDS) for row in rows]
\ No newline at end of file
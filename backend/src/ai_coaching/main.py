@@ -1,52 +1,168 @@
 """Main FastAPI application for AI Coaching Management System."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
+import orjson
 import structlog
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import Response
+from starlette.routing import Route
 
 from ai_coaching.config.settings import get_config
 from ai_coaching.models.base import SystemDependencies, APIResponse
-from ai_coaching.services.database import DatabaseService
-from ai_coaching.services.embedding import EmbeddingService
-from ai_coaching.services.airtable import AirtableService
-from ai_coaching.services.gmail import GmailService
-from ai_coaching.agents.registry import AgentRegistry, initialize_agent_registry
-from ai_coaching.api.middleware.rate_limit import RateLimitMiddleware
+from ai_coaching.api.middleware.rate_limit import RateLimitMiddleware, create_redis_backend
+from ai_coaching.utils.timestamps import current_iso_timestamp
+
+# Log fields may hold naive datetimes and enum-keyed dicts (e.g. agent health)
+_LOG_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _log_dumps(event_dict: Dict[str, Any], default=None) -> str:
+    """Serialize a log event with orjson; stdlib logging takes the line as str."""
+    return orjson.dumps(event_dict, default=default, option=_LOG_JSON_OPTIONS).decode()
+
+
+def configure_logging(log_level: str) -> None:
+    """Configure structured logging.
+    
+    Loggers are built filtering at the configured level, so calls below
+    it return immediately instead of assembling an event and running it
+    through the processors only for ``filter_by_level`` to drop it.
+    
+    Args:
+        log_level: Minimum level name, e.g. "INFO"
+    """
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(serializer=_log_dumps)
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, log_level)),
+        cache_logger_on_first_use=True,
+    )
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
 
 logger = structlog.get_logger(__name__)
 
 # Global dependencies container
 dependencies: SystemDependencies = None
 
+# Longest a single service probe may hold up the detailed health check
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+# OpenAPI documentation for handlers that return APIResponse-shaped dicts
+_API_RESPONSE_DOCS = {200: {"model": APIResponse}}
+
+
+def _api_response(
+    success: bool,
+    data: Optional[Dict[str, Any]] = None,
+    message: Optional[str] = None,
+    error: Any = None,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Build a JSON response in the APIResponse shape.
+    
+    These bodies have a fixed shape, so they are serialized directly with
+    orjson instead of validating an APIResponse model and running it
+    through FastAPI's encoder on every request.
+    """
+    body = {
+        "success": success,
+        "data": data,
+        "message": message,
+        "error": error,
+        "timestamp": current_iso_timestamp()
+    }
+    return Response(
+        content=orjson.dumps(body),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
+
+
+async def _probe_service(name: str, check) -> bool:
+    """Await a service health check, reporting errors and timeouts as unhealthy.
+    
+    Args:
+        name: Service name for logging
+        check: Health check coroutine
+        
+    Returns:
+        True if the service reported healthy in time, False otherwise
+    """
+    try:
+        return await asyncio.wait_for(check, timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Service health check timed out", service=name)
+    except Exception as e:
+        logger.warning("Service health check failed", service=name, error=str(e))
+    return False
+
+
+@lru_cache(maxsize=1)
+def _health_messages(timestamp: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build the ASGI messages of the basic health response for a timestamp."""
+    body = orjson.dumps({
+        "success": True,
+        "data": {"status": "healthy", "service": "ai-coaching-backend"},
+        "message": "Service is running",
+        "error": None,
+        "timestamp": timestamp
+    })
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode())
+    ]
+    return (
+        {"type": "http.response.start", "status": 200, "headers": headers},
+        {"type": "http.response.body", "body": body}
+    )
+
+
+class _BasicHealthCheck:
+    """Basic health check endpoint, served as a bare ASGI app.
+    
+    The response depends only on the current second, so the messages
+    are built once per second and sent as-is, skipping FastAPI's request
+    parsing, dependency resolution and response encoding. Starlette
+    wraps plain functions as request handlers, hence the class.
+    """
+    
+    async def __call__(self, scope, receive, send) -> None:
+        start, body = _health_messages(current_iso_timestamp())
+        await send(start)
+        await send(body)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
+    # Service and agent modules are imported here so that importing this
+    # module (workers, reloads, tooling) does not pay for them up front
+    from ai_coaching.services.database import DatabaseService
+    from ai_coaching.services.embedding import EmbeddingService
+    from ai_coaching.services.airtable import AirtableService
+    from ai_coaching.services.gmail import GmailService
+    from ai_coaching.agents.registry import initialize_agent_registry
+    from ai_coaching.database.schema import close_pools
+    
     config = get_config()
     
     logger.info(
@@ -85,6 +201,10 @@ async def lifespan(app: FastAPI):
             logger=logger
         )
         
+        # Long-lived services shared by the health endpoints
+        app.state.db_service = db_service
+        app.state.embedding_service = embedding_service
+        
         # Initialize agent registry
         initialize_agent_registry(dependencies)
         
@@ -97,11 +217,18 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down AI Coaching Management System")
+        if dependencies is not None:
+            await dependencies.airtable_service.close()
+        rate_limit_backend = getattr(app.state, "rate_limit_backend", None)
+        if rate_limit_backend is not None:
+            await rate_limit_backend.close()
+        await close_pools()
 
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
     config = get_config()
+    configure_logging(config.log_level)
     
     app = FastAPI(
         title=config.app_name,
@@ -112,10 +239,15 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if config.debug else None
     )
     
-    # Add rate limiting middleware
+    # Add rate limiting middleware; the app owns the Redis pool so the
+    # lifespan can close it on shutdown
+    app.state.rate_limit_backend = create_redis_backend(config.security.rate_limit_redis_url)
     app.add_middleware(
         RateLimitMiddleware,
-        default_requests_per_minute=config.security.api_rate_limit
+        default_requests_per_minute=config.security.api_rate_limit,
+        api_prefix=config.api_prefix,
+        redis_backend=app.state.rate_limit_backend,
+        trusted_proxies=config.security.trusted_proxies
     )
     
     # Configure CORS
@@ -123,8 +255,8 @@ def create_app() -> FastAPI:
         CORSMiddleware,
         allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Frontend URLs
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST", "OPTIONS"],  # Methods the API routes use
+        allow_headers=["Authorization", "Content-Type"],
     )
     
     # Add trusted host middleware for production
@@ -144,13 +276,11 @@ def create_app() -> FastAPI:
             method=request.method
         )
         
-        return JSONResponse(
-            status_code=500,
-            content=APIResponse(
-                success=False,
-                error="Internal server error",
-                message="An unexpected error occurred"
-            ).dict()
+        return _api_response(
+            success=False,
+            error="Internal server error",
+            message="An unexpected error occurred",
+            status_code=500
         )
     
     @app.exception_handler(HTTPException)
@@ -162,48 +292,45 @@ def create_app() -> FastAPI:
             path=request.url.path
         )
         
-        return JSONResponse(
+        return _api_response(
+            success=False,
+            error=exc.detail,
+            message=f"HTTP {exc.status_code} error",
             status_code=exc.status_code,
-            content=APIResponse(
-                success=False,
-                error=exc.detail,
-                message=f"HTTP {exc.status_code} error"
-            ).dict()
+            headers=exc.headers
         )
     
-    # Health check endpoints
-    @app.get("/health", response_model=APIResponse)
-    async def health_check():
-        """Basic health check endpoint."""
-        return APIResponse(
-            success=True,
-            data={"status": "healthy", "service": "ai-coaching-backend"},
-            message="Service is running"
-        )
+    # Health check endpoints; the basic probe is not part of the OpenAPI schema
+    app.router.routes.append(Route("/health", _BasicHealthCheck(), methods=["GET"]))
     
-    @app.get("/health/detailed", response_model=APIResponse)
+    @app.get("/health/detailed", responses=_API_RESPONSE_DOCS)
     async def detailed_health_check():
         """Detailed health check with service status."""
         if not dependencies:
             raise HTTPException(status_code=503, detail="Services not initialized")
         
         try:
-            # Check individual service health
-            health_status = {
-                "database": await dependencies.db_service.health_check(),
-                "embedding": await dependencies.embedding_service.health_check(),
-                "airtable": await dependencies.airtable_service.health_check(),
-                "gmail": await dependencies.gmail_service.health_check()
+            from ai_coaching.agents.registry import AgentRegistry
+            
+            # Probe services and agents concurrently
+            services = {
+                "database": dependencies.db_service,
+                "embedding": dependencies.embedding_service,
+                "airtable": dependencies.airtable_service,
+                "gmail": dependencies.gmail_service
             }
+            *service_health, agent_health = await asyncio.gather(
+                *(_probe_service(name, service.health_check()) for name, service in services.items()),
+                AgentRegistry.health_check()
+            )
             
-            # Check agent registry
-            agent_health = AgentRegistry.health_check()
+            health_status = dict(zip(services, service_health))
             health_status.update({f"agent_{k.value}": v for k, v in agent_health.items()})
             
             # Overall health
             overall_health = all(health_status.values())
             
-            return APIResponse(
+            return _api_response(
                 success=overall_health,
                 data={
                     "overall_health": overall_health,
@@ -217,17 +344,19 @@ def create_app() -> FastAPI:
             logger.error("Health check failed", error=str(e))
             raise HTTPException(status_code=503, detail="Health check failed")
     
-    @app.get("/info", response_model=APIResponse)
+    app_info_data = {
+        "name": config.app_name,
+        "version": config.app_version,
+        "environment": config.environment,
+        "debug": config.debug
+    }
+    
+    @app.get("/info", responses=_API_RESPONSE_DOCS)
     async def app_info():
         """Get application information."""
-        return APIResponse(
+        return _api_response(
             success=True,
-            data={
-                "name": config.app_name,
-                "version": config.app_version,
-                "environment": config.environment,
-                "debug": config.debug
-            },
+            data=app_info_data,
             message="Application information"
         )
     
@@ -260,6 +389,8 @@ app = create_app()
 
 
 if __name__ == "__main__":
+    import uvicorn
+    
     config = get_config()
     
     # Configure Python logging to work with structlog
@@ -22,6 +22,7 @@ from .knowledge import (
     ContentCategory,
     ContentSource,
     ContentFormat,
+    EmbeddingVector,
     KnowledgeItem,
     KnowledgeItemMetadata,
     KnowledgeSearchQuery,
@@ -46,6 +47,7 @@ __all__ = [
     "ContentCategory",
     "ContentSource",
     "ContentFormat",
+    "EmbeddingVector",
     "KnowledgeItem",
     "KnowledgeItemMetadata",
     "KnowledgeSearchQuery",
@@ -1,16 +1,129 @@
 """Knowledge base data models with comprehensive validation and typing."""
 
+import hashlib
 import re
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any, Union
+from typing import Hashable, Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, GetCoreSchemaHandler, TypeAdapter, field_validator, model_validator
+from pydantic_core import core_schema
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Runs of whitespace collapsed in tags and keywords
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# URL prefixes accepted for knowledge sources
+_ALLOWED_URL_SCHEMES = ('http://', 'https://', 'file://')
+
+# Weights of the scores combined by KnowledgeItem.calculate_composite_score
+_COMPOSITE_WEIGHTS = {
+    'relevance': 0.4,
+    'quality': 0.3,
+    'confidence': 0.2,
+    'usefulness': 0.1
+}
+_COMPOSITE_WEIGHT_VECTOR = np.array(list(_COMPOSITE_WEIGHTS.values()))
+
+# Dimensions of OpenAI text-embedding-ada-002 vectors
+EMBEDDING_DIMENSIONS = 1536
+
+
+class EmbeddingVector:
+    """Embedding held as one read-only float32 array.
+    
+    A list of Python floats costs ~43KB per 1536-dimension embedding; the
+    array takes 6KB and can be stacked into a matrix for similarity search
+    without converting element by element. Accepts lists, arrays or raw
+    float32 buffers, and serializes back to a list of floats.
+    """
+    __slots__ = ("array",)
+    
+    def __init__(self, values: Union[List[float], np.ndarray, bytes]):
+        if isinstance(values, (bytes, bytearray, memoryview)):
+            if len(values) % 4:
+                raise ValueError('Embedding buffer must hold float32 values')
+            array = np.frombuffer(values, dtype=np.float32)
+        elif isinstance(values, (list, tuple, np.ndarray)):
+            try:
+                array = np.asarray(values)
+            except (TypeError, ValueError):
+                raise ValueError('Embedding vector must contain only numeric values')
+            # One pass in C instead of an isinstance check per element
+            if array.dtype.kind not in "biuf" or array.ndim != 1:
+                raise ValueError('Embedding vector must contain only numeric values')
+            array = array.astype(np.float32)
+        else:
+            raise ValueError('Embedding vector must be a list, array or float32 buffer')
+        
+        array.flags.writeable = False
+        self.array = array
+    
+    def __len__(self) -> int:
+        return len(self.array)
+    
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.array.tolist())
+    
+    def __getitem__(self, index):
+        return self.array[index]
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EmbeddingVector):
+            other = other.array
+        elif not isinstance(other, (list, tuple, np.ndarray)):
+            return NotImplemented
+        return bool(np.array_equal(self.array, np.asarray(other, dtype=np.float32)))
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"EmbeddingVector(dimensions={len(self.array)})"
+    
+    def tolist(self) -> List[float]:
+        """Return the embedding as a list of floats."""
+        return self.array.tolist()
+    
+    def tobytes(self) -> bytes:
+        """Return the raw float32 buffer."""
+        return self.array.tobytes()
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # Lists at the API edge, arrays in memory. Assignment is not
+        # validated, so the serializer also accepts plain lists and arrays
+        return core_schema.no_info_plain_validator_function(
+            lambda v: v if isinstance(v, cls) else cls(v),
+            json_schema_input_schema=core_schema.list_schema(core_schema.float_schema()),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda v: np.asarray(v, dtype=np.float32).tolist()
+            )
+        )
+
+
+def embedding_matrix(items: Iterable["KnowledgeItem"]) -> np.ndarray:
+    """Stack item embeddings into one contiguous (N, dimensions) matrix.
+    
+    Similarity against a query is then a single ``matrix @ query``.
+    
+    Args:
+        items: Knowledge items that all have embeddings
+        
+    Returns:
+        float32 matrix with one row per item
+    """
+    rows = [np.asarray(item.embedding_vector, dtype=np.float32) for item in items]
+    if not rows:
+        return np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+    return np.stack(rows)
+
 
 class ContentCategory(str, Enum):
     """Knowledge base content categories."""
@@ -28,6 +141,11 @@ class ContentCategory(str, Enum):
     OTHER = "other"
 
 
+# Category as it appears in search text, keyed by value; members are str
+# enums, so lookups work for both members and the stored enum values
+_CATEGORY_SEARCH_TEXT = {category.value: category.value.replace('_', ' ') for category in ContentCategory}
+
+
 class ContentSource(str, Enum):
     """Source of knowledge content."""
     MANUAL_ENTRY = "manual_entry"
@@ -64,6 +182,7 @@ class KnowledgeItemMetadata(BaseModel):
 
 class KnowledgeItem(BaseModel):
     """Enhanced knowledge base item with comprehensive validation."""
+    model_config = ConfigDict(use_enum_values=True)
     
     # Core fields
     id: Optional[UUID] = Field(None, description="Unique identifier")
@@ -89,7 +208,7 @@ class KnowledgeItem(BaseModel):
     confidence_score: float = Field(default=0.0, ge=0.0, le=1.0, description="Confidence in accuracy")
     
     # Vector embedding
-    embedding_vector: Optional[List[float]] = Field(None, description="Vector embedding for similarity search")
+    embedding_vector: Optional[EmbeddingVector] = Field(None, description="Vector embedding for similarity search")
     embedding_model: str = Field(default="text-embedding-ada-002", description="Model used for embedding")
     
     # Metadata
@@ -97,7 +216,7 @@ class KnowledgeItem(BaseModel):
     
     # Relationships
     parent_id: Optional[UUID] = Field(None, description="Parent item for hierarchical content")
-    related_items: List[UUID] = Field(default_factory=list, description="Related knowledge items")
+    related_items: Tuple[UUID, ...] = Field(default=(), description="Related knowledge items")
     
     # Versioning
     version: int = Field(default=1, description="Content version number")
@@ -114,13 +233,6 @@ class KnowledgeItem(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
     
-    class Config:
-        use_enum_values = True
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat(),
-            UUID: lambda uuid: str(uuid)
-        }
-    
     @field_validator('title')
     @classmethod
     def validate_title(cls, v):
@@ -143,13 +255,8 @@ class KnowledgeItem(BaseModel):
     @classmethod
     def validate_embedding_dimensions(cls, v):
         """Validate embedding vector dimensions."""
-        if v is not None:
-            if not isinstance(v, list):
-                raise ValueError('Embedding vector must be a list')
-            if len(v) != 1536:
-                raise ValueError('Embedding must have exactly 1536 dimensions for text-embedding-ada-002')
-            if not all(isinstance(x, (int, float)) for x in v):
-                raise ValueError('Embedding vector must contain only numeric values')
+        if v is not None and len(v) != EMBEDDING_DIMENSIONS:
+            raise ValueError('Embedding must have exactly 1536 dimensions for text-embedding-ada-002')
         return v
     
     @field_validator('tags', 'keywords')
@@ -159,24 +266,34 @@ class KnowledgeItem(BaseModel):
         if v is None:
             return []
         
+        # Already-normalized input, e.g. rehydrated from the database, is kept as is
+        if all(0 < len(item) <= 50 and item == item.lower() and item == ' '.join(item.split()) for item in v):
+            return v
+        
         # Clean and validate each tag/keyword
         cleaned = []
         for item in v:
             if isinstance(item, str) and item.strip():
                 # Remove extra whitespace and convert to lowercase
-                clean_item = re.sub(r'\s+', ' ', item.strip().lower())
+                clean_item = _WHITESPACE_RE.sub(' ', item.strip().lower())
                 if len(clean_item) <= 50:  # Max length per tag
                     cleaned.append(clean_item)
         
         return cleaned
     
+    @field_validator('related_items')
+    @classmethod
+    def validate_related_items(cls, v):
+        """Drop duplicate related items, keeping first-seen order."""
+        return tuple(dict.fromkeys(v))
+    
     @field_validator('source_url')
     @classmethod
     def validate_source_url(cls, v):
         """Validate source URL format."""
         if v is not None:
             v = v.strip()
-            if v and not (v.startswith('http://') or v.startswith('https://') or v.startswith('file://')):
+            if v and not v.startswith(_ALLOWED_URL_SCHEMES):
                 raise ValueError('Source URL must be a valid HTTP, HTTPS, or file URL')
         return v
     
@@ -199,12 +316,7 @@ class KnowledgeItem(BaseModel):
     
     def calculate_composite_score(self) -> float:
         """Calculate a composite score for ranking."""
-        weights = {
-            'relevance': 0.4,
-            'quality': 0.3,
-            'confidence': 0.2,
-            'usefulness': 0.1
-        }
+        weights = _COMPOSITE_WEIGHTS
         
         composite = (
             self.relevance_score * weights['relevance'] +
@@ -215,6 +327,33 @@ class KnowledgeItem(BaseModel):
         
         return round(composite, 3)
     
+    @classmethod
+    def batch_composite_scores(cls, items: List["KnowledgeItem"]) -> np.ndarray:
+        """Calculate composite scores for many items with one matrix product.
+        
+        Args:
+            items: Knowledge items to score
+            
+        Returns:
+            Scores aligned with ``items``, matching calculate_composite_score
+        """
+        scores = np.fromiter(
+            (
+                score
+                for item in items
+                for score in (
+                    item.relevance_score,
+                    item.quality_score,
+                    item.confidence_score,
+                    item.metadata.usefulness_score
+                )
+            ),
+            dtype=np.float64,
+            count=4 * len(items)
+        ).reshape(-1, 4)
+        
+        return (scores @ _COMPOSITE_WEIGHT_VECTOR).round(3)
+    
     def update_access_stats(self) -> None:
         """Update access statistics."""
         self.metadata.access_count += 1
@@ -228,23 +367,92 @@ class KnowledgeItem(BaseModel):
         age_days = (datetime.utcnow() - self.updated_at).days
         return age_days > max_age_days
     
+    def content_hash(self) -> str:
+        """Hash the title and content, for detecting unchanged content.
+        
+        Items with equal hashes embed identically, so reindexing can skip
+        re-embedding them.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.title.encode())
+        digest.update(b'\0')
+        digest.update(self.content.encode())
+        return digest.hexdigest()
+    
     def to_search_text(self) -> str:
         """Generate optimized text for search indexing."""
+        # One join over every fragment, without intermediate tag/keyword strings
         search_parts = [
             self.title,
             self.content,
-            self.summary or "",
-            " ".join(self.tags),
-            " ".join(self.keywords),
-            self.category.value.replace('_', ' '),
-            self.subcategory or ""
+            self.summary,
+            *self.tags,
+            *self.keywords,
+            _CATEGORY_SEARCH_TEXT[self.category],
+            self.subcategory
         ]
         
         return " ".join(filter(None, search_parts))
+    
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "KnowledgeItem":
+        """Rebuild an item from data that was already validated, without re-validating.
+        
+        For rehydration paths such as cache loads, where the data came from
+        model_dump() of a validated item. Only the nested metadata and the
+        embedding are converted; nothing is checked.
+        
+        Args:
+            data: Field values of a previously validated item
+            
+        Returns:
+            Knowledge item built without running validators
+        """
+        data = dict(data)
+        
+        metadata = data.get("metadata")
+        if isinstance(metadata, dict):
+            data["metadata"] = KnowledgeItemMetadata.model_construct(**metadata)
+        
+        embedding = data.get("embedding_vector")
+        if embedding is not None and not isinstance(embedding, EmbeddingVector):
+            data["embedding_vector"] = EmbeddingVector(embedding)
+        
+        return cls.model_construct(**data)
+    
+    @classmethod
+    def validate_many(cls, raw_items: List[Dict[str, Any]]) -> List["KnowledgeItem"]:
+        """Validate a batch of raw items in a single call.
+        
+        Args:
+            raw_items: Item dictionaries, e.g. from a batch ingest payload
+            
+        Returns:
+            Validated knowledge items in input order
+        """
+        return _KNOWLEDGE_ITEM_LIST_ADAPTER.validate_python(raw_items)
+    
+    @classmethod
+    def validate_many_json(cls, data: Union[str, bytes]) -> List["KnowledgeItem"]:
+        """Parse and validate a JSON array of items without an intermediate dict pass.
+        
+        Args:
+            data: JSON array of knowledge items
+            
+        Returns:
+            Validated knowledge items in input order
+        """
+        return _KNOWLEDGE_ITEM_LIST_ADAPTER.validate_json(data)
+
+
+# Built once so batch ingest reuses the compiled validator
+_KNOWLEDGE_ITEM_LIST_ADAPTER = TypeAdapter(List[KnowledgeItem])
 
 
 class KnowledgeSearchQuery(BaseModel):
     """Model for knowledge base search queries."""
+    model_config = ConfigDict(use_enum_values=True)
+    
     query_text: str = Field(..., min_length=1, description="Search query text")
     categories: List[ContentCategory] = Field(default_factory=list, description="Filter by categories")
     tags: List[str] = Field(default_factory=list, description="Filter by tags")
@@ -255,32 +463,52 @@ class KnowledgeSearchQuery(BaseModel):
     include_outdated: bool = Field(default=False, description="Include potentially outdated content")
     vector_similarity_threshold: float = Field(default=0.7, ge=0.0, le=1.0, description="Vector similarity threshold")
     
-    class Config:
-        use_enum_values = True
+    def cache_key(self) -> Hashable:
+        """Build a key identifying queries that return the same results.
+        
+        Filters are compared as sets, so their order does not matter, and
+        the query text is reduced to a fixed-size digest.
+        """
+        return (
+            hashlib.blake2b(self.query_text.encode(), digest_size=16).digest(),
+            self.filter_key()
+        )
+    
+    def filter_key(self) -> Hashable:
+        """Build a key identifying the query's filters, ignoring its text."""
+        return (
+            frozenset(self.categories),
+            frozenset(self.tags),
+            frozenset(self.source_types),
+            self.min_relevance_score,
+            self.min_quality_score,
+            self.max_results,
+            self.include_outdated,
+            self.vector_similarity_threshold
+        )
 
 
 class KnowledgeSearchResult(BaseModel):
     """Search result with relevance scoring."""
+    model_config = ConfigDict(use_enum_values=True)
+    
     item: KnowledgeItem = Field(..., description="Found knowledge item")
     relevance_score: float = Field(..., ge=0.0, le=1.0, description="Search relevance score")
     match_type: str = Field(..., description="Type of match (vector, text, tag, etc.)")
     matched_snippets: List[str] = Field(default_factory=list, description="Relevant text snippets")
     vector_similarity: Optional[float] = Field(None, description="Vector similarity score if applicable")
-    
-    class Config:
-        use_enum_values = True
 
 
 class KnowledgeSearchResponse(BaseModel):
     """Response from knowledge search operation."""
+    model_config = ConfigDict(use_enum_values=True)
+    
     query: KnowledgeSearchQuery = Field(..., description="Original search query")
     results: List[KnowledgeSearchResult] = Field(..., description="Search results")
     total_results: int = Field(..., description="Total number of matching items")
     search_time_ms: float = Field(..., description="Search execution time in milliseconds")
     used_vector_search: bool = Field(default=False, description="Whether vector search was used")
-    
-    class Config:
-        use_enum_values = True
+    from_cache: bool = Field(default=False, description="Whether the response was served from a cache")
 
 
 class KnowledgeBatchOperation(BaseModel):
@@ -311,8 +539,3 @@ class KnowledgeStats(BaseModel):
     outdated_items_count: int = Field(..., description="Number of potentially outdated items")
     items_without_embeddings: int = Field(..., description="Items missing vector embeddings")
     last_updated: datetime = Field(..., description="When statistics were last calculated")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat()
-        }
\ No newline at end of file
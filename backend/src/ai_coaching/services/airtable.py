@@ -1,12 +1,13 @@
 """Airtable integration service for family data and schedule management."""
 
 import asyncio
-from typing import Any, Dict, List, Optional
+import functools
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 from datetime import datetime, UTC
 import time
+from urllib.parse import quote
 
 import structlog
-from airtable import Airtable
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -14,31 +15,130 @@ from ai_coaching.config.settings import AirtableConfig
 
 logger = structlog.get_logger(__name__)
 
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+
+# Children looked up per request; keeps the OR() formula well within URL limits
+CHILDREN_LOOKUP_CHUNK_SIZE = 10
+
+# Lookups younger than this are served from cache; older ones up to the stale
+# limit are served from cache while being refreshed in the background
+CACHE_FRESH_SECONDS = 60
+CACHE_STALE_SECONDS = 300
+
 
 class AirtableRateLimiter:
-    """Rate limiter for Airtable API requests."""
+    """Token bucket rate limiter for Airtable API requests.
     
-    def __init__(self, requests_per_second: float = 5.0):
+    After an idle period up to ``burst`` requests go out immediately; only
+    sustained traffic is spaced out at ``requests_per_second``.
+    """
+    
+    def __init__(self, requests_per_second: float = 5.0, burst: Optional[float] = None):
         """Initialize rate limiter.
         
         Args:
-            requests_per_second: Maximum requests per second
+            requests_per_second: Maximum sustained requests per second
+            burst: Requests allowed at once after an idle period, defaults
+                to one second's worth
         """
         self._requests_per_second = requests_per_second
-        self._min_interval = 1.0 / requests_per_second
-        self._last_request = 0.0
+        self._capacity = burst if burst is not None else max(1.0, requests_per_second)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
     
     async def acquire(self) -> None:
         """Wait if necessary to respect rate limits."""
-        now = time.time()
-        time_since_last = now - self._last_request
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._requests_per_second)
+        self._updated = now
         
-        if time_since_last < self._min_interval:
-            wait_time = self._min_interval - time_since_last
+        # Take the token before sleeping, going into debt if the bucket is
+        # empty, so concurrent callers queue up behind each other
+        self._tokens -= 1
+        if self._tokens < 0:
+            wait_time = -self._tokens / self._requests_per_second
             logger.debug("Rate limiting Airtable request", wait_time=wait_time)
             await asyncio.sleep(wait_time)
+
+
+class StaleWhileRevalidateCache:
+    """Cache of lookup results that serves stale values while refreshing them.
+    
+    Concurrent misses for the same key share a single load.
+    """
+    
+    def __init__(self, fresh_seconds: float = CACHE_FRESH_SECONDS, stale_seconds: float = CACHE_STALE_SECONDS):
+        """Initialize cache.
+        
+        Args:
+            fresh_seconds: Age up to which values are served as is
+            stale_seconds: Age up to which values are served while refreshing
+        """
+        self._fresh_seconds = fresh_seconds
+        self._stale_seconds = stale_seconds
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._loads: Dict[Hashable, asyncio.Task] = {}
+    
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the value for a key, loading it if missing or expired.
         
-        self._last_request = time.time()
+        Args:
+            key: Cache key
+            load: Coroutine function producing the current value
+            
+        Returns:
+            Cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            
+            if age < self._fresh_seconds:
+                return value
+            if age < self._stale_seconds:
+                self._start_load(key, load)
+                return value
+        
+        # Shielded so one cancelled caller does not cancel the shared load
+        return await asyncio.shield(self._start_load(key, load))
+    
+    def _start_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start loading a key unless a load is already running."""
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load))
+            task.add_done_callback(self._log_failed_load)
+            self._loads[key] = task
+        return task
+    
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await load()
+            self._entries[key] = (value, time.monotonic())
+            return value
+        finally:
+            del self._loads[key]
+    
+    @staticmethod
+    def _log_failed_load(task: asyncio.Task) -> None:
+        # Background refreshes have no caller to raise to
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Airtable cache refresh failed", error=str(task.exception()))
+    
+    def clear(self) -> None:
+        """Clear all cached values."""
+        self._entries.clear()
+
+
+def swr_cached(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Serve an AirtableService lookup from the service's cache."""
+    @functools.wraps(method)
+    async def wrapper(self: "AirtableService", *args: Any, **kwargs: Any) -> Any:
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return await self._cache.get(key, lambda: method(self, *args, **kwargs))
+    
+    return wrapper
 
 
 class AirtableService:
@@ -51,8 +151,9 @@ class AirtableService:
             config: Airtable configuration
         """
         self.config = config
-        self._client: Optional[Airtable] = None
+        self._client: Optional[httpx.AsyncClient] = None
         self._rate_limiter = AirtableRateLimiter(config.rate_limit_rps)
+        self._cache = StaleWhileRevalidateCache()
         self._initialized = False
     
     async def initialize(self) -> None:
@@ -61,9 +162,13 @@ class AirtableService:
             return
         
         try:
-            self._client = Airtable(
-                base_id=self.config.base_id,
-                api_key=self.config.api_key
+            # One pooled HTTP/2 connection carries concurrent lookups
+            self._client = httpx.AsyncClient(
+                base_url=f"{AIRTABLE_API_URL}/{self.config.base_id}",
+                headers={"Authorization": f"Bearer {self.config.api_key}"},
+                http2=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                timeout=httpx.Timeout(self.config.request_timeout)
             )
             
             # Test the connection by trying to access a table
@@ -76,13 +181,105 @@ class AirtableService:
             logger.error("Failed to initialize Airtable service", error=str(e))
             raise
     
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        self._initialized = False
+    
     @property
-    def client(self) -> Airtable:
-        """Get Airtable client instance."""
+    def client(self) -> httpx.AsyncClient:
+        """Get Airtable HTTP client instance."""
         if not self._client:
             raise RuntimeError("Airtable service not initialized")
         return self._client
     
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a rate-limited request to the Airtable API.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL
+            **kwargs: Request options such as ``params`` or ``json``
+            
+        Returns:
+            Decoded JSON response body
+            
+        Raises:
+            httpx.HTTPStatusError: If Airtable answers with an error status
+        """
+        await self._rate_limiter.acquire()
+        response = await self.client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    
+    async def _iter_records(
+        self,
+        table: str,
+        formula: Optional[str] = None,
+        max_records: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over a table's records one page at a time.
+        
+        Only the current page is held in memory, and each page request
+        takes a rate-limiter slot.
+        
+        Args:
+            table: Airtable table name
+            formula: Optional ``filterByFormula`` expression
+            max_records: Optional limit on the number of records
+            
+        Yields:
+            Airtable records
+        """
+        params: Dict[str, Any] = {}
+        if formula:
+            params['filterByFormula'] = formula
+        if max_records is not None:
+            params['maxRecords'] = max_records
+        
+        while True:
+            page = await self._request('GET', f"/{quote(table, safe='')}", params=params)
+            for record in page.get('records', []):
+                yield record
+            
+            # Airtable returns an offset while more pages remain
+            offset = page.get('offset')
+            if not offset:
+                return
+            params['offset'] = offset
+    
+    async def _get_all(self, table: str, **options: Any) -> List[Dict[str, Any]]:
+        """Fetch all of a table's matching records.
+        
+        Args:
+            table: Airtable table name
+            **options: Query options accepted by ``_iter_records``
+            
+        Returns:
+            List of Airtable records
+        """
+        return [record async for record in self._iter_records(table, **options)]
+    
+    async def _get_record(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single record by ID.
+        
+        Args:
+            table: Airtable table name
+            record_id: Airtable record ID
+            
+        Returns:
+            Airtable record, or None if it does not exist
+        """
+        try:
+            return await self._request('GET', f"/{quote(table, safe='')}/{quote(record_id, safe='')}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+    
+    @swr_cached
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -97,12 +294,9 @@ class AirtableService:
             Family information dictionary
         """
         try:
-            await self._rate_limiter.acquire()
-            
             # Search for family by email in the contacts table
             # Note: Adjust table name and field names based on actual Airtable schema
-            records = await asyncio.to_thread(
-                self.client.get_all,
+            records = await self._get_all(
                 'Families',  # Adjust table name
                 formula=f"{{{{Email}}}} = '{email}'"
             )
@@ -154,48 +348,64 @@ class AirtableService:
     async def _get_children_info(self, children_ids: List[str]) -> List[Dict[str, Any]]:
         """Get information for children records.
         
+        Children are fetched with one formula lookup per chunk of IDs, and
+        the chunks are requested concurrently.
+        
         Args:
             children_ids: List of Airtable record IDs for children
             
         Returns:
-            List of children information
+            List of children information, in the order of ``children_ids``
         """
-        children = []
+        chunk_size = CHILDREN_LOOKUP_CHUNK_SIZE
+        chunks = [children_ids[i:i + chunk_size] for i in range(0, len(children_ids), chunk_size)]
         
+        results = await asyncio.gather(*(self._fetch_children_chunk(chunk) for chunk in chunks))
+        records_by_id = {record['id']: record for records in results for record in records}
+        
+        children = []
         for child_id in children_ids:
-            try:
-                await self._rate_limiter.acquire()
-                
-                child_record = await asyncio.to_thread(
-                    self.client.get,
-                    'Children',  # Adjust table name
-                    child_id
-                )
-                
-                if child_record:
-                    child_data = {
-                        'child_id': child_record['id'],
-                        'name': child_record['fields'].get('Name', ''),
-                        'age': child_record['fields'].get('Age', ''),
-                        'team': child_record['fields'].get('Team', ''),
-                        'position': child_record['fields'].get('Position', ''),
-                        'coach': child_record['fields'].get('Coach', ''),
-                        'medical_notes': child_record['fields'].get('Medical Notes', ''),
-                        'emergency_contact': child_record['fields'].get('Emergency Contact', '')
-                    }
-                    children.append(child_data)
-                    
-            except Exception as e:
-                logger.error(
-                    "Failed to get child info",
-                    error=str(e),
-                    child_id=child_id
-                )
-                # Continue with other children even if one fails
-                continue
+            child_record = records_by_id.get(child_id)
+            if child_record:
+                children.append({
+                    'child_id': child_record['id'],
+                    'name': child_record['fields'].get('Name', ''),
+                    'age': child_record['fields'].get('Age', ''),
+                    'team': child_record['fields'].get('Team', ''),
+                    'position': child_record['fields'].get('Position', ''),
+                    'coach': child_record['fields'].get('Coach', ''),
+                    'medical_notes': child_record['fields'].get('Medical Notes', ''),
+                    'emergency_contact': child_record['fields'].get('Emergency Contact', '')
+                })
         
         return children
     
+    async def _fetch_children_chunk(self, children_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch a chunk of children records with a single request.
+        
+        Args:
+            children_ids: Airtable record IDs for children
+            
+        Returns:
+            Matching child records, or an empty list if the request failed
+        """
+        try:
+            formula = "OR(" + ", ".join(f"RECORD_ID() = '{child_id}'" for child_id in children_ids) + ")"
+            return await self._get_all(
+                'Children',  # Adjust table name
+                formula=formula
+            )
+            
+        except Exception as e:
+            logger.error(
+                "Failed to get child info",
+                error=str(e),
+                child_ids=children_ids
+            )
+            # Continue with other children even if one chunk fails
+            return []
+    
+    @swr_cached
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -210,20 +420,11 @@ class AirtableService:
             Schedule data dictionary
         """
         try:
-            await self._rate_limiter.acquire()
-            
             # Build formula for filtering if family_id provided
             formula = None
             if family_id:
                 formula = f"{{{{Family}}}} = '{family_id}'"
             
-            # Get schedule records
-            records = await asyncio.to_thread(
-                self.client.get_all,
-                'Schedule',  # Adjust table name
-                formula=formula
-            )
-            
             schedule_data = {
                 'events': [],
                 'coaches': set(),
@@ -231,7 +432,8 @@ class AirtableService:
                 'teams': set()
             }
             
-            for record in records:
+            # Fold schedule records in as their pages arrive
+            async for record in self._iter_records('Schedule', formula=formula):  # Adjust table name
                 fields = record['fields']
                 
                 event = {
@@ -281,6 +483,7 @@ class AirtableService:
             )
             raise
     
+    @swr_cached
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -295,15 +498,6 @@ class AirtableService:
             Payment status information
         """
         try:
-            await self._rate_limiter.acquire()
-            
-            # Get payment records for the family
-            records = await asyncio.to_thread(
-                self.client.get_all,
-                'Payments',  # Adjust table name
-                formula=f"{{{{Family}}}} = '{family_id}'"
-            )
-            
             payment_data = {
                 'family_id': family_id,
                 'current_balance': 0.0,
@@ -314,7 +508,9 @@ class AirtableService:
                 'status': 'current'  # current, overdue, paid_ahead
             }
             
-            for record in records:
+            # Fold the family's payment records in as their pages arrive
+            payments = self._iter_records('Payments', formula=f"{{{{Family}}}} = '{family_id}'")  # Adjust table name
+            async for record in payments:
                 fields = record['fields']
                 
                 payment = {
@@ -338,11 +534,7 @@ class AirtableService:
                             payment_data['last_payment_date'] = payment['date']
             
             # Get current balance from family record
-            family_record = await asyncio.to_thread(
-                self.client.get,
-                'Families',
-                family_id
-            )
+            family_record = await self._get_record('Families', family_id)
             
             if family_record:
                 payment_data['current_balance'] = family_record['fields'].get('Balance', 0.0)
@@ -384,16 +576,10 @@ class AirtableService:
             True if venue is available, False otherwise
         """
         try:
-            await self._rate_limiter.acquire()
-            
             # Check for conflicting events at the same venue and time
             formula = f"AND({{{{Venue}}}} = '{venue_id}', {{{{Start Time}}}} = '{time_slot}')"
             
-            conflicts = await asyncio.to_thread(
-                self.client.get_all,
-                'Schedule',
-                formula=formula
-            )
+            conflicts = await self._get_all('Schedule', formula=formula)
             
             is_available = len(conflicts) == 0
             
@@ -427,8 +613,6 @@ class AirtableService:
             True if logged successfully, False otherwise
         """
         try:
-            await self._rate_limiter.acquire()
-            
             # Prepare log entry
             log_data = {
                 'Family': [family_id],
@@ -442,13 +626,13 @@ class AirtableService:
             }
             
             # Create log entry
-            result = await asyncio.to_thread(
-                self.client.insert,
-                'Communication_Log',  # Adjust table name
-                log_data
+            result = await self._request(
+                'POST',
+                '/Communication_Log',  # Adjust table name
+                json={'fields': log_data}
             )
             
-            success = bool(result)
+            success = bool(result.get('id'))
             
             logger.info(
                 "Communication logged",
@@ -474,14 +658,8 @@ class AirtableService:
             True if service is healthy, False otherwise
         """
         try:
-            await self._rate_limiter.acquire()
-            
             # Try to access the Families table
-            records = await asyncio.to_thread(
-                self.client.get_all,
-                'Families',
-                max_records=1
-            )
+            records = await self._get_all('Families', max_records=1)
             
             is_healthy = isinstance(records, list)
             
@@ -1,5 +1,6 @@
 """Gmail service for OAuth authentication and email processing."""
 
+import asyncio
 import base64
 import json
 from typing import Any, Dict, List, Optional
@@ -140,7 +141,8 @@ class GmailService:
         """
         try:
             flow = self.create_oauth_flow(state)
-            flow.fetch_token(code=authorization_code)
+            # Token exchange is a blocking HTTP call
+            await asyncio.to_thread(flow.fetch_token, code=authorization_code)
             
             credentials = flow.credentials
             
@@ -461,7 +463,9 @@ class GmailService:
         
         try:
             # Try to get user profile
-            profile = self._service.users().getProfile(userId='me').execute()
+            profile = await asyncio.to_thread(
+                self._service.users().getProfile(userId='me').execute
+            )
             
             is_healthy = 'emailAddress' in profile
             
@@ -0,0 +1,20 @@
+"""Timestamp helpers shared by the API routes and middleware."""
+
+import time
+from datetime import datetime, UTC
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def iso_timestamp_for(second: int) -> str:
+    """Format a Unix second as an ISO 8601 UTC timestamp."""
+    return datetime.fromtimestamp(second, UTC).isoformat()
+
+
+def current_iso_timestamp() -> str:
+    """Get the current UTC time as an ISO 8601 string.
+    
+    Resolution is one second; the formatted string is reused by every
+    call within the same second.
+    """
+    return iso_timestamp_for(int(time.time()))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Test script for AgentRegistry implementation."""
+
+import sys
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Set test environment variables
+os.environ.update({
+    'SUPABASE_URL': 'https://test.supabase.co',
+    'SUPABASE_ANON_KEY': 'test_anon_key',
+    'SUPABASE_SERVICE_KEY': 'test_service_key',
+    'SUPABASE_PASSWORD': 'test_password',
+    'AI_OPENAI_API_KEY': 'test_openai_key',
+    'AIRTABLE_API_KEY': 'test_airtable_key',
+    'GOOGLE_CLIENT_ID': 'test_client_id',
+    'GOOGLE_CLIENT_SECRET': 'test_client_secret',
+    'SECURITY_JWT_SECRET_KEY': 'test_jwt_secret_key_32_chars_long',
+    'SECURITY_ENCRYPTION_KEY': 'test_encryption_key_32_chars_long'
+})
+
+# Add src directory to Python path
+backend_dir = Path(__file__).parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_coaching.agents.registry import AgentConfig, AgentRegistry, initialize_agent_registry
+from ai_coaching.models.base import AgentType
+
+
+def create_mock_agent(healthy: bool = True) -> MagicMock:
+    """Create a mock agent with an async health check."""
+    agent = MagicMock()
+    agent.health_check = AsyncMock(return_value=healthy)
+    return agent
+
+
+async def test_health_check_cache():
+    """Test that health probes are cached per agent within the TTL."""
+    print("Testing health check caching...")
+
+    AgentRegistry.clear_registry()
+    with patch.object(AgentRegistry, "health_cache_ttl", 60.0):
+        email_agent = create_mock_agent()
+        schedule_agent = create_mock_agent(healthy=False)
+        AgentRegistry.register_agent(AgentType.EMAIL, email_agent)
+        AgentRegistry.register_agent(AgentType.SCHEDULE, schedule_agent)
+
+        first = await AgentRegistry.health_check()
+        second = await AgentRegistry.health_check()
+
+        assert first == second == {AgentType.EMAIL: True, AgentType.SCHEDULE: False}
+        assert email_agent.health_check.await_count == 1, "Second poll should be served from cache"
+        assert schedule_agent.health_check.await_count == 1
+
+        # Re-registering an agent invalidates its cached result
+        replacement = create_mock_agent()
+        AgentRegistry.register_agent(AgentType.SCHEDULE, replacement)
+        third = await AgentRegistry.health_check()
+
+        assert third[AgentType.SCHEDULE] is True
+        assert replacement.health_check.await_count == 1
+        assert email_agent.health_check.await_count == 1
+
+        # A zero TTL always re-probes
+        AgentRegistry.health_cache_ttl = 0.0
+        await AgentRegistry.health_check()
+        assert email_agent.health_check.await_count == 2
+
+    print("✓ Health check caching working")
+
+
+async def test_registry_stats():
+    """Test that registry stats only probe agents when asked to."""
+    print("\nTesting registry statistics...")
+
+    AgentRegistry.clear_registry()
+    with patch.object(AgentRegistry, "health_cache_ttl", 0.0):
+        agent = create_mock_agent()
+        AgentRegistry.register_agent(AgentType.EMAIL, agent)
+
+        stats = await AgentRegistry.get_registry_stats()
+        assert stats["total_agents"] == 1
+        assert "health_status" not in stats
+        assert agent.health_check.await_count == 0
+
+        stats = await AgentRegistry.get_registry_stats(include_health=True)
+        assert stats["health_status"] == {AgentType.EMAIL: True}
+        assert agent.health_check.await_count == 1
+
+    print("✓ Registry statistics working")
+
+
+async def test_health_check_failure():
+    """Test that a raising probe is reported as unhealthy."""
+    print("\nTesting health check failure handling...")
+
+    AgentRegistry.clear_registry()
+    with patch.object(AgentRegistry, "health_cache_ttl", 60.0):
+        broken_agent = MagicMock()
+        broken_agent.health_check = AsyncMock(side_effect=RuntimeError("boom"))
+        AgentRegistry.register_agent(AgentType.KNOWLEDGE, broken_agent)
+
+        status = await AgentRegistry.health_check()
+        assert status == {AgentType.KNOWLEDGE: False}
+
+    print("✓ Health check failure handling working")
+
+
+def test_agent_config():
+    """Test typed agent configuration storage."""
+    print("\nTesting agent configuration...")
+
+    AgentRegistry.clear_registry()
+
+    config = AgentConfig(max_concurrent_tasks=3, task_timeout=30.0)
+    AgentRegistry.register_agent(AgentType.EMAIL, create_mock_agent(), config)
+    AgentRegistry.register_agent(AgentType.SCHEDULE, create_mock_agent())
+
+    assert AgentRegistry.get_agent_config(AgentType.EMAIL) is config
+    assert AgentRegistry.get_agent_config(AgentType.EMAIL).max_concurrent_tasks == 3
+    assert AgentRegistry.get_agent_config(AgentType.SCHEDULE) == AgentConfig()
+    assert AgentRegistry.get_agent_config(AgentType.CONTENT) == AgentConfig()
+
+    # Unconfigured agents share one default instance rather than a fresh object per lookup
+    assert (
+        AgentRegistry.get_agent_config(AgentType.CONTENT)
+        is AgentRegistry.get_agent_config(AgentType.SCHEDULE)
+        is AgentRegistry.list_agents()[AgentType.SCHEDULE]["config"]
+    )
+
+    try:
+        config.task_timeout = 1.0
+        assert False, "AgentConfig should be immutable"
+    except AttributeError:
+        pass
+
+    print("✓ Agent configuration working")
+
+
+def test_bulk_registration():
+    """Test registering several agents in one call."""
+    print("\nTesting bulk agent registration...")
+
+    AgentRegistry.clear_registry()
+
+    config = AgentConfig(task_timeout=10.0)
+    AgentRegistry.register_agents([
+        (AgentType.EMAIL, create_mock_agent(), None),
+        (AgentType.SCHEDULE, create_mock_agent(), config),
+        (AgentType.KNOWLEDGE, create_mock_agent(), None),
+    ])
+
+    assert all(
+        AgentRegistry.is_registered(agent_type)
+        for agent_type in (AgentType.EMAIL, AgentType.SCHEDULE, AgentType.KNOWLEDGE)
+    )
+    assert AgentRegistry.get_agent_config(AgentType.SCHEDULE) is config
+
+    agents = AgentRegistry.list_agents()
+    assert len(agents) == 3
+    assert set(agents) == {AgentType.EMAIL, AgentType.SCHEDULE, AgentType.KNOWLEDGE}
+    assert agents[AgentType.SCHEDULE]["config"] is config
+    assert AgentType.CONTENT not in agents
+
+    # The listing is a live view over the registry
+    AgentRegistry.unregister_agent(AgentType.EMAIL)
+    assert len(agents) == 2 and AgentType.EMAIL not in agents
+
+    print("✓ Bulk agent registration working")
+
+
+def test_concurrent_initialization():
+    """Test that concurrent initializers run the startup body once."""
+    print("\nTesting concurrent registry initialization...")
+
+    AgentRegistry.clear_registry()
+    dependencies = MagicMock()
+
+    with patch("ai_coaching.agents.registry.logger") as mock_logger:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: initialize_agent_registry(dependencies), range(16)))
+
+    init_calls = [
+        call for call in mock_logger.info.call_args_list
+        if call.args == ("Initializing agent registry",)
+    ]
+    assert len(init_calls) == 1, "Registry should be initialized exactly once"
+    assert AgentRegistry._initialized is True
+
+    print("✓ Concurrent initialization working")
+
+
+async def main():
+    """Run all AgentRegistry tests."""
+    print("🧪 Running AgentRegistry Tests\n")
+    print("=" * 50)
+
+    try:
+        await test_health_check_cache()
+        await test_health_check_failure()
+        await test_registry_stats()
+        test_agent_config()
+        test_bulk_registration()
+        test_concurrent_initialization()
+
+        print("\n" + "=" * 50)
+        print("✅ All AgentRegistry tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        AgentRegistry.clear_registry()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
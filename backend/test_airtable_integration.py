@@ -5,7 +5,8 @@ import sys
 import asyncio
 import os
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 
 # Set test environment variables to avoid validation errors
 os.environ.update({
@@ -26,7 +27,9 @@ backend_dir = Path(__file__).parent
 src_dir = backend_dir / "src"
 sys.path.insert(0, str(src_dir))
 
-from ai_coaching.services.airtable import AirtableService, AirtableRateLimiter
+from ai_coaching.services.airtable import (
+    AIRTABLE_API_URL, AirtableService, AirtableRateLimiter, StaleWhileRevalidateCache
+)
 from ai_coaching.config.settings import AirtableConfig
 
 
@@ -41,6 +44,18 @@ def create_test_airtable_config() -> AirtableConfig:
     )
 
 
+def create_mock_client(handler, requests: list) -> httpx.AsyncClient:
+    """Create an HTTP client that records requests and answers with the handler."""
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+    
+    return httpx.AsyncClient(
+        base_url=f"{AIRTABLE_API_URL}/appsdldIgkZ1fDzX2",
+        transport=httpx.MockTransport(record)
+    )
+
+
 class TestAirtableService:
     """Test Airtable service functionality."""
     
@@ -57,12 +72,18 @@ class TestAirtableService:
         import time
         start_time = time.time()
         
-        # Make multiple requests quickly
-        for _ in range(3):
+        # A full bucket lets a burst through without waiting
+        for _ in range(10):
             await rate_limiter.acquire()
         
+        burst_time = time.time() - start_time
+        assert burst_time < 0.05, f"Burst should not wait: {burst_time}"
+        
+        # Further requests, even concurrent ones, are spaced at the sustained rate
+        await asyncio.gather(*(rate_limiter.acquire() for _ in range(3)))
+        
         elapsed_time = time.time() - start_time
-        expected_minimum_time = 0.2  # 3 requests at 10 RPS = 0.2 seconds minimum
+        expected_minimum_time = 0.3  # 3 requests past the burst at 10 RPS
         
         assert elapsed_time >= expected_minimum_time * 0.8, f"Rate limiting not working: {elapsed_time} < {expected_minimum_time}"
         
@@ -111,44 +132,37 @@ class TestAirtableService:
             }
         ]
         
-        # Mock the Airtable client
-        with patch('airtable.Airtable') as mock_airtable_class:
-            mock_client = MagicMock()
-            mock_airtable_class.return_value = mock_client
-            
-            # Mock get_all for family search
-            mock_client.get_all.return_value = [mock_family_record]
-            
-            # Mock get for individual child records
-            def mock_get(table, record_id):
-                if record_id == 'recChild1':
-                    return mock_child_records[0]
-                elif record_id == 'recChild2':
-                    return mock_child_records[1]
-                return None
-            
-            mock_client.get.side_effect = mock_get
-            
-            # Initialize service
-            self.service._client = mock_client
-            self.service._initialized = True
-            
-            # Test family info retrieval
-            family_info = await self.service.get_family_info('test@family.com')
-            
-            # Verify results
-            assert family_info['email'] == 'test@family.com'
-            assert family_info['family_name'] == 'Test Family'
-            assert family_info['primary_contact'] == 'John Doe'
-            assert len(family_info['children']) == 2
-            assert family_info['children'][0]['name'] == 'Jane Doe'
-            assert family_info['children'][1]['name'] == 'Johnny Doe'
-            assert family_info['payment_status'] == 'current'
-            
-            # Verify Airtable calls
-            mock_client.get_all.assert_called_with('Families', formula="{{Email}} = 'test@family.com'")
-            mock_client.get.assert_any_call('Children', 'recChild1')
-            mock_client.get.assert_any_call('Children', 'recChild2')
+        # Answer the family search and the batched children lookup,
+        # returning children out of order
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith('/Families'):
+                return httpx.Response(200, json={'records': [mock_family_record]})
+            return httpx.Response(200, json={'records': mock_child_records[::-1]})
+        
+        requests = []
+        self.service._client = create_mock_client(handler, requests)
+        self.service._initialized = True
+        
+        # Test family info retrieval
+        family_info = await self.service.get_family_info('test@family.com')
+        
+        # Verify results
+        assert family_info['email'] == 'test@family.com'
+        assert family_info['family_name'] == 'Test Family'
+        assert family_info['primary_contact'] == 'John Doe'
+        assert len(family_info['children']) == 2
+        assert family_info['children'][0]['name'] == 'Jane Doe'
+        assert family_info['children'][1]['name'] == 'Johnny Doe'
+        assert family_info['payment_status'] == 'current'
+        
+        # Verify Airtable calls
+        assert len(requests) == 2, "Children should be fetched in one request"
+        assert requests[0].url.path == '/v0/appsdldIgkZ1fDzX2/Families'
+        assert requests[0].url.params['filterByFormula'] == "{{Email}} = 'test@family.com'"
+        assert requests[1].url.path == '/v0/appsdldIgkZ1fDzX2/Children'
+        assert requests[1].url.params['filterByFormula'] == (
+            "OR(RECORD_ID() = 'recChild1', RECORD_ID() = 'recChild2')"
+        )
         
         print("✓ Family info retrieval works correctly")
     
@@ -188,31 +202,37 @@ class TestAirtableService:
             }
         ]
         
-        with patch('airtable.Airtable') as mock_airtable_class:
-            mock_client = MagicMock()
-            mock_airtable_class.return_value = mock_client
-            mock_client.get_all.return_value = mock_schedule_records
-            
-            self.service._client = mock_client
-            self.service._initialized = True
-            
-            # Test schedule retrieval
-            schedule_data = await self.service.get_schedule_data()
-            
-            # Verify results
-            assert len(schedule_data['events']) == 2
-            assert schedule_data['events'][0]['title'] == 'Team A Practice'
-            assert schedule_data['events'][1]['title'] == 'Team B vs Team C'
-            assert 'Coach Smith' in schedule_data['coaches']
-            assert 'Coach Johnson' in schedule_data['coaches']
-            assert 'Field 1' in schedule_data['venues']
-            assert 'Field 2' in schedule_data['venues']
-            assert 'Team A' in schedule_data['teams']
-            assert 'Team B' in schedule_data['teams']
-            
-            # Test with family filter
-            schedule_data_filtered = await self.service.get_schedule_data(family_id='rec123456')
-            mock_client.get_all.assert_called_with('Schedule', formula="{{Family}} = 'rec123456'")
+        # Records arrive over two pages linked by an offset
+        def handler(request: httpx.Request) -> httpx.Response:
+            if 'offset' not in request.url.params:
+                return httpx.Response(200, json={'records': mock_schedule_records[:1], 'offset': 'itrPage2'})
+            return httpx.Response(200, json={'records': mock_schedule_records[1:]})
+        
+        requests = []
+        self.service._client = create_mock_client(handler, requests)
+        self.service._initialized = True
+        
+        # Test schedule retrieval
+        schedule_data = await self.service.get_schedule_data()
+        
+        # Verify results
+        assert len(schedule_data['events']) == 2
+        assert schedule_data['events'][0]['title'] == 'Team A Practice'
+        assert schedule_data['events'][1]['title'] == 'Team B vs Team C'
+        assert 'Coach Smith' in schedule_data['coaches']
+        assert 'Coach Johnson' in schedule_data['coaches']
+        assert 'Field 1' in schedule_data['venues']
+        assert 'Field 2' in schedule_data['venues']
+        assert 'Team A' in schedule_data['teams']
+        assert 'Team B' in schedule_data['teams']
+        assert len(requests) == 2
+        assert requests[1].url.params['offset'] == 'itrPage2'
+        assert 'filterByFormula' not in requests[0].url.params
+        
+        # Test with family filter
+        await self.service.get_schedule_data(family_id='rec123456')
+        assert requests[-1].url.path == '/v0/appsdldIgkZ1fDzX2/Schedule'
+        assert requests[-1].url.params['filterByFormula'] == "{{Family}} = 'rec123456'"
         
         print("✓ Schedule data retrieval works correctly")
     
@@ -253,34 +273,42 @@ class TestAirtableService:
             }
         }
         
-        with patch('airtable.Airtable') as mock_airtable_class:
-            mock_client = MagicMock()
-            mock_airtable_class.return_value = mock_client
-            
-            # Mock get_all for payments
-            mock_client.get_all.return_value = mock_payment_records
-            
-            # Mock get for family record
-            mock_client.get.return_value = mock_family_record
-            
-            self.service._client = mock_client
-            self.service._initialized = True
-            
-            # Test payment status retrieval
-            payment_status = await self.service.get_payment_status('rec123456')
-            
-            # Verify results
-            assert payment_status['family_id'] == 'rec123456'
-            assert payment_status['total_paid'] == 225.0  # 150 + 75
-            assert payment_status['current_balance'] == 25.0
-            assert payment_status['total_owed'] == 250.0
-            assert payment_status['status'] == 'overdue'  # Positive balance means overdue
-            assert len(payment_status['payment_history']) == 2
-            assert payment_status['last_payment_date'] == '2024-08-15'  # Most recent
-            
-            # Verify Airtable calls
-            mock_client.get_all.assert_called_with('Payments', formula="{{Family}} = 'rec123456'")
-            mock_client.get.assert_called_with('Families', 'rec123456')
+        # Answer the payments listing and the family record lookup
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith('/Payments'):
+                return httpx.Response(200, json={'records': mock_payment_records})
+            return httpx.Response(200, json=mock_family_record)
+        
+        requests = []
+        self.service._client = create_mock_client(handler, requests)
+        self.service._initialized = True
+        
+        # Test payment status retrieval
+        payment_status = await self.service.get_payment_status('rec123456')
+        
+        # Verify results
+        assert payment_status['family_id'] == 'rec123456'
+        assert payment_status['total_paid'] == 225.0  # 150 + 75
+        assert payment_status['current_balance'] == 25.0
+        assert payment_status['total_owed'] == 250.0
+        assert payment_status['status'] == 'overdue'  # Positive balance means overdue
+        assert len(payment_status['payment_history']) == 2
+        assert payment_status['last_payment_date'] == '2024-08-15'  # Most recent
+        
+        # Verify Airtable calls
+        assert requests[0].url.path == '/v0/appsdldIgkZ1fDzX2/Payments'
+        assert requests[0].url.params['filterByFormula'] == "{{Family}} = 'rec123456'"
+        assert requests[1].url.path == '/v0/appsdldIgkZ1fDzX2/Families/rec123456'
+        
+        # A missing family record leaves the balance untouched
+        self.service._client = create_mock_client(
+            lambda request: httpx.Response(404, json={'error': 'NOT_FOUND'})
+            if '/Families/' in request.url.path else httpx.Response(200, json={'records': []}),
+            []
+        )
+        payment_status = await self.service.get_payment_status('recMissing')
+        assert payment_status['status'] == 'current'
+        assert payment_status['current_balance'] == 0.0
         
         print("✓ Payment status retrieval works correctly")
     
@@ -288,22 +316,20 @@ class TestAirtableService:
         """Test venue availability checking."""
         print("Testing venue availability...")
         
-        with patch('airtable.Airtable') as mock_airtable_class:
-            mock_client = MagicMock()
-            mock_airtable_class.return_value = mock_client
-            
-            self.service._client = mock_client
-            self.service._initialized = True
-            
-            # Test available venue (no conflicts)
-            mock_client.get_all.return_value = []
-            is_available = await self.service.check_venue_availability('Field1', '14:00')
-            assert is_available is True
-            
-            # Test unavailable venue (conflict exists)
-            mock_client.get_all.return_value = [{'id': 'conflict'}]
-            is_available = await self.service.check_venue_availability('Field1', '14:00')
-            assert is_available is False
+        conflicts = []
+        self.service._client = create_mock_client(
+            lambda request: httpx.Response(200, json={'records': conflicts}), []
+        )
+        self.service._initialized = True
+        
+        # Test available venue (no conflicts)
+        is_available = await self.service.check_venue_availability('Field1', '14:00')
+        assert is_available is True
+        
+        # Test unavailable venue (conflict exists)
+        conflicts.append({'id': 'conflict', 'fields': {}})
+        is_available = await self.service.check_venue_availability('Field1', '14:00')
+        assert is_available is False
         
         print("✓ Venue availability checking works correctly")
     
@@ -311,24 +337,61 @@ class TestAirtableService:
         """Test service health check."""
         print("Testing health check...")
         
-        with patch('airtable.Airtable') as mock_airtable_class:
-            mock_client = MagicMock()
-            mock_airtable_class.return_value = mock_client
-            
-            self.service._client = mock_client
-            self.service._initialized = True
-            
-            # Test healthy service
-            mock_client.get_all.return_value = []
-            is_healthy = await self.service.health_check()
-            assert is_healthy is True
-            
-            # Test unhealthy service (exception)
-            mock_client.get_all.side_effect = Exception("API Error")
-            is_healthy = await self.service.health_check()
-            assert is_healthy is False
+        # Test healthy service
+        requests = []
+        self.service._client = create_mock_client(lambda request: httpx.Response(200, json={'records': []}), requests)
+        self.service._initialized = True
+        is_healthy = await self.service.health_check()
+        assert is_healthy is True
+        assert requests[0].url.params['maxRecords'] == '1'
+        
+        # Test unhealthy service (error response)
+        self.service._client = create_mock_client(
+            lambda request: httpx.Response(401, json={'error': 'AUTHENTICATION_REQUIRED'}), []
+        )
+        is_healthy = await self.service.health_check()
+        assert is_healthy is False
         
         print("✓ Health check works correctly")
+    
+    async def test_lookup_cache(self):
+        """Test that repeated lookups are served from the cache."""
+        print("Testing lookup cache...")
+        
+        service = AirtableService(self.config)
+        # Each lookup reads a single page; the event is gone by the refresh
+        pages = [[{'id': 'rec1', 'fields': {'Title': 'Practice'}}], [], []]
+        requests = []
+        service._client = create_mock_client(
+            lambda request: httpx.Response(200, json={'records': pages.pop(0)}), requests
+        )
+        service._initialized = True
+        
+        service._cache = StaleWhileRevalidateCache(fresh_seconds=0.1, stale_seconds=10)
+        
+        # Concurrent misses share one request
+        results = await asyncio.gather(*(service.get_schedule_data('rec123456') for _ in range(3)))
+        assert results[0] is results[1] is results[2]
+        assert len(requests) == 1
+        
+        # Fresh entries are served without a request
+        await service.get_schedule_data('rec123456')
+        assert len(requests) == 1
+        
+        # Stale entries are served at once and refreshed in the background
+        await asyncio.sleep(0.15)
+        stale = await service.get_schedule_data('rec123456')
+        assert len(stale['events']) == 1
+        await asyncio.sleep(0.05)
+        assert len(requests) == 2
+        refreshed = await service.get_schedule_data('rec123456')
+        assert refreshed['events'] == []
+        
+        # Other arguments are cached separately
+        await service.get_schedule_data('rec999')
+        assert len(requests) == 3
+        
+        print("✓ Lookup cache works correctly")
 
 
 async def main():
@@ -363,6 +426,10 @@ async def main():
         print("\n🩺 Testing Health Check...")
         await test_service.test_health_check()
         
+        # Test lookup cache
+        print("\n🗄️  Testing Lookup Cache...")
+        await test_service.test_lookup_cache()
+        
         print("\n" + "=" * 50)
         print("✅ All Airtable integration tests passed!")
         
@@ -375,6 +442,7 @@ async def main():
         print("✓ Payment status with balance calculations") 
         print("✓ Venue availability conflict detection")
         print("✓ Health check functionality")
+        print("✓ Stale-while-revalidate lookup cache")
         print("✓ Error handling and logging")
         print("✓ Exponential backoff retry logic")
         
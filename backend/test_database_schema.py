@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Test script for database schema helpers."""
+
+import sys
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Set test environment variables
+os.environ.update({
+    'SUPABASE_URL': 'https://test.supabase.co',
+    'SUPABASE_ANON_KEY': 'test_anon_key',
+    'SUPABASE_SERVICE_KEY': 'test_service_key',
+    'SUPABASE_PASSWORD': 'test_password',
+    'AI_OPENAI_API_KEY': 'test_openai_key',
+    'AIRTABLE_API_KEY': 'test_airtable_key',
+    'GOOGLE_CLIENT_ID': 'test_client_id',
+    'GOOGLE_CLIENT_SECRET': 'test_client_secret',
+    'SECURITY_JWT_SECRET_KEY': 'test_jwt_secret_key_32_chars_long',
+    'SECURITY_ENCRYPTION_KEY': 'test_encryption_key_32_chars_long'
+})
+
+# Add src directory to Python path
+backend_dir = Path(__file__).parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+import numpy as np
+
+from ai_coaching.database import schema
+from ai_coaching.database.schema import (
+    DatabaseMigrator, KnowledgeItem, SystemConfig, create_knowledge_items_bulk,
+    decode_jsonb, decode_vector, encode_jsonb, encode_vector, search_knowledge_by_vector
+)
+
+
+def create_mock_pool(conn: MagicMock) -> MagicMock:
+    """Create a mock pool whose acquire() yields the given connection."""
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+
+    pool = MagicMock()
+    pool.acquire.return_value = acquire
+    pool.close = AsyncMock()
+    pool.expire_connections = AsyncMock()
+    return pool
+
+
+def test_vector_codec():
+    """Test the pgvector binary codec."""
+    print("Testing pgvector binary codec...")
+
+    data = encode_vector([1.0, -2.5, 3.25])
+    # int16 dimensions, int16 unused, then big-endian float4 values
+    assert data == bytes.fromhex("00030000" "3f800000" "c0200000" "40500000")
+    assert decode_vector(data) == [1.0, -2.5, 3.25]
+
+    embedding = np.linspace(-1, 1, schema.EMBEDDING_DIMENSIONS, dtype=np.float32)
+    decoded = decode_vector(encode_vector(embedding))
+    assert isinstance(decoded, list)
+    assert np.array_equal(np.asarray(decoded, dtype=np.float32), embedding)
+
+    print("✓ pgvector binary codec working")
+
+
+def test_lazy_jsonb():
+    """Test that JSONB values are only parsed when read."""
+    print("\nTesting lazy JSONB decoding...")
+
+    value = decode_jsonb(b'\x01{"retries": [1, 2]}')
+    with patch.object(schema.orjson, "loads", wraps=schema.orjson.loads) as loads:
+        assert encode_jsonb(value) == b'\x01{"retries": [1, 2]}', "Raw JSON should round-trip unparsed"
+        assert loads.call_count == 0
+        assert value.value() == {"retries": [1, 2]}
+        assert value.value() == {"retries": [1, 2]}
+        assert loads.call_count == 1
+    assert encode_jsonb({"key": "value"}) == b'\x01{"key":"value"}'
+
+    # Models accept lazy values and plain dicts, and serialize both as JSON objects
+    now = datetime.now()
+    lazy = SystemConfig(id=uuid.uuid4(), key="lazy", value=value, created_at=now, updated_at=now)
+    plain = SystemConfig(id=uuid.uuid4(), key="plain", value={"a": 1}, created_at=now, updated_at=now)
+    assert lazy.model_dump()["value"] == {"retries": [1, 2]}
+    assert plain.model_dump()["value"] == {"a": 1}
+
+    print("✓ Lazy JSONB decoding working")
+
+
+async def test_shared_pool():
+    """Test that migrator calls share one lazily created pool."""
+    print("\nTesting shared connection pool...")
+
+    conn = MagicMock()
+    conn.fetchval = AsyncMock(return_value="001")
+    pool = create_mock_pool(conn)
+
+    with patch("asyncpg.create_pool", AsyncMock(return_value=pool)) as create_pool:
+        migrator = DatabaseMigrator("postgresql://test")
+        versions = await asyncio.gather(*(migrator.get_current_migration_version() for _ in range(5)))
+
+        assert versions == ["001"] * 5
+        assert create_pool.await_count == 1, "Concurrent callers should share one pool"
+        assert create_pool.await_args.kwargs["init"] is schema.register_type_codecs
+
+    await schema.close_pools()
+    pool.close.assert_awaited_once()
+    assert not schema._POOLS
+
+    print("✓ Shared connection pool working")
+
+
+async def test_migration_refreshes_pool():
+    """Test that a migration recycles pooled connections."""
+    print("\nTesting pool refresh after migration...")
+
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+    pool = create_mock_pool(conn)
+
+    with patch("asyncpg.create_pool", AsyncMock(return_value=pool)):
+        migrator = DatabaseMigrator("postgresql://test")
+        assert await migrator.run_migration("001")
+
+    # Connections opened before pgvector existed carry no vector codec
+    pool.expire_connections.assert_awaited_once()
+    await schema.close_pools()
+
+    print("✓ Pool refresh after migration working")
+
+
+async def test_migration_discovery():
+    """Test that migration files are scanned once per directory change."""
+    print("\nTesting migration discovery...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        migrations_dir = Path(tmp)
+        (migrations_dir / "002_add_index.sql").write_text("SELECT 2;")
+        (migrations_dir / "001_initial.sql").write_text("SELECT 1;")
+
+        migrator = DatabaseMigrator("postgresql://test")
+        migrator.migrations_dir = migrations_dir
+
+        (migrations_dir / "notes.txt").write_text("Not a migration")
+
+        with patch.object(schema.os, "scandir", wraps=os.scandir) as scandir:
+            assert await migrator.get_available_migrations() == ["001", "002"]
+            assert await migrator.get_available_migrations() == ["001", "002"]
+            assert migrator._migration_files()["002"].name == "002_add_index.sql"
+            assert scandir.call_count == 1, "Unchanged directory should not be rescanned"
+
+            # A new file changes the directory mtime and invalidates the scan
+            (migrations_dir / "003_add_table.sql").write_text("SELECT 3;")
+            os.utime(migrations_dir, ns=(0, migrations_dir.stat().st_mtime_ns + 1))
+            assert await migrator.get_available_migrations() == ["001", "002", "003"]
+
+        migrator.migrations_dir = migrations_dir / "missing"
+        assert await migrator.get_available_migrations() == []
+
+    print("✓ Migration discovery working")
+
+
+async def test_bulk_knowledge_insert():
+    """Test that knowledge items are written with one COPY."""
+    print("\nTesting bulk knowledge insert...")
+
+    now = datetime.now()
+    items = [
+        KnowledgeItem(id=uuid.uuid4(), title=f"Item {i}", content="Content", category="policy",
+                      tags=["a"], created_at=now, updated_at=now)
+        for i in range(3)
+    ]
+
+    conn = MagicMock()
+    conn.copy_records_to_table = AsyncMock()
+
+    assert await create_knowledge_items_bulk(conn, items) == [item.id for item in items]
+    conn.copy_records_to_table.assert_awaited_once()
+    args = conn.copy_records_to_table.await_args
+    assert args.args == ("knowledge_base",)
+    assert args.kwargs["columns"][:2] == ("id", "title")
+    assert [record[:2] for record in args.kwargs["records"]] == [(item.id, item.title) for item in items]
+
+    # Nothing to copy means no round-trip
+    assert await create_knowledge_items_bulk(conn, []) == []
+    assert conn.copy_records_to_table.await_count == 1
+
+    print("✓ Bulk knowledge insert working")
+
+
+async def test_vector_search_rows():
+    """Test that search rows are paired with model fields by position."""
+    print("\nTesting vector search row hydration...")
+
+    now = datetime.now()
+    item_id = uuid.uuid4()
+    row = (item_id, "Refund policy", "Content", None, "policy", [], 0.5, None, None, now, now)
+
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[row])
+
+    for trusted in (True, False):
+        with patch.object(schema, "TRUSTED_DB_ROWS", trusted):
+            [item] = await search_knowledge_by_vector(conn, [0.0] * schema.EMBEDDING_DIMENSIONS)
+        assert isinstance(item, KnowledgeItem)
+        assert (item.id, item.title, item.relevance_score, item.updated_at) == (item_id, "Refund policy", 0.5, now)
+
+    sql = conn.fetch.await_args.args[0]
+    assert "SELECT *" not in sql and "relevance_score::float8" in sql
+    # Ordered by the half-precision expression the HNSW index is built on
+    assert "ORDER BY embedding::halfvec(1536) <=> $1::halfvec(1536)" in sql
+
+    print("✓ Vector search row hydration working")
+
+
+async def main():
+    """Run all database schema tests."""
+    print("🧪 Running Database Schema Tests\n")
+    print("=" * 50)
+
+    try:
+        test_vector_codec()
+        test_lazy_jsonb()
+        await test_shared_pool()
+        await test_migration_refreshes_pool()
+        await test_migration_discovery()
+        await test_bulk_knowledge_insert()
+        await test_vector_search_rows()
+
+        print("\n" + "=" * 50)
+        print("✅ All database schema tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
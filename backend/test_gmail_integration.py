@@ -3,6 +3,9 @@
 
 import sys
 import asyncio
+import base64
+import hashlib
+import hmac
 import json
 import os
 from pathlib import Path
@@ -265,6 +268,55 @@ class TestGmailAPIRoutes:
             assert data["status"] == "accepted"
         
         print("✓ Gmail webhook endpoint works correctly")
+    
+    def test_webhook_signature(self):
+        """Test HMAC verification of webhook payloads."""
+        print("Testing Gmail webhook signature verification...")
+        
+        body = json.dumps({
+            "message": {"messageId": "signed_message_id"},
+            "subscription": "projects/test-project/subscriptions/gmail-sub"
+        }).encode()
+        signature = base64.b64encode(hmac.new(b"webhook_secret", body, hashlib.sha256).digest()).decode()
+        
+        with patch('ai_coaching.api.routes.gmail._webhook_secret_bytes', return_value=b"webhook_secret"):
+            response = self.client.post(
+                "/gmail/webhook",
+                content=body,
+                headers={"Authorization": f"Bearer {signature}"}
+            )
+            assert response.status_code == 200
+            
+            for bad_token in ("not-base64!", base64.b64encode(b"x" * 32).decode()):
+                response = self.client.post(
+                    "/gmail/webhook",
+                    content=body,
+                    headers={"Authorization": f"Bearer {bad_token}"}
+                )
+                assert response.status_code == 401
+        
+        print("✓ Gmail webhook signature verification works correctly")
+    
+    def test_id_token_email(self):
+        """Test reading the user's email from the OAuth ID token."""
+        print("Testing ID token email extraction...")
+        
+        from ai_coaching.api.routes.auth import _email_from_id_token
+        
+        def make_id_token(claims: dict) -> str:
+            segments = [{"alg": "RS256", "typ": "JWT"}, claims]
+            encoded = [base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode() for part in segments]
+            return ".".join(encoded + ["c2lnbmF0dXJl"])
+        
+        credentials = MagicMock()
+        credentials.id_token = make_id_token({"aud": "test_client_id", "email": "coach@example.com"})
+        assert _email_from_id_token(credentials, "test_client_id") == "coach@example.com"
+        assert _email_from_id_token(credentials, "other_client_id") is None
+        
+        credentials.id_token = None
+        assert _email_from_id_token(credentials, "test_client_id") is None
+        
+        print("✓ ID token email extraction works correctly")
 
 
 async def run_service_tests():
@@ -283,6 +335,8 @@ def run_api_tests():
     
     test_api.test_health_endpoint()
     test_api.test_webhook_endpoint()
+    test_api.test_webhook_signature()
+    test_api.test_id_token_email()
 
 
 async def main():
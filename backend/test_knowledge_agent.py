@@ -11,7 +11,7 @@ backend_dir = Path(__file__).parent
 src_dir = backend_dir / "src"
 sys.path.insert(0, str(src_dir))
 
-from ai_coaching.agents.knowledge import KnowledgeAgent
+from ai_coaching.agents.knowledge import KnowledgeAgent, SearchResultCache
 from ai_coaching.agents.base import AgentTask
 from ai_coaching.models.base import SystemDependencies
 from ai_coaching.models.knowledge import ContentCategory
@@ -315,6 +315,84 @@ async def test_invalid_task_handling():
         return False
 
 
+async def test_search_result_cache():
+    """Test that repeated searches are served from the cache."""
+    print("\nTesting search result cache...")
+    
+    try:
+        dependencies = create_mock_dependencies()
+        agent = KnowledgeAgent(dependencies)
+        await agent.initialize()
+        
+        categories = [ContentCategory.FAQ, ContentCategory.SAFETY_PROTOCOLS]
+        first = await agent.search_relevant_content("Heat policy", categories=categories)
+        # Filter order does not matter, and an explicit default threshold matches
+        second = await agent.search_relevant_content(
+            "Heat policy", categories=categories[::-1], similarity_threshold=0.7
+        )
+        
+        if first.from_cache or not second.from_cache or dependencies.embedding_service.generate_embedding.await_count != 1:
+            print("❌ Repeated search was not served from the cache")
+            return False
+        print("✅ Repeated search served from the cache")
+        
+        await agent.process_task(AgentTask(task_type="delete_knowledge_item", input_data={"item_id": "item-1"}))
+        if len(agent._search_cache) != 0:
+            print("❌ Cache not cleared after content changed")
+            return False
+        print("✅ Cache cleared after content changed")
+        
+        cache = SearchResultCache(max_size=2)
+        for key in ("a", "b", "a", "c"):
+            cache.set(key, first)
+        if cache.get("b") is not None or cache.get("a") is not first:
+            print("❌ Cache did not evict the least recently used entry")
+            return False
+        print("✅ Least recently used entry evicted")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Search cache test failed: {e}")
+        return False
+
+
+async def test_proximity_cache():
+    """Test that near-identical queries reuse a cached response."""
+    print("\nTesting proximity cache...")
+    
+    try:
+        dependencies = create_mock_dependencies()
+        embeddings = {
+            "What is the heat policy?": [0.1] * 1536,
+            "heat policy": [0.1] * 1535 + [0.11],
+            "Field directions": [0.1] * 768 + [-0.1] * 768
+        }
+        dependencies.embedding_service.generate_embedding = AsyncMock(side_effect=embeddings.get)
+        agent = KnowledgeAgent(dependencies)
+        await agent.initialize()
+        
+        first = await agent.search_relevant_content("What is the heat policy?")
+        similar = await agent.search_relevant_content("heat policy")
+        if first.from_cache or not similar.from_cache or similar.query.query_text != "heat policy":
+            print("❌ Similar query was not served from the proximity cache")
+            return False
+        print("✅ Similar query served from the proximity cache")
+        
+        different = await agent.search_relevant_content("Field directions")
+        filtered = await agent.search_relevant_content("heat policy", max_results=3)
+        if different.from_cache or filtered.from_cache:
+            print("❌ Unrelated query or different filters matched the cache")
+            return False
+        print("✅ Unrelated queries and different filters searched again")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Proximity cache test failed: {e}")
+        return False
+
+
 async def main():
     """Run all KnowledgeAgent tests."""
     print("Running KnowledgeAgent Tests")
@@ -326,7 +404,9 @@ async def main():
         test_add_knowledge_item_task,
         test_context_retrieval_task,
         test_agent_health_check,
-        test_invalid_task_handling
+        test_invalid_task_handling,
+        test_search_result_cache,
+        test_proximity_cache
     ]
     
     passed = 0
@@ -6,6 +6,8 @@ from pathlib import Path
 from datetime import datetime
 from uuid import uuid4
 
+import numpy as np
+
 # Add src directory to Python path
 backend_dir = Path(__file__).parent
 src_dir = backend_dir / "src"
@@ -20,7 +22,8 @@ from ai_coaching.models.knowledge import (
     KnowledgeSearchQuery,
     KnowledgeSearchResult,
     KnowledgeSearchResponse,
-    KnowledgeStats
+    KnowledgeStats,
+    embedding_matrix
 )
 
 
@@ -47,6 +50,18 @@ def test_knowledge_item_creation():
         print(f"   - Category: {item.category}")
         print(f"   - Composite Score: {item.calculate_composite_score()}")
         
+        if "parent communication" not in item.to_search_text():
+            print("❌ Search text missing the category")
+            return False
+        print("✅ Search text generated")
+        
+        same_content = item.model_copy(update={"tags": [], "relevance_score": 0.1})
+        edited = item.model_copy(update={"content": item.content + " Updated."})
+        if item.content_hash() != same_content.content_hash() or item.content_hash() == edited.content_hash():
+            print("❌ Content hash does not track title and content")
+            return False
+        print("✅ Content hash tracks title and content")
+        
         # Test embedding validation
         item.embedding_vector = [0.1] * 1536  # Valid embedding
         print("✅ Valid embedding vector accepted")
@@ -186,6 +201,188 @@ def test_model_serialization():
         return False
 
 
+def test_batch_validation():
+    """Test validating a batch of raw items at once."""
+    print("\nTesting batch validation...")
+    
+    try:
+        raw_items = [
+            {
+                "title": f"Drill {i}",
+                "content": "Passing drill for U10 teams",
+                "category": "technical_skills",
+                "source_type": "manual_entry",
+                "tags": ["  Passing   Drills "]
+            }
+            for i in range(3)
+        ]
+        
+        items = KnowledgeItem.validate_many(raw_items)
+        restored = KnowledgeItem.validate_many_json(
+            "[" + ",".join(item.model_dump_json() for item in items) + "]"
+        )
+        
+        if [item.title for item in restored] != ["Drill 0", "Drill 1", "Drill 2"]:
+            print("❌ Batch validation lost items")
+            return False
+        if items[0].tags != ["passing drills"]:
+            print("❌ Batch validation skipped field validators")
+            return False
+        print("✅ Batch of items validated successfully")
+        
+        try:
+            KnowledgeItem.validate_many([{"title": "Missing content"}])
+            print("❌ Should have failed with an invalid item")
+            return False
+        except ValueError as e:
+            print(f"✅ Correctly rejected invalid batch item: {type(e).__name__}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batch validation test failed: {e}")
+        return False
+
+
+def test_embedding_storage():
+    """Test that embeddings are held as float32 arrays."""
+    print("\nTesting embedding storage...")
+    
+    try:
+        values = np.linspace(-1, 1, 1536, dtype=np.float32)
+        items = [
+            KnowledgeItem(
+                title=f"Item {i}",
+                content="Embedded content",
+                category=ContentCategory.FAQ,
+                source_type=ContentSource.MANUAL_ENTRY,
+                embedding_vector=embedding
+            )
+            for i, embedding in enumerate([values.tolist(), values, values.tobytes()])
+        ]
+        
+        if not all(item.embedding_vector.array.dtype == np.float32 for item in items):
+            print("❌ Embedding not stored as float32")
+            return False
+        if not items[0].embedding_vector == items[1].embedding_vector == items[2].embedding_vector:
+            print("❌ Embedding differs between input forms")
+            return False
+        
+        dumped = items[0].model_dump()["embedding_vector"]
+        if not isinstance(dumped, list) or len(dumped) != 1536:
+            print("❌ Embedding not serialized as a list")
+            return False
+        if KnowledgeItem.model_validate_json(items[0].model_dump_json()) != items[0]:
+            print("❌ Embedding lost through JSON round-trip")
+            return False
+        print("✅ Embedding stored as float32 and serialized as a list")
+        
+        # Assignment is not validated, so a plain list must still serialize
+        assigned = items[0].model_copy()
+        assigned.embedding_vector = values.tolist()
+        if KnowledgeItem.model_validate_json(assigned.model_dump_json()).embedding_vector != values:
+            print("❌ Assigned embedding list not serialized")
+            return False
+        print("✅ Assigned embedding list serialized")
+        
+        matrix = embedding_matrix(items)
+        if matrix.shape != (3, 1536) or not np.allclose(matrix @ values, values @ values):
+            print("❌ Embedding matrix is wrong")
+            return False
+        print("✅ Embeddings stacked into a similarity matrix")
+        
+        for invalid in ([0.1] * 512, ["0.1"] * 1536, "not a vector"):
+            try:
+                KnowledgeItem(
+                    title="Bad embedding",
+                    content="Content",
+                    category=ContentCategory.FAQ,
+                    source_type=ContentSource.MANUAL_ENTRY,
+                    embedding_vector=invalid
+                )
+                print("❌ Should have rejected an invalid embedding")
+                return False
+            except ValueError:
+                pass
+        print("✅ Correctly rejected invalid embeddings")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Embedding storage test failed: {e}")
+        return False
+
+
+def test_batch_composite_scores():
+    """Test scoring many items at once."""
+    print("\nTesting batch composite scores...")
+    
+    try:
+        items = [
+            KnowledgeItem(
+                title=f"Item {i}",
+                content="Scored content",
+                category=ContentCategory.FAQ,
+                source_type=ContentSource.MANUAL_ENTRY,
+                relevance_score=i / 10,
+                quality_score=0.5,
+                confidence_score=0.9,
+                metadata=KnowledgeItemMetadata(usefulness_score=1 - i / 10)
+            )
+            for i in range(10)
+        ]
+        
+        scores = KnowledgeItem.batch_composite_scores(items)
+        if scores.tolist() != [item.calculate_composite_score() for item in items]:
+            print("❌ Batch scores differ from per-item scores")
+            return False
+        if KnowledgeItem.batch_composite_scores([]).shape != (0,):
+            print("❌ Empty batch should produce no scores")
+            return False
+        print("✅ Batch composite scores match per-item scores")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batch composite score test failed: {e}")
+        return False
+
+
+def test_trusted_rehydration():
+    """Test rebuilding validated items without re-validating them."""
+    print("\nTesting trusted rehydration...")
+    
+    try:
+        related_id, other_id = uuid4(), uuid4()
+        original = KnowledgeItem(
+            id=uuid4(),
+            title="Cached Item",
+            content="Content loaded back from a cache",
+            category=ContentCategory.SAFETY_PROTOCOLS,
+            source_type=ContentSource.DOCUMENTATION,
+            tags=["Heat  Safety"],
+            embedding_vector=[0.25] * 1536,
+            metadata=KnowledgeItemMetadata(access_count=3),
+            related_items=[related_id, str(related_id), other_id]
+        )
+        
+        if original.related_items != (related_id, other_id):
+            print("❌ Duplicate related items not dropped")
+            return False
+        
+        restored = KnowledgeItem.from_trusted_dict(original.model_dump())
+        if restored != original or restored.metadata.access_count != 3:
+            print("❌ Trusted rehydration changed the item")
+            return False
+        print("✅ Item rebuilt from trusted data")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Trusted rehydration test failed: {e}")
+        return False
+
+
 def main():
     """Run all knowledge model tests."""
     print("Running Knowledge Base Model Tests")
@@ -195,7 +392,11 @@ def main():
         test_knowledge_item_creation,
         test_search_query_validation,
         test_knowledge_stats,
-        test_model_serialization
+        test_model_serialization,
+        test_batch_validation,
+        test_embedding_storage,
+        test_batch_composite_scores,
+        test_trusted_rehydration
     ]
     
     passed = 0
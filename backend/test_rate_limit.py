@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Test script for the rate limiting middleware."""
+
+import sys
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Set test environment variables
+os.environ.update({
+    'SUPABASE_URL': 'https://test.supabase.co',
+    'SUPABASE_ANON_KEY': 'test_anon_key',
+    'SUPABASE_SERVICE_KEY': 'test_service_key',
+    'SUPABASE_PASSWORD': 'test_password',
+    'AI_OPENAI_API_KEY': 'test_openai_key',
+    'AIRTABLE_API_KEY': 'test_airtable_key',
+    'GOOGLE_CLIENT_ID': 'test_client_id',
+    'GOOGLE_CLIENT_SECRET': 'test_client_secret',
+    'SECURITY_JWT_SECRET_KEY': 'test_jwt_secret_key_32_chars_long',
+    'SECURITY_ENCRYPTION_KEY': 'test_encryption_key_32_chars_long'
+})
+
+# Add src directory to Python path
+backend_dir = Path(__file__).parent
+src_dir = backend_dir / "src"
+sys.path.insert(0, str(src_dir))
+
+from starlette.requests import Request
+
+from ai_coaching.api.middleware import rate_limit
+from ai_coaching.api.middleware.rate_limit import InMemoryRateLimitBackend, RateLimitMiddleware
+
+
+def create_middleware(**kwargs) -> RateLimitMiddleware:
+    """Create a middleware instance around a dummy app."""
+    return RateLimitMiddleware(MagicMock(), **kwargs)
+
+
+def test_path_buckets():
+    """Test that prefixed paths share their pattern's bucket."""
+    print("Testing path buckets...")
+
+    middleware = create_middleware(default_requests_per_minute=5)
+
+    assert middleware._get_rate_limit_for_path("/api/v1/auth/google") == ("/api/v1/auth/google", 20)
+    assert middleware._get_rate_limit_for_path("/api/v1/auth/google/callback") == ("/api/v1/auth/google", 20)
+    assert middleware._get_rate_limit_for_path("/api/v1/other") == ("/api/v1/other", 5)
+
+    # Patterns match whole segments, and the longest one wins
+    assert middleware._get_rate_limit_for_path("/api/v1/healthz") == ("/api/v1/healthz", 5)
+    middleware.path_limits["/api/v1/gmail"] = 30
+    middleware._path_trie = rate_limit._build_path_trie(middleware.path_limits)
+    assert middleware._match_path("/api/v1/gmail/webhook/push") == ("/api/v1/gmail/webhook", 600)
+    assert middleware._match_path("/api/v1/gmail/labels") == ("/api/v1/gmail", 30)
+
+    # Patterns follow the configured API prefix
+    middleware = create_middleware(api_prefix="/api/v2/")
+    assert middleware._get_rate_limit_for_path("/api/v2/health/live") == ("/api/v2/health", 1000)
+    assert middleware._get_rate_limit_for_path("/api/v1/health") == ("/api/v1/health", 100)
+
+    print("✓ Path buckets working")
+
+
+def make_request(peer: str, headers: dict, path: str = "/") -> Request:
+    """Build a bare request from a peer address and headers."""
+    return Request({
+        "type": "http",
+        "client": (peer, 12345),
+        "path": path,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+async def test_excluded_paths():
+    """Test that probe paths bypass rate limiting."""
+    print("\nTesting excluded paths...")
+
+    middleware = create_middleware()
+    middleware._check_rate_limit = AsyncMock(return_value=True)
+    call_next = AsyncMock(return_value="response")
+
+    assert await middleware.dispatch(make_request("1.2.3.4", {}, "/api/v1/health/live"), call_next) == "response"
+    assert await middleware.dispatch(make_request("1.2.3.4", {}, "/api/v1/health/ready"), call_next) == "response"
+    middleware._check_rate_limit.assert_not_awaited()
+
+    await middleware.dispatch(make_request("1.2.3.4", {}, "/api/v1/health"), call_next)
+    middleware._check_rate_limit.assert_awaited_once()
+
+    print("✓ Excluded paths working")
+
+
+def test_client_ip():
+    """Test client IP resolution with and without trusted proxies."""
+    print("\nTesting client IP resolution...")
+
+    spoofed = {"X-Forwarded-For": "6.6.6.6, 203.0.113.7, 10.0.0.2"}
+
+    # Without trusted proxies the first forwarded address is used
+    middleware = create_middleware()
+    assert middleware._get_client_ip(make_request("10.0.0.1", spoofed)) == "6.6.6.6"
+    assert middleware._get_client_ip(make_request("10.0.0.1", {"X-Real-IP": "198.51.100.4"})) == "198.51.100.4"
+    assert middleware._get_client_ip(make_request("10.0.0.1", {})) == "10.0.0.1"
+
+    # Trusted proxies: nearest untrusted hop wins, untrusted peers are taken as-is
+    middleware = create_middleware(trusted_proxies=["10.0.0.0/8"])
+    assert middleware._get_client_ip(make_request("10.0.0.1", spoofed)) == "203.0.113.7"
+    assert middleware._get_client_ip(make_request("198.51.100.9", spoofed)) == "198.51.100.9"
+
+    print("✓ Client IP resolution working")
+
+
+async def test_rate_limited_response():
+    """Test that an exceeded limit answers 429 instead of raising."""
+    print("\nTesting rate limited response...")
+
+    middleware = create_middleware()
+    middleware._check_rate_limit = AsyncMock(return_value=False)
+    call_next = AsyncMock()
+
+    response = await middleware.dispatch(make_request("1.2.3.4", {}, "/api/v1/auth/google"), call_next)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "60"
+    body = json.loads(response.body)
+    assert body["success"] is False and body["error"]["limit"] == 20
+    call_next.assert_not_awaited()
+
+    print("✓ Rate limited response working")
+
+
+async def test_in_memory_limit():
+    """Test the in-memory fixed window."""
+    print("\nTesting in-memory rate limiting...")
+
+    middleware = create_middleware()
+    assert middleware.redis_backend is None
+
+    results = [await middleware._check_rate_limit("1.2.3.4", "/api/v1/auth/google", 3) for _ in range(4)]
+    assert results == [True, True, True, False]
+
+    # Other clients have their own counters
+    assert await middleware._check_rate_limit("5.6.7.8", "/api/v1/auth/google", 3)
+
+    print("✓ In-memory rate limiting working")
+
+
+async def test_redis_backend_used():
+    """Test that a configured Redis backend owns the counters."""
+    print("\nTesting Redis-backed rate limiting...")
+
+    middleware = create_middleware()
+    middleware.redis_backend = MagicMock()
+    middleware.redis_backend.hit = AsyncMock(side_effect=[True, False])
+
+    assert await middleware._check_rate_limit("1.2.3.4", "/api/v1/health", 1000)
+    assert not await middleware._check_rate_limit("1.2.3.4", "/api/v1/health", 1000)
+    middleware.redis_backend.hit.assert_awaited_with("rl:1.2.3.4:/api/v1/health", 1000)
+    assert not any(middleware.memory_backend._shards)
+
+    print("✓ Redis-backed rate limiting working")
+
+
+async def test_redis_fallback():
+    """Test falling back to in-memory counters when Redis fails."""
+    print("\nTesting Redis fallback...")
+
+    middleware = create_middleware()
+    middleware.redis_backend = MagicMock()
+    middleware.redis_backend.hit = AsyncMock(side_effect=rate_limit.RedisError("connection refused"))
+
+    assert await middleware._check_rate_limit("1.2.3.4", "/api/v1/health", 1)
+    assert not await middleware._check_rate_limit("1.2.3.4", "/api/v1/health", 1)
+
+    # Redis is not retried until the cooldown passes
+    assert middleware.redis_backend.hit.await_count == 1
+
+    print("✓ Redis fallback working")
+
+
+async def test_redis_backend_lifecycle():
+    """Test that a caller-owned Redis backend is used and can be closed."""
+    print("\nTesting Redis backend lifecycle...")
+
+    assert rate_limit.create_redis_backend(None) is None
+    with patch.object(rate_limit, "aioredis", None):
+        assert rate_limit.create_redis_backend("redis://localhost") is None
+
+    backend = rate_limit.RedisRateLimitBackend.__new__(rate_limit.RedisRateLimitBackend)
+    backend.client = MagicMock()
+    backend.client.aclose = AsyncMock()
+
+    middleware = create_middleware(redis_backend=backend)
+    assert middleware.redis_backend is backend
+
+    await backend.close()
+    backend.client.aclose.assert_awaited_once()
+
+    print("✓ Redis backend lifecycle working")
+
+
+def test_gcra_spacing():
+    """Test that a drained burst admits requests at the configured rate."""
+    print("\nTesting GCRA request spacing...")
+
+    backend = InMemoryRateLimitBackend()
+
+    with patch.object(rate_limit.time, "monotonic", return_value=1000.0):
+        assert [backend.hit("client", 2) for _ in range(3)] == [True, True, False]
+
+    # One emission interval (60s / 2) later exactly one more request fits
+    with patch.object(rate_limit.time, "monotonic", return_value=1030.0):
+        assert [backend.hit("client", 2) for _ in range(2)] == [True, False]
+
+    print("✓ GCRA request spacing working")
+
+
+def test_cleanup():
+    """Test that drained in-memory entries are expired a few per request."""
+    print("\nTesting in-memory cleanup...")
+
+    backend = InMemoryRateLimitBackend()
+    index = backend._shard_index("fresh")
+    stale_keys = [key for key in (f"stale-{i}" for i in range(2000)) if backend._shard_index(key) == index]
+    stale_keys = stale_keys[:backend.MAX_EXPIRIES_PER_HIT + 8]
+
+    with patch.object(rate_limit.time, "monotonic", return_value=0.0):
+        for key in stale_keys:
+            backend.hit(key, 10)
+
+    with patch.object(rate_limit.time, "monotonic", return_value=100.0):
+        backend.hit("fresh", 10)
+        assert len(backend._shards[index]) == 8 + 1
+        backend.hit("fresh", 10)
+        assert list(backend._shards[index]) == ["fresh"]
+
+    # Keys still active when reached in the FIFO are requeued, not dropped
+    with patch.object(rate_limit.time, "monotonic", return_value=110.0):
+        backend.hit("fresh", 10)
+    assert backend._shards[index]["fresh"] == 112.0 + 6.0
+    assert len(backend._expiries[index]) == 1
+
+    print("✓ In-memory cleanup working")
+
+
+async def main():
+    """Run all rate limiting tests."""
+    print("🧪 Running Rate Limit Tests\n")
+    print("=" * 50)
+
+    try:
+        test_path_buckets()
+        test_client_ip()
+        await test_excluded_paths()
+        await test_rate_limited_response()
+        await test_in_memory_limit()
+        await test_redis_backend_used()
+        await test_redis_fallback()
+        await test_redis_backend_lifecycle()
+        test_gcra_spacing()
+        test_cleanup()
+
+        print("\n" + "=" * 50)
+        print("✅ All rate limit tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
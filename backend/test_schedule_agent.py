@@ -7,7 +7,7 @@ import time
 import os
 from pathlib import Path
 from datetime import datetime, UTC, timedelta
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 import json
 
 # Set test environment variables
@@ -449,6 +449,55 @@ class TestScheduleAgent:
         print("✓ Coach conflict detection working correctly")
         print(f"  - Detected: {conflict['description']}")
     
+    async def test_nested_coach_conflict_detection(self):
+        """Test coach double-booking against a long event that is not adjacent."""
+        print("\nTesting nested coach conflict detection...")
+        
+        base_time = datetime.now(UTC).replace(hour=9, minute=0, second=0, microsecond=0)
+        
+        def coach_event(event_id, offset_minutes, duration_minutes):
+            return {
+                'event_id': event_id,
+                'event_name': f'Session {event_id}',
+                'event_type': 'practice',
+                'start_time': base_time + timedelta(minutes=offset_minutes),
+                'end_time': base_time + timedelta(minutes=offset_minutes + duration_minutes),
+                'venue_id': 'venue_003',
+                'venue_name': 'West Training Ground',
+                'venue_location': '789 Training Rd',
+                'assigned_coaches': ['coach_002'],
+                'required_coaches': 1,
+                'age_group': 'U12',
+                'priority': 5,
+                'is_flexible': True,
+                'travel_time_required': 15
+            }
+        
+        # nc_001 spans both later sessions; nc_002 and nc_003 do not overlap each other
+        task = AgentTask(
+            task_type="detect_conflicts",
+            input_data={
+                'events': [
+                    coach_event('nc_001', 0, 180),
+                    coach_event('nc_002', 30, 30),
+                    coach_event('nc_003', 90, 30)
+                ],
+                'coaches': list(self.sample_coaches.values()),
+                'venues': list(self.sample_venues.values())
+            }
+        )
+        
+        result = await self.agent.process_task(task)
+        coach_conflicts = [
+            c for c in result.result_data['conflicts']
+            if c['conflict_type'] == ConflictType.COACH_DOUBLE_BOOKING
+        ]
+        pairs = {tuple(c['affected_events']) for c in coach_conflicts}
+        
+        assert pairs == {('nc_001', 'nc_002'), ('nc_001', 'nc_003')}, f"Unexpected coach conflicts: {pairs}"
+        
+        print("✓ Nested coach conflict detection working correctly")
+    
     async def test_venue_conflict_detection(self):
         """Test venue overlap detection."""
         print("\nTesting venue conflict detection...")
@@ -512,6 +561,58 @@ class TestScheduleAgent:
         print("✓ Venue conflict detection working correctly")
         print(f"  - Detected: {conflict['description']}")
     
+    async def test_multi_field_venue_detection(self):
+        """Test that multi-field venues only conflict once every field is taken."""
+        print("\nTesting multi-field venue conflict detection...")
+        
+        base_time = datetime.now(UTC).replace(hour=12, minute=0, second=0, microsecond=0)
+        
+        def venue_event(event_id, offset_minutes):
+            return {
+                'event_id': event_id,
+                'event_name': f'Session {event_id}',
+                'event_type': 'practice',
+                'start_time': base_time + timedelta(minutes=offset_minutes),
+                'end_time': base_time + timedelta(minutes=offset_minutes + 90),
+                'venue_id': 'venue_001',  # Main Stadium has 2 fields
+                'venue_name': 'Main Stadium',
+                'venue_location': '123 Sports Ave',
+                'assigned_coaches': [],
+                'required_coaches': 1,
+                'age_group': 'U10',
+                'priority': 5,
+                'is_flexible': True,
+                'travel_time_required': 15
+            }
+        
+        async def venue_conflicts_for(events):
+            task = AgentTask(
+                task_type="detect_conflicts",
+                input_data={
+                    'events': events,
+                    'coaches': list(self.sample_coaches.values()),
+                    'venues': list(self.sample_venues.values())
+                }
+            )
+            result = await self.agent.process_task(task)
+            return [c for c in result.result_data['conflicts'] if c['conflict_type'] == ConflictType.VENUE_OVERLAP]
+        
+        # Two overlapping events fit on two fields
+        two_events = [venue_event('mf_001', 0), venue_event('mf_002', 30)]
+        assert await venue_conflicts_for(two_events) == [], "Two events should fit on a two-field venue"
+        
+        # A third overlapping event has no free field
+        three_events = two_events + [venue_event('mf_003', 60)]
+        conflicts = await venue_conflicts_for(three_events)
+        assert len(conflicts) == 2, f"Third event should clash with both occupants, got {len(conflicts)}"
+        assert all('mf_003' in c['affected_events'] for c in conflicts)
+        
+        # Back-to-back events do not overlap
+        back_to_back = [venue_event('mf_004', 0), venue_event('mf_005', 0), venue_event('mf_006', 90)]
+        assert await venue_conflicts_for(back_to_back) == [], "Back-to-back events should not conflict"
+        
+        print("✓ Multi-field venue conflict detection working correctly")
+    
     async def test_travel_conflict_detection(self):
         """Test travel impossibility detection."""
         print("\nTesting travel conflict detection...")
@@ -639,6 +740,75 @@ class TestScheduleAgent:
         for i, resolution in enumerate(resolutions[:3]):  # Show first 3
             print(f"  Resolution {i+1}: {resolution['resolution_type']} - {resolution['description']}")
     
+    async def test_validate_and_suggest(self):
+        """Test that the combined task validates and suggests from one detection run."""
+        print("\nTesting combined validation and suggestions...")
+        
+        input_data = {
+            'events': self.sample_events[:4],
+            'coaches': list(self.sample_coaches.values()),
+            'venues': list(self.sample_venues.values())
+        }
+        
+        with patch.object(self.agent, '_run_all_detectors', wraps=self.agent._run_all_detectors) as detectors:
+            result = await self.agent.process_task(
+                AgentTask(task_type="validate_and_suggest", input_data=input_data)
+            )
+            assert detectors.call_count == 1, "Combined task should detect once"
+        
+        assert result.success is True, "Combined task should succeed"
+        assert result.result_data['is_valid'] is False
+        assert len(result.result_data['suggested_resolutions']) > 0
+        
+        # Matches the separate tasks on the same input
+        validation = await self.agent.process_task(AgentTask(task_type="validate_schedule", input_data=input_data))
+        suggestions = await self.agent.process_task(AgentTask(task_type="suggest_resolutions", input_data=input_data))
+        for key in ('is_valid', 'validation_score', 'recommendations'):
+            assert result.result_data[key] == validation.result_data[key]
+        for key in ('auto_resolvable_count', 'manual_review_required'):
+            assert result.result_data[key] == suggestions.result_data[key]
+        assert len(result.result_data['suggested_resolutions']) == len(suggestions.result_data['suggested_resolutions'])
+        
+        # A conflict limit trims the listed issues but not validity or suggestions
+        limited = await self.agent.process_task(
+            AgentTask(task_type="validate_and_suggest", input_data={**input_data, 'max_conflicts': 0})
+        )
+        assert limited.result_data['issues_found'] == []
+        assert limited.result_data['is_valid'] is False
+        assert limited.result_data['validation_score'] == result.result_data['validation_score']
+        assert len(limited.result_data['suggested_resolutions']) == len(result.result_data['suggested_resolutions'])
+        
+        print("✓ Combined validation and suggestions working correctly")
+    
+    async def test_conflict_limit(self):
+        """Test that max_conflicts returns the top-ranked conflicts only."""
+        print("\nTesting top-ranked conflict limit...")
+        
+        task_data = {
+            'events': self.sample_events,
+            'coaches': list(self.sample_coaches.values()),
+            'venues': list(self.sample_venues.values())
+        }
+        
+        full = await self.agent._detect_conflicts(task_data)
+        limited = await self.agent._detect_conflicts({**task_data, 'max_conflicts': 2})
+        
+        assert full['total_conflicts'] > 2, "Sample schedule should have several conflicts"
+        assert limited['total_conflicts'] == full['total_conflicts'], "Totals should cover every conflict"
+        assert limited['conflict_summary'] == full['conflict_summary']
+        assert [c['conflict_id'] for c in limited['conflicts']] == [c['conflict_id'] for c in full['conflicts'][:2]]
+        
+        # Validation scores every conflict; the limit only trims the listed issues
+        full_validation = await self.agent._validate_schedule(task_data)
+        for limit in (0, 1):
+            validation = await self.agent._validate_schedule({**task_data, 'max_conflicts': limit})
+            assert len(validation['issues_found']) == limit
+            assert validation['is_valid'] is False
+            assert validation['validation_score'] == full_validation['validation_score']
+        assert full_validation['validation_score'] == max(0.0, 1.0 - full['total_conflicts'] * 0.1)
+        
+        print("✓ Conflict limit working correctly")
+    
     async def test_error_handling(self):
         """Test error handling and edge cases."""
         print("\nTesting error handling...")
@@ -693,7 +863,9 @@ async def main():
         
         # Test specific conflict types
         await test_agent.test_coach_conflict_detection()
+        await test_agent.test_nested_coach_conflict_detection()
         await test_agent.test_venue_conflict_detection()
+        await test_agent.test_multi_field_venue_detection()
         await test_agent.test_travel_conflict_detection()
         
         # Test schedule validation
@@ -701,6 +873,8 @@ async def main():
         
         # Test resolution suggestions
         await test_agent.test_conflict_resolution_suggestions()
+        await test_agent.test_validate_and_suggest()
+        await test_agent.test_conflict_limit()
         
         # Test error handling
         await test_agent.test_error_handling()